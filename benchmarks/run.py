@@ -0,0 +1,230 @@
+"""Reproducible client benchmarks against local loopback servers
+
+Usage:
+    python -m benchmarks.run [--quick] [--output results.json]
+    python -m benchmarks.run --compare baseline.json [--threshold 0.15]
+
+Every scenario talks to a server on 127.0.0.1, so results do not depend on
+the network. Output is a single JSON document; --compare exits non-zero when
+a throughput metric drops (or a cost metric rises) by more than the threshold.
+"""
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List
+
+import snapex
+from snapex import Client
+from snapex.models import CachePolicy
+
+from .server import start_http1_server
+
+def _percentile(samples: List[float], q: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(q / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+def _run_threads(threads: int, per_thread: int, fn: Callable[[], Any]) -> Dict[str, float]:
+    """Run fn per_thread times on each of threads threads, timing every call"""
+    latencies: List[List[float]] = [[] for _ in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(samples: List[float]) -> None:
+        barrier.wait()
+        for _ in range(per_thread):
+            start = time.perf_counter()
+            fn()
+            samples.append((time.perf_counter() - start) * 1000)
+
+    workers = [threading.Thread(target=worker, args=(samples,)) for samples in latencies]
+    for thread in workers:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in workers:
+        thread.join()
+    duration = time.perf_counter() - start
+
+    merged = [value for samples in latencies for value in samples]
+    return {
+        'requests': len(merged),
+        'duration_s': duration,
+        'requests_per_sec': len(merged) / duration,
+        'p50_ms': _percentile(merged, 50),
+        'p99_ms': _percentile(merged, 99),
+        'mean_ms': statistics.fmean(merged),
+    }
+
+def bench_throughput(base_url: str, pool_sizes: List[int], thread_counts: List[int], requests: int) -> List[Dict[str, Any]]:
+    results = []
+    for pool_size in pool_sizes:
+        for threads in thread_counts:
+            if threads > pool_size:
+                continue
+            with Client(pool_size=pool_size) as client:
+                call = lambda: client.get(f"{base_url}/small", cache_policy=CachePolicy.NEVER)
+                call()  # Warm the pool
+                result = _run_threads(threads, max(1, requests // threads), call)
+            results.append({'pool_size': pool_size, 'threads': threads, **result})
+    return results
+
+def bench_large_body(base_url: str, large_size: int, repeats: int) -> Dict[str, Any]:
+    with Client() as client:
+        client.get(f"{base_url}/large", cache_policy=CachePolicy.NEVER)
+        start = time.perf_counter()
+        received = 0
+        for _ in range(repeats):
+            received += len(client.get(f"{base_url}/large", cache_policy=CachePolicy.NEVER).content)
+        duration = time.perf_counter() - start
+    return {
+        'body_bytes': large_size,
+        'repeats': repeats,
+        'bytes_per_sec': received / duration,
+        'complete': received == large_size * repeats,
+    }
+
+def bench_allocations(base_url: str, requests: int) -> Dict[str, Any]:
+    with Client() as client:
+        call = lambda: client.get(f"{base_url}/small", cache_policy=CachePolicy.NEVER)
+        call()
+        gc.collect()
+        collections_before = sum(stat['collections'] for stat in gc.get_stats())
+        blocks_before = sys.getallocatedblocks()
+        tracemalloc.start()
+        peak_total = 0
+        for _ in range(requests):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            call()
+            peak_total += tracemalloc.get_traced_memory()[1] - current
+        tracemalloc.stop()
+        blocks_after = sys.getallocatedblocks()
+        collections_after = sum(stat['collections'] for stat in gc.get_stats())
+    return {
+        'requests': requests,
+        'peak_bytes_per_request': peak_total / requests,
+        'retained_blocks_per_request': (blocks_after - blocks_before) / requests,
+        'gc_collections_per_1k_requests': (collections_after - collections_before) * 1000 / requests,
+    }
+
+def bench_cache_hit(base_url: str, requests: int) -> Dict[str, Any]:
+    with Client() as client:
+        url = f"{base_url}/small"
+        client.get(url)
+        start = time.perf_counter()
+        for _ in range(requests):
+            client.get(url)
+        duration = time.perf_counter() - start
+        stats = client.http.cache.stats
+    return {
+        'requests': requests,
+        'ns_per_hit': duration / requests * 1e9,
+        'hits_per_sec': requests / duration,
+        'hit_ratio': stats['hit_ratio'],
+    }
+
+def bench_http2() -> Dict[str, Any]:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return {'skipped': 'h2 is not installed'}
+    return {'skipped': 'snapex does not negotiate HTTP/2 on the wire yet'}
+
+def run(quick: bool = False) -> Dict[str, Any]:
+    scale = 1 if quick else 10
+    large_size = (1 if quick else 8) * 1024 * 1024
+    process, base_url = start_http1_server(large_size=large_size)
+    try:
+        return {
+            'meta': {
+                'snapex': snapex.__version__,
+                'python': platform.python_version(),
+                'implementation': platform.python_implementation(),
+                'platform': platform.platform(),
+                'quick': quick,
+                'timestamp': time.time(),
+            },
+            'http1': {
+                'throughput': bench_throughput(
+                    base_url,
+                    pool_sizes=[1, 8, 64],
+                    thread_counts=[1, 8, 32],
+                    requests=200 * scale,
+                ),
+                'large_body': bench_large_body(base_url, large_size, repeats=2 * scale),
+                'allocations': bench_allocations(base_url, requests=50 * scale),
+                'cache_hit': bench_cache_hit(base_url, requests=2000 * scale),
+            },
+            'http2': bench_http2(),
+        }
+    finally:
+        process.terminate()
+        process.join()
+
+# (path to metric, True when higher is better)
+TRACKED = [
+    (('http1', 'large_body', 'bytes_per_sec'), True),
+    (('http1', 'allocations', 'peak_bytes_per_request'), False),
+    (('http1', 'cache_hit', 'ns_per_hit'), False),
+]
+
+def _throughput_metrics(results: Dict[str, Any]) -> Dict[str, float]:
+    return {
+        f"throughput[pool={row['pool_size']},threads={row['threads']}]": row['requests_per_sec']
+        for row in results.get('http1', {}).get('throughput', [])
+    }
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float) -> List[str]:
+    """Return a description of every tracked metric that regressed"""
+    regressions = []
+    for path, higher_is_better in TRACKED:
+        old, new = baseline, current
+        for part in path:
+            old, new = old.get(part, {}), new.get(part, {})
+        if not isinstance(old, (int, float)) or not isinstance(new, (int, float)) or not old:
+            continue
+        change = (new - old) / old
+        if (change < -threshold) if higher_is_better else (change > threshold):
+            regressions.append(f"{'.'.join(path)}: {old:.4g} -> {new:.4g} ({change:+.1%})")
+
+    old_rows, new_rows = _throughput_metrics(baseline), _throughput_metrics(current)
+    for name, old in old_rows.items():
+        new = new_rows.get(name)
+        if new is not None and old and (new - old) / old < -threshold:
+            regressions.append(f"{name}: {old:.4g} -> {new:.4g} ({(new - old) / old:+.1%})")
+    return regressions
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run snapex client benchmarks")
+    parser.add_argument('--quick', action='store_true', help="smaller runs for smoke testing")
+    parser.add_argument('--output', help="write JSON results to this file instead of stdout")
+    parser.add_argument('--compare', help="baseline JSON to check for regressions")
+    parser.add_argument('--threshold', type=float, default=0.15, help="allowed relative regression")
+    args = parser.parse_args(argv)
+
+    results = run(quick=args.quick)
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(json.load(f), results, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""Loopback HTTP/1.1 server used by the benchmark suite
+
+Runs in a separate process so the server never competes with the client
+under test for the GIL. Responses are precomputed; the server only parses
+enough of each request to frame it on a keep-alive connection.
+"""
+import multiprocessing
+import socket
+import threading
+from typing import Dict, Tuple
+
+def _response(body: bytes, content_type: bytes = b"application/octet-stream") -> bytes:
+    return (
+        b"HTTP/1.1 200 OK\r\n"
+        b"content-type: " + content_type + b"\r\n"
+        b"content-length: " + str(len(body)).encode() + b"\r\n"
+        b"\r\n" + body
+    )
+
+def build_routes(large_size: int) -> Dict[bytes, bytes]:
+    return {
+        b"/small": _response(b'{"ok": true}', b"application/json"),
+        b"/large": _response(b"x" * large_size),
+    }
+
+NOT_FOUND = b"HTTP/1.1 404 Not Found\r\ncontent-length: 0\r\n\r\n"
+
+def _handle(conn: socket.socket, routes: Dict[bytes, bytes]) -> None:
+    buffer = b""
+    with conn:
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        while True:
+            while b"\r\n\r\n" not in buffer:
+                data = conn.recv(65536)
+                if not data:
+                    return
+                buffer += data
+            head, _, buffer = buffer.partition(b"\r\n\r\n")
+            request_line, *header_lines = head.split(b"\r\n")
+            length = 0
+            for line in header_lines:
+                name, _, value = line.partition(b":")
+                if name.strip().lower() == b"content-length":
+                    length = int(value)
+            while len(buffer) < length:
+                data = conn.recv(65536)
+                if not data:
+                    return
+                buffer += data
+            buffer = buffer[length:]
+            path = request_line.split(b" ")[1].split(b"?")[0]
+            conn.sendall(routes.get(path, NOT_FOUND))
+
+def _serve(ready: "multiprocessing.Queue", large_size: int) -> None:
+    routes = build_routes(large_size)
+    listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(1024)
+    ready.put(listener.getsockname()[1])
+    while True:
+        conn, _ = listener.accept()
+        threading.Thread(target=_handle, args=(conn, routes), daemon=True).start()
+
+def start_http1_server(large_size: int = 8 * 1024 * 1024) -> Tuple[multiprocessing.Process, str]:
+    """Start the loopback server and return (process, base_url)"""
+    ready: "multiprocessing.Queue" = multiprocessing.Queue()
+    process = multiprocessing.Process(target=_serve, args=(ready, large_size), daemon=True)
+    process.start()
+    port = ready.get(timeout=10)
+    return process, f"http://127.0.0.1:{port}"
@@ -29,5 +29,8 @@ setup(
         "Topic :: Internet :: WWW/HTTP",
         "Topic :: Software Development :: Libraries :: Python Modules",
     ],
+    entry_points={
+        'console_scripts': ['snapex=snapex.cli:main'],
+    },
     python_requires=">=3.7",
 )
\ No newline at end of file
@@ -1,17 +1,55 @@
-from .client import Client
-from .ws import WebSocket
-from .models import Request, Response, HTTPVersion, RequestMethod
-from .exceptions import SnapexError, HTTPError, TimeoutError
+from importlib import import_module
+
+# Avoid importing typing at startup; type checkers still honour this flag
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .client import Client
+    from .ws import WebSocket
+    from .models import Request, Response, HTTPVersion, RequestMethod, TimeoutConfig
+    from .exceptions import SnapexError, HTTPError, TimeoutError
+    from .hooks import Hooks
+    from .metrics import MetricsCollector
 
 __version__ = "1.0.0"
 __all__ = [
-    'Client', 
+    'Client',
     'WebSocket',
     'Request',
     'Response',
     'HTTPVersion',
     'RequestMethod',
+    'TimeoutConfig',
+    'Hooks',
+    'MetricsCollector',
     'SnapexError',
     'HTTPError',
     'TimeoutError'
-]
\ No newline at end of file
+]
+
+# Public names are resolved on first access so that `import snapex` stays
+# cheap for short-lived processes; each submodule loads only when used.
+_LAZY = {
+    'Client': '.client',
+    'WebSocket': '.ws',
+    'Request': '.models',
+    'Response': '.models',
+    'HTTPVersion': '.models',
+    'RequestMethod': '.models',
+    'TimeoutConfig': '.models',
+    'Hooks': '.hooks',
+    'MetricsCollector': '.metrics',
+    'SnapexError': '.exceptions',
+    'HTTPError': '.exceptions',
+    'TimeoutError': '.exceptions',
+}
+
+def __getattr__(name: str) -> object:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module 'snapex' has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
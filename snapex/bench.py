@@ -0,0 +1,246 @@
+import itertools
+import multiprocessing
+import ssl
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+from .connection import ConnectionPool, HTTP1Connection
+from .models import Request, RequestMethod
+
+class LatencyHistogram:
+    """HDR-style log-linear histogram of integer microseconds
+
+    Each power-of-two range is split into 2**precision_bits linear
+    sub-buckets, so every recorded value is kept to within a relative
+    error of 2**-(precision_bits - 1) (0.1% at the default) while memory
+    stays proportional to the number of distinct buckets hit.
+    """
+
+    def __init__(self, precision_bits: int = 11):
+        self.precision_bits = precision_bits
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def _bucket(self, value: int) -> int:
+        shift = max(0, value.bit_length() - self.precision_bits)
+        return (value >> shift) << shift
+
+    def _highest_equivalent(self, bucket: int) -> int:
+        shift = max(0, bucket.bit_length() - self.precision_bits)
+        return bucket + (1 << shift) - 1
+
+    def record(self, value_us: int) -> None:
+        value_us = max(0, int(value_us))
+        bucket = self._bucket(value_us)
+        self.counts[bucket] = self.counts.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value_us
+        if value_us > self.max:
+            self.max = value_us
+
+    def merge(self, other: 'LatencyHistogram') -> None:
+        for bucket, n in other.counts.items():
+            self.counts[bucket] = self.counts.get(bucket, 0) + n
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, q: float) -> int:
+        """Value (microseconds) at or below which q percent of samples fall"""
+        if not self.count:
+            return 0
+        rank = max(1, round(q / 100 * self.count))
+        seen = 0
+        for bucket in sorted(self.counts):
+            seen += self.counts[bucket]
+            if seen >= rank:
+                return min(self._highest_equivalent(bucket), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+@dataclass
+class BenchConfig:
+    url: str
+    method: str = 'GET'
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: Optional[bytes] = None
+    duration: float = 10.0
+    concurrency: int = 10
+    rate: Optional[float] = None
+    workers: int = 1
+    verify: bool = True
+
+    @property
+    def open_loop(self) -> bool:
+        return self.rate is not None
+
+@dataclass
+class BenchResult:
+    config: BenchConfig
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+    statuses: Counter = field(default_factory=Counter)
+    errors: Counter = field(default_factory=Counter)
+    elapsed: float = 0.0
+
+    @property
+    def requests(self) -> int:
+        return sum(self.statuses.values()) + sum(self.errors.values())
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.elapsed if self.elapsed else 0.0
+
+    def merge(self, other: 'BenchResult') -> None:
+        self.histogram.merge(other.histogram)
+        self.statuses.update(other.statuses)
+        self.errors.update(other.errors)
+        self.elapsed = max(self.elapsed, other.elapsed)
+
+    def as_dict(self) -> Dict[str, Any]:
+        h = self.histogram
+        return {
+            'url': self.config.url,
+            'mode': 'open' if self.config.open_loop else 'closed',
+            'target_rate': self.config.rate,
+            'concurrency': self.config.concurrency,
+            'workers': self.config.workers,
+            'duration_s': self.elapsed,
+            'requests': self.requests,
+            'requests_per_sec': self.throughput,
+            'statuses': {str(k): v for k, v in sorted(self.statuses.items())},
+            'errors': dict(self.errors),
+            'latency_ms': {
+                'mean': h.mean / 1000,
+                **{f'p{q:g}': h.percentile(q) / 1000 for q in (50, 75, 90, 99, 99.9, 99.99)},
+                'max': h.max / 1000,
+            },
+        }
+
+class _Worker:
+    """Drives one process's share of the load through a ConnectionPool"""
+
+    def __init__(self, config: BenchConfig, rate: Optional[float]):
+        self.config = config
+        self.rate = rate
+        parsed = urlparse(config.url)
+        self.host = parsed.hostname
+        self.port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+        self.ssl_context = None
+        if parsed.scheme == 'https':
+            self.ssl_context = ssl.create_default_context()
+            if not config.verify:
+                self.ssl_context.check_hostname = False
+                self.ssl_context.verify_mode = ssl.CERT_NONE
+        self.pool = ConnectionPool(max_size=config.concurrency)
+        self.request = Request(
+            method=RequestMethod[config.method.upper()],
+            url=config.url,
+            headers=config.headers,
+            body=config.body
+        )
+        self.result = BenchResult(config)
+        self._lock = threading.Lock()
+
+    def _send(self) -> None:
+        sock = None
+        try:
+            sock = self.pool.get_connection(self.host, self.port, self.ssl_context)
+            response = HTTP1Connection(sock, self.host).send_request(self.request)
+            status, error = response.status_code, None
+        except Exception as e:
+            status, error = None, type(e).__name__
+            if sock is not None:
+                sock.close()
+        finally:
+            if sock is not None:
+                self.pool.release_connection(self.host, self.port, sock, self.ssl_context)
+        with self._lock:
+            if error:
+                self.result.errors[error] += 1
+            else:
+                self.result.statuses[status] += 1
+
+    def _record(self, latency_s: float) -> None:
+        with self._lock:
+            self.result.histogram.record(latency_s * 1e6)
+
+    def _closed_loop(self, deadline: float) -> None:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            self._send()
+            self._record(time.perf_counter() - start)
+
+    def _open_loop(self, start: float, deadline: float, schedule: 'itertools.count') -> None:
+        interval = 1.0 / self.rate
+        while True:
+            # Latency is measured from the intended send time, so a stalled
+            # server is charged for the requests it delayed (coordinated omission)
+            intended = start + next(schedule) * interval
+            if intended >= deadline:
+                return
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            self._send()
+            self._record(time.perf_counter() - intended)
+
+    def run(self) -> BenchResult:
+        start = time.perf_counter()
+        deadline = start + self.config.duration
+        schedule = itertools.count()
+        if self.rate:
+            target, args = self._open_loop, (start, deadline, schedule)
+        else:
+            target, args = self._closed_loop, (deadline,)
+        threads = [threading.Thread(target=target, args=args, daemon=True) for _ in range(self.config.concurrency)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.result.elapsed = time.perf_counter() - start
+        self.pool.close()
+        return self.result
+
+def _run_worker(args: tuple) -> BenchResult:
+    config, rate = args
+    return _Worker(config, rate).run()
+
+def _split(config: BenchConfig) -> List[tuple]:
+    """(config, rate) per worker; connections and rate add up to the totals
+
+    There are never more workers than connections, and the remainder of
+    an uneven split goes one connection each to the first workers.
+    """
+    concurrency = max(1, config.concurrency)
+    workers = max(1, min(config.workers, concurrency))
+    per_worker, extra = divmod(concurrency, workers)
+    shares = []
+    for index in range(workers):
+        connections = per_worker + (index < extra)
+        rate = config.rate * connections / concurrency if config.rate else None
+        shares.append((BenchConfig(**{**config.__dict__, 'concurrency': connections, 'workers': 1}), rate))
+    return shares
+
+def run_bench(config: BenchConfig) -> BenchResult:
+    """Run a load test, splitting rate and concurrency across worker processes"""
+    shares = _split(config)
+    config = BenchConfig(**{**config.__dict__, 'workers': len(shares)})
+    if len(shares) == 1:
+        result = _run_worker(shares[0])
+        result.config = config
+        return result
+
+    with multiprocessing.get_context('spawn').Pool(len(shares)) as pool:
+        partials = pool.map(_run_worker, shares)
+    result = BenchResult(config)
+    for partial in partials:
+        result.merge(partial)
+    return result
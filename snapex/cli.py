@@ -0,0 +1,89 @@
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+def _parse_header(value: str) -> tuple:
+    name, sep, header_value = value.partition(':')
+    if not sep:
+        raise argparse.ArgumentTypeError(f"Invalid header (expected 'Name: value'): {value}")
+    return name.strip(), header_value.strip()
+
+def _load_template(path: str) -> dict:
+    with open(path) as f:
+        template = json.load(f)
+    if 'url' not in template:
+        raise SystemExit(f"Template {path} has no 'url'")
+    return template
+
+def _format_report(result: 'BenchResult') -> str:
+    data = result.as_dict()
+    mode = 'open-loop' if data['mode'] == 'open' else 'closed-loop'
+    target = f", target {data['target_rate']:g} req/s" if data['target_rate'] else ''
+    lines = [
+        f"Running {data['duration_s']:.1f}s {mode} test @ {data['url']}",
+        f"  {data['workers']} worker(s), {data['concurrency']} connection(s){target}",
+        f"  Requests: {data['requests']} ({data['requests_per_sec']:.1f}/s)",
+        "  Latency" + (" (corrected for coordinated omission)" if data['mode'] == 'open' else '') + ":",
+    ]
+    for name, value in data['latency_ms'].items():
+        lines.append(f"    {name:>7} {value:10.3f} ms")
+    statuses = ', '.join(f"{code}={n}" for code, n in data['statuses'].items()) or 'none'
+    lines.append(f"  Status codes: {statuses}")
+    if data['errors']:
+        lines.append("  Errors: " + ', '.join(f"{name}={n}" for name, n in data['errors'].items()))
+    return '\n'.join(lines)
+
+def _bench(args: argparse.Namespace) -> int:
+    from .bench import BenchConfig, run_bench
+
+    template = _load_template(args.template) if args.template else {}
+    url = args.url or template.get('url')
+    if not url:
+        raise SystemExit("A URL or --template is required")
+    body = args.data if args.data is not None else template.get('body')
+    if args.mode == 'open' and not args.rate:
+        raise SystemExit("--mode open requires --rate")
+
+    config = BenchConfig(
+        url=url,
+        method=args.method or template.get('method', 'GET'),
+        headers={**template.get('headers', {}), **dict(args.header)},
+        body=body.encode() if isinstance(body, str) else body,
+        duration=args.duration,
+        concurrency=args.concurrency,
+        rate=args.rate if args.mode != 'closed' else None,
+        workers=args.workers,
+        verify=not args.insecure
+    )
+    result = run_bench(config)
+    print(json.dumps(result.as_dict(), indent=2) if args.json else _format_report(result))
+    return 0 if not result.errors else 1
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='snapex', description="Snapex command line tools")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    bench = commands.add_parser('bench', help="load-test an HTTP endpoint")
+    bench.add_argument('url', nargs='?', help="target URL")
+    bench.add_argument('--template', help="JSON request template with url, method, headers and body")
+    bench.add_argument('-X', '--method', help="HTTP method (default GET)")
+    bench.add_argument('-H', '--header', action='append', type=_parse_header, default=[], help="extra header, 'Name: value'")
+    bench.add_argument('--data', help="request body")
+    bench.add_argument('-d', '--duration', type=float, default=10.0, help="test duration in seconds")
+    bench.add_argument('-c', '--concurrency', type=int, default=10, help="connections across all workers")
+    bench.add_argument('-r', '--rate', type=float, help="target requests/sec across all workers (open loop)")
+    bench.add_argument('--mode', choices=('open', 'closed'), help="scheduling mode (default: open when --rate is set)")
+    bench.add_argument('-w', '--workers', type=int, default=os.cpu_count() or 1, help="worker processes")
+    bench.add_argument('-k', '--insecure', action='store_true', help="skip TLS verification")
+    bench.add_argument('--json', action='store_true', help="print machine-readable JSON")
+    bench.set_defaults(handler=_bench)
+    return parser
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
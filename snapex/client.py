@@ -1,8 +1,18 @@
-from typing import Any, Optional, Dict, Union, Callable, Iterator
+from typing import TYPE_CHECKING, Any, Optional, Dict, Union, Callable, Iterator, Sequence
+from urllib.parse import urlparse
 from .http import HTTPClient
-from .models import Request, Response, RequestMethod, HTTPVersion
+from .models import Request, Response, RequestMethod, HTTPVersion, TimeoutConfig
 from .exceptions import SnapexError
-from .ws import WebSocket
+from .codecs import CodecRegistry, JSONCodec
+from .headers import Headers
+from .hooks import Hooks
+from .utils import merge_headers
+
+if TYPE_CHECKING:
+    from .prepared import PreparedRequest
+    from .streaming import EventSource
+    from .transports import BaseTransport
+    from .websocket import WebSocketConnect
 
 class Client:
     """Main Snapex client interface"""
@@ -15,19 +25,40 @@ class Client:
         verify: bool = True,
         http_version: HTTPVersion = HTTPVersion.HTTP_1_1,
         default_headers: Optional[Dict[str, str]] = None,
-        cache_ttl: int = 300
+        cache_ttl: int = 300,
+        hooks: Optional[Hooks] = None,
+        json_codec: Optional[Union[str, JSONCodec]] = None,
+        proxy: Optional[Union[str, Dict[str, str]]] = None,
+        no_proxy: Optional[str] = None,
+        trust_env: bool = True,
+        uds: Optional[str] = None,
+        transport: Optional['BaseTransport'] = None,
+        adaptive_pool: bool = False
     ):
         self.base_url = base_url.rstrip('/') if base_url else None
         self.http = HTTPClient(
             pool_size=pool_size,
             timeout=TimeoutConfig(total=timeout) if timeout else None,
             verify=verify,
-            cache_ttl=cache_ttl
+            cache_ttl=cache_ttl,
+            hooks=hooks,
+            codecs=CodecRegistry(json_codec),
+            proxy=proxy,
+            no_proxy=no_proxy,
+            trust_env=trust_env,
+            uds=uds,
+            transport=transport,
+            adaptive_pool=adaptive_pool
         )
-        self.default_headers = default_headers or {}
+        self.default_headers = Headers(default_headers)
         self.default_http_version = http_version
         self.cookies: Dict[str, str] = {}
         
+    @property
+    def codecs(self) -> CodecRegistry:
+        """Codecs for request and response bodies, keyed by media type"""
+        return self.http.codecs
+        
     def request(
         self,
         method: Union[str, RequestMethod],
@@ -38,20 +69,45 @@ class Client:
         if isinstance(method, str):
             method = RequestMethod[method.upper()]
             
-        if self.base_url and not url.startswith(('http://', 'https://')):
+        if self.base_url and not url.startswith(('http://', 'https://', 'http+unix://')):
             url = f"{self.base_url}/{url.lstrip('/')}"
             
+        cookies = kwargs.pop('cookies', None)
         request = Request(
             method=method,
             url=url,
             headers=merge_headers(self.default_headers, kwargs.pop('headers', None)),
-            cookies=merge_headers(self.cookies, kwargs.pop('cookies', None)),
+            cookies={**self.cookies, **cookies} if cookies else dict(self.cookies) if self.cookies else None,
             http_version=kwargs.pop('http_version', self.default_http_version),
             **kwargs
         )
         
         return self.http.request(request)
     
+    def prepare(
+        self,
+        method: Union[str, RequestMethod],
+        url_template: str,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs: Any
+    ) -> 'PreparedRequest':
+        """Pre-encode a request for a hot endpoint, e.g. prepare('GET', '/users/{id}')"""
+        from .prepared import PreparedRequest
+        if isinstance(method, str):
+            method = RequestMethod[method.upper()]
+            
+        if self.base_url and not url_template.startswith(('http://', 'https://', 'http+unix://')):
+            url_template = f"{self.base_url}/{url_template.lstrip('/')}"
+            
+        return PreparedRequest(
+            self.http,
+            method,
+            url_template,
+            merge_headers(self.default_headers, headers),
+            http_version=kwargs.pop('http_version', self.default_http_version),
+            verify=kwargs.pop('verify', None)
+        )
+    
     def get(self, url: str, **kwargs: Any) -> Response:
         """Send GET request"""
         return self.request(RequestMethod.GET, url, **kwargs)
@@ -88,38 +144,81 @@ class Client:
         on_progress: Optional[Callable[[int, int], None]] = None,
         **kwargs: Any
     ) -> Iterator[bytes]:
-        """Stream response content"""
+        """Stream response content in chunks of at most chunk_size bytes"""
         kwargs['stream'] = True
-        response = self.request(method, url, **kwargs)
-        
-        total_size = int(response.headers.get('content-length', 0))
-        downloaded = 0
-        
-        if isinstance(response.body, bytes):
-            chunk = response.body
-            downloaded += len(chunk)
-            if on_progress:
-                on_progress(len(chunk), total_size)
-            yield chunk
-        elif hasattr(response.body, '__iter__'):
-            for chunk in response.body:
-                downloaded += len(chunk)
-                if on_progress:
-                    on_progress(len(chunk), total_size)
-                yield chunk
-                
-        yield b''
+        with self.request(method, url, **kwargs) as response:
+            total_size = int(response.headers.get('content-length', 0))
+            for chunk in response.iter_bytes():
+                for offset in range(0, len(chunk), chunk_size):
+                    piece = bytes(chunk[offset:offset + chunk_size])
+                    if on_progress:
+                        on_progress(len(piece), total_size)
+                    yield piece
     
-    def websocket(self, url: str) -> WebSocket:
-        """Create WebSocket connection"""
+    def sse(
+        self,
+        url: str,
+        last_event_id: Optional[str] = None,
+        retry: float = 3.0,
+        max_reconnects: Optional[int] = None,
+        **kwargs: Any
+    ) -> 'EventSource':
+        """Subscribe to Server-Sent Events, reconnecting with Last-Event-ID"""
+        from .streaming import EventSource
+        if self.base_url and not url.startswith(('http://', 'https://')):
+            url = f"{self.base_url}/{url.lstrip('/')}"
+        return EventSource(self, url, last_event_id, retry, max_reconnects, **kwargs)
+    
+    def websocket(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        subprotocols: Optional[Sequence[str]] = None,
+        max_size: Optional[int] = 2 ** 20,
+        timeout: Optional[float] = None,
+        compression: bool = True,
+        high_watermark: int = 2 ** 20,
+        low_watermark: Optional[int] = None
+    ) -> 'WebSocketConnect':
+        """Open a WebSocket: `with` for a blocking connection, `async with` for asyncio
+
+        permessage-deflate is offered unless compression=False. send()
+        waits while more than high_watermark bytes are queued, until the
+        queue drains to low_watermark (a quarter of it by default).
+        """
+        from .websocket import WebSocketConnect
         if self.base_url and not url.startswith(('ws://', 'wss://')):
             scheme = 'wss://' if urlparse(self.base_url).scheme == 'https' else 'ws://'
             url = f"{scheme}{urlparse(self.base_url).netloc}/{url.lstrip('/')}"
-        return WebSocket(self, url)
+        return WebSocketConnect(
+            self, url, headers, subprotocols, max_size, timeout,
+            compression, high_watermark, low_watermark
+        )
+    
+    def warmup(
+        self,
+        origins: Optional[Union[str, Sequence[str]]] = None,
+        connections_per_origin: int = 1
+    ) -> Dict[str, int]:
+        """Pre-connect to origins (the base URL by default) before traffic arrives
+
+        DNS, TCP, proxy tunnels and TLS are done in parallel and the
+        connections are parked in the pool; returns how many were opened
+        per origin.
+        """
+        if origins is None:
+            origins = [self.base_url] if self.base_url else []
+        elif isinstance(origins, str):
+            origins = [origins]
+        return self.http.warmup(list(origins), connections_per_origin, self.default_http_version)
+    
+    def on(self, event: str, callback: Optional[Callable[..., Any]] = None) -> Callable[..., Any]:
+        """Register an event hook (request_start, cache_hit, ...)"""
+        return self.http.hooks.on(event, callback)
     
     def close(self) -> None:
         """Close client and release resources"""
-        self.http.pool.close()
+        self.http.close()
         
     def __enter__(self) -> 'Client':
         return self
@@ -0,0 +1,106 @@
+from typing import Any, Dict, Optional, Union
+
+BytesLike = Union[bytes, bytearray, memoryview]
+
+class JSONCodec:
+    """Stdlib JSON codec; subclasses plug in faster libraries
+
+    Codecs always encode to bytes and decode from any bytes-like object,
+    so request bodies and response buffers never round-trip through str.
+    """
+    name = 'json'
+
+    def __init__(self):
+        import json
+        self._json = json
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._json.dumps(obj, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+    def loads(self, data: BytesLike) -> Any:
+        if isinstance(data, memoryview):
+            data = bytes(data)  # json.loads only sniffs UTF-16/32 BOMs on bytes
+        return self._json.loads(data)
+
+class OrjsonCodec(JSONCodec):
+    """JSON codec backed by orjson (bytes in, bytes out, accepts memoryview)"""
+    name = 'orjson'
+
+    def __init__(self):
+        import orjson
+        self._orjson = orjson
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj)
+
+    def loads(self, data: BytesLike) -> Any:
+        return self._orjson.loads(data)
+
+class UjsonCodec(JSONCodec):
+    """JSON codec backed by ujson"""
+    name = 'ujson'
+
+    def __init__(self):
+        import ujson
+        self._ujson = ujson
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._ujson.dumps(obj, ensure_ascii=False).encode('utf-8')
+
+    def loads(self, data: BytesLike) -> Any:
+        if not isinstance(data, bytes):
+            data = bytes(data)
+        return self._ujson.loads(data)
+
+JSON_CODECS = {
+    'orjson': OrjsonCodec,
+    'ujson': UjsonCodec,
+    'json': JSONCodec,
+}
+
+_default_json_codec: Optional[JSONCodec] = None
+
+def get_json_codec(name: Optional[str] = None) -> JSONCodec:
+    """Get a JSON codec by name, or the fastest one installed"""
+    global _default_json_codec
+    if name is not None:
+        if name not in JSON_CODECS:
+            raise ValueError(f"Unknown JSON codec: {name}")
+        return JSON_CODECS[name]()
+    if _default_json_codec is None:
+        for codec in JSON_CODECS.values():
+            try:
+                _default_json_codec = codec()
+                break
+            except ImportError:
+                continue
+    return _default_json_codec
+
+class CodecRegistry:
+    """Maps media types to codecs used for request and response bodies"""
+
+    def __init__(self, json_codec: Optional[Union[str, JSONCodec]] = None):
+        self._codecs: Dict[str, Any] = {}
+        if json_codec is not None:
+            self.register('application/json', json_codec if isinstance(json_codec, JSONCodec) else get_json_codec(json_codec))
+
+    def register(self, media_type: str, codec: Any) -> None:
+        """Use codec (anything with dumps/loads) for media_type"""
+        self._codecs[media_type.lower()] = codec
+
+    @property
+    def json(self) -> JSONCodec:
+        codec = self._codecs.get('application/json')
+        if codec is None:
+            codec = self._codecs['application/json'] = get_json_codec()
+        return codec
+
+    def get(self, content_type: Optional[str]) -> Optional[Any]:
+        """Find the codec for a Content-Type header value"""
+        if not content_type:
+            return None
+        media_type = content_type.split(';', 1)[0].strip().lower()
+        codec = self._codecs.get(media_type)
+        if codec is None and (media_type == 'application/json' or media_type.endswith('+json')):
+            codec = self.json
+        return codec
@@ -1,208 +1,846 @@
+import select
 import socket
-import ssl
 import time
 import threading
-from typing import Optional, Deque, Dict, Tuple
+from typing import TYPE_CHECKING, Any, Optional, Deque, Dict, Iterator, List, Tuple
 from collections import defaultdict, deque
-from .models import HTTPVersion
-from .exceptions import ConnectionError, TimeoutError
+from .models import Deadline, HTTPVersion, Timings
+from .headers import Headers
+from .hooks import Hooks, CONNECTION_CREATE, CONNECTION_REUSE, CONNECTION_CLOSE
+from .exceptions import ConnectionError, ProxyError, TimeoutError
+from .utils import host_header, split_url
+
+if TYPE_CHECKING:
+    import ssl
+    from .proxy import Proxy
+
+PoolKey = Tuple[str, int, bool, HTTPVersion, Optional[str]]
+
+# Socket timeout for connects and each send or receive that no TimeoutConfig limits,
+# except reads of a streamed body, which wait as long as the server stays quiet
+SOCKET_TIMEOUT = 5.0
+
+def _origin(key: PoolKey) -> str:
+    """scheme://host:port of a pool key, as utils.origin_of gives for its URLs"""
+    return f"{'https' if key[2] else 'http'}://{key[0]}:{key[1]}"
 
 class ConnectionPool:
-    """Thread-safe connection pool with keep-alive support"""
+    """Thread-safe connection pool with keep-alive support
+
+    With adaptive=True the number of connections kept per origin follows
+    the peak concurrency seen over the last one or two adapt_interval
+    windows, plus a quarter for headroom: the pool opens connections in
+    the background once demand nears that target, and closes idle ones
+    above it as demand falls away.
+
+    Connections opened ahead of demand (warmup() and adaptive growth)
+    are closed after warm_idle_timeout unused, which stays below the
+    5 second keep-alive timeout common on servers, so a warmed socket is
+    not reused just as the server closes it.
+
+    When every slot is taken, a request with a pool or total timeout
+    waits for one to be released; without either it fails at once.
+    """
     
-    def __init__(self, max_size: int = 100, idle_timeout: float = 30.0):
+    def __init__(
+        self,
+        max_size: int = 100,
+        idle_timeout: float = 30.0,
+        hooks: Optional[Hooks] = None,
+        adaptive: bool = False,
+        adapt_interval: float = 10.0,
+        warm_idle_timeout: float = 4.0
+    ):
         self.max_size = max_size
         self.idle_timeout = idle_timeout
-        self._pools: Dict[Tuple[str, int, bool, HTTPVersion], Deque[socket.socket]] = defaultdict(deque)
+        self.warm_idle_timeout = warm_idle_timeout
+        self.hooks = hooks or Hooks()
+        self.adaptive = adaptive
+        self.adapt_interval = adapt_interval
+        # Idle connections per key as (expiry time, socket), soonest to expire first
+        self._pools: Dict[PoolKey, Deque[Tuple[float, socket.socket]]] = defaultdict(deque)
         self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
         self._active_connections = 0
+        self._created = 0
+        self._reused = 0
+        self._closed = 0
+        self._exhausted = 0
+        self._tls_resumed = 0
+        self._stale = 0
+        self._tls_sessions: Dict[Tuple[str, int, 'ssl.SSLContext'], 'ssl.SSLSession'] = {}
+        self._prewarmed = 0
+        self._trimmed = 0
+        self._generation = 0  # bumped by close() so late background opens are discarded
+        # Adaptive sizing: connections checked out, and [window start, previous peak, current peak]
+        self._in_use: Dict[PoolKey, int] = defaultdict(int)
+        self._demand: Dict[PoolKey, List[float]] = {}
+        self._filling: set = set()
 
     def get_connection(
         self,
         host: str,
         port: int,
-        ssl_context: Optional[ssl.SSLContext] = None,
-        http_version: HTTPVersion = HTTPVersion.HTTP_1_1
+        ssl_context: Optional['ssl.SSLContext'] = None,
+        http_version: HTTPVersion = HTTPVersion.HTTP_1_1,
+        timings: Optional[Timings] = None,
+        proxy: Optional['Proxy'] = None,
+        uds: Optional[str] = None,
+        deadline: Optional[Deadline] = None,
+        fresh: bool = False
     ) -> socket.socket:
-        """Get a connection from pool or create new one"""
+        """Get a connection from pool or create new one
+
+        With a proxy, the connection is a CONNECT tunnel to host:port and
+        is pooled separately for each (proxy, origin) pair. With uds, it
+        is a Unix domain socket at that path, pooled per path and origin.
+        Idle connections the server has closed are discarded, and fresh
+        skips the idle ones altogether.
+        """
+        sock = None
+        exhausted = False
+        timed_out = False
+        grow = 0
+        wait_until: Optional[float] = None
         with self._lock:
-            key = (host, port, ssl_context is not None, http_version)
+            key = self._key(host, port, ssl_context, http_version, proxy, uds)
             
             # Clean up idle connections
-            self._cleanup()
+            expired = self._cleanup()
             
-            if key in self._pools and self._pools[key]:
-                return self._pools[key].popleft()
+            while True:
+                if not fresh and key in self._pools and self._pools[key]:
+                    _, sock = self._pools[key].popleft()
+                    if self._is_alive(sock):
+                        self._reused += 1
+                        break
+                    sock.close()
+                    sock = None
+                    self._active_connections -= 1
+                    self._closed += 1
+                    self._stale += 1
+                    expired.append(key)
+                    continue
+                if self._active_connections < self.max_size or self._evict_idle(expired):
+                    self._active_connections += 1
+                    break
+                if wait_until is None:
+                    limit = deadline.remaining('pool') if deadline is not None else None
+                    if limit is None:
+                        self._exhausted += 1
+                        exhausted = True
+                        break
+                    wait_until = time.perf_counter() + limit
+                left = wait_until - time.perf_counter()
+                if left <= 0:
+                    self._exhausted += 1
+                    timed_out = True
+                    break
+                self._available.wait(left)
+                expired += self._cleanup()
+            if self.adaptive and not (exhausted or timed_out):
+                grow = self._checkout(key)
+                generation = self._generation
                 
-            if self._active_connections >= self.max_size:
-                raise ConnectionError("Connection pool limit reached")
+        if grow:
+            threading.Thread(
+                target=self._prefill,
+                args=(key, generation, grow, host, port, ssl_context, proxy, uds),
+                name='snapex-pool-grow',
+                daemon=True
+            ).start()
+        if expired and self.hooks.active:
+            for expired_key in expired:
+                self.hooks.emit(CONNECTION_CLOSE, host=expired_key[0], port=expired_key[1], origin=_origin(expired_key), reason='idle')
                 
-            self._active_connections += 1
+        if sock is not None:
+            if timings:
+                timings.pool_acquired = time.perf_counter()
+                timings.mark_reused()
+            if self.hooks.active:
+                self.hooks.emit(CONNECTION_REUSE, host=host, port=port, origin=_origin(key))
+            return sock
+            
+        if exhausted:
+            raise ConnectionError("Connection pool limit reached")
+        if timed_out:
+            raise TimeoutError(f"Timed out waiting for a pooled connection to {host}:{port}")
             
+        if timings:
+            timings.pool_acquired = time.perf_counter()
         try:
-            sock = socket.create_connection((host, port), timeout=5)
-            if ssl_context:
-                sock = ssl_context.wrap_socket(sock, server_hostname=host)
-            return sock
+            sock = self._open(host, port, ssl_context, timings, proxy, uds, deadline)
         except Exception as e:
             with self._lock:
                 self._active_connections -= 1
+                if self.adaptive:
+                    self._in_use[key] -= 1
+                self._available.notify()
+            if isinstance(e, (ProxyError, TimeoutError)):
+                raise
+            if isinstance(e, socket.timeout):
+                raise TimeoutError(f"Timed out connecting to {host}:{port}")
             raise ConnectionError(f"Failed to establish connection: {e}")
+            
+        with self._lock:
+            self._created += 1
+        if self.hooks.active:
+            self.hooks.emit(CONNECTION_CREATE, host=host, port=port, origin=_origin(key))
+        return sock
+
+    def _target(self, key: PoolKey, now: float) -> int:
+        """Connections to keep for key under adaptive sizing (called with the lock held)"""
+        window = self._demand.get(key)
+        if window is None:
+            return 0
+        start, previous, current = window
+        if now - start >= self.adapt_interval:
+            previous = current if now - start < 2 * self.adapt_interval else 0
+            current = self._in_use[key]
+            window[:] = [now, previous, current]
+        peak = max(previous, current)
+        return int(peak + (peak + 3) // 4)
+
+    def _checkout(self, key: PoolKey) -> int:
+        """Record a checkout; returns how many connections to open ahead of demand"""
+        in_use = self._in_use[key] = self._in_use[key] + 1
+        now = time.time()
+        window = self._demand.setdefault(key, [now, 0, 0])
+        target = self._target(key, now)
+        if in_use > window[2]:
+            window[2] = in_use
+            target = max(target, in_use + (in_use + 3) // 4)
+        if key in self._filling:
+            return 0
+        # Leave half the spare capacity to requests that need a connection now
+        spare = (self.max_size - self._active_connections) // 2
+        grow = min(target - in_use - len(self._pools[key]), spare)
+        if grow <= 0:
+            return 0
+        self._filling.add(key)
+        self._active_connections += grow
+        return grow
+
+    def warmup(
+        self,
+        host: str,
+        port: int,
+        ssl_context: Optional['ssl.SSLContext'] = None,
+        http_version: HTTPVersion = HTTPVersion.HTTP_1_1,
+        count: int = 1,
+        proxy: Optional['Proxy'] = None,
+        uds: Optional[str] = None
+    ) -> int:
+        """Open connections in parallel until count are idle for the origin
+
+        Returns how many were opened; failed connects are not retried.
+        """
+        with self._lock:
+            key = self._key(host, port, ssl_context, http_version, proxy, uds)
+            missing = min(count - len(self._pools[key]), self.max_size - self._active_connections)
+            if missing <= 0:
+                return 0
+            self._active_connections += missing
+            if self.adaptive:
+                window = self._demand.setdefault(key, [time.time(), 0, 0])
+                window[2] = max(window[2], count)
+            generation = self._generation
+        return self._prefill(key, generation, missing, host, port, ssl_context, proxy, uds)
+
+    def _prefill(
+        self,
+        key: PoolKey,
+        generation: int,
+        count: int,
+        host: str,
+        port: int,
+        ssl_context: Optional['ssl.SSLContext'],
+        proxy: Optional['Proxy'],
+        uds: Optional[str]
+    ) -> int:
+        """Open count reserved connections in parallel and park them idle"""
+        opened: List[bool] = []
+        
+        def open_one() -> None:
+            try:
+                sock = self._open(host, port, ssl_context, None, proxy, uds)
+            except Exception:
+                with self._lock:
+                    if self._generation == generation:
+                        self._active_connections -= 1
+                        self._available.notify()
+                return
+            with self._lock:
+                current = self._generation == generation
+                if current:
+                    # Front of the queue: reused first, and the first to expire
+                    self._pools[key].appendleft((time.time() + self.warm_idle_timeout, sock))
+                    self._created += 1
+                    self._prewarmed += 1
+            if not current:
+                sock.close()
+                return
+            opened.append(True)
+            if self.hooks.active:
+                self.hooks.emit(CONNECTION_CREATE, host=host, port=port, origin=_origin(key))
+        
+        threads = [threading.Thread(target=open_one, daemon=True) for _ in range(count - 1)]
+        for thread in threads:
+            thread.start()
+        open_one()
+        for thread in threads:
+            thread.join()
+        with self._lock:
+            self._filling.discard(key)
+        return len(opened)
+
+    def _open(
+        self,
+        host: str,
+        port: int,
+        ssl_context: Optional['ssl.SSLContext'],
+        timings: Optional[Timings],
+        proxy: Optional['Proxy'] = None,
+        uds: Optional[str] = None,
+        deadline: Optional[Deadline] = None
+    ) -> socket.socket:
+        """Resolve, connect and handshake a new socket, marking each phase
+
+        TLS reuses the last session negotiated with the origin, so new
+        connections (tunnelled or not) can skip the full handshake. Each
+        step is bounded by what the deadline leaves for connect.
+        """
+        if uds is not None:
+            sock = self._open_unix(uds, timings, deadline)
+        else:
+            sock = self._open_tcp(*((proxy.host, proxy.port) if proxy else (host, port)), timings, deadline)
+        try:
+            if proxy:
+                from .proxy import open_tunnel
+                sock.settimeout(_budget(deadline, 'connect'))
+                open_tunnel(sock, proxy, host, port)
+            if timings:
+                timings.connect_done = time.perf_counter()
+            if ssl_context:
+                sock.settimeout(_budget(deadline, 'connect'))
+                session = self._tls_sessions.get((host, port, ssl_context))
+                sock = ssl_context.wrap_socket(sock, server_hostname=host, session=session)
+        except BaseException:
+            sock.close()
+            raise
+        if ssl_context:
+            with self._lock:
+                if sock.session_reused:
+                    self._tls_resumed += 1
+                elif sock.session is not None:
+                    # TLS 1.2 sessions are usable right away; 1.3 tickets are picked up on release
+                    self._tls_sessions[(host, port, ssl_context)] = sock.session
+        if timings:
+            timings.tls_done = time.perf_counter()
+        return sock
+
+    @staticmethod
+    def _open_tcp(host: str, port: int, timings: Optional[Timings], deadline: Optional[Deadline] = None) -> socket.socket:
+        addresses = socket.getaddrinfo(host, port, 0, socket.SOCK_STREAM)
+        if timings:
+            timings.dns_done = time.perf_counter()
+            
+        error: Optional[Exception] = None
+        for *_, address in addresses:
+            try:
+                return socket.create_connection(address[:2], timeout=_budget(deadline, 'connect'))
+            except socket.error as e:
+                error = e
+        raise error or socket.error(f"No addresses for {host}")
+
+    @staticmethod
+    def _open_unix(path: str, timings: Optional[Timings], deadline: Optional[Deadline] = None) -> socket.socket:
+        if timings:
+            timings.dns_done = time.perf_counter()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(_budget(deadline, 'connect'))
+        try:
+            sock.connect(path)
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+
+    @staticmethod
+    def _key(
+        host: str,
+        port: int,
+        ssl_context: Optional['ssl.SSLContext'],
+        http_version: HTTPVersion,
+        proxy: Optional['Proxy'],
+        uds: Optional[str]
+    ) -> Tuple[str, int, bool, HTTPVersion, Optional[str]]:
+        """Pool key: the origin plus the proxy or Unix socket it is reached through"""
+        via = proxy.origin if proxy else f"unix:{uds}" if uds is not None else None
+        return host, port, ssl_context is not None, http_version, via
 
     def release_connection(
         self,
         host: str,
         port: int,
         sock: socket.socket,
-        ssl_context: Optional[ssl.SSLContext] = None,
-        http_version: HTTPVersion = HTTPVersion.HTTP_1_1
+        ssl_context: Optional['ssl.SSLContext'] = None,
+        http_version: HTTPVersion = HTTPVersion.HTTP_1_1,
+        proxy: Optional['Proxy'] = None,
+        uds: Optional[str] = None
     ) -> None:
         """Return connection to pool"""
+        key = self._key(host, port, ssl_context, http_version, proxy, uds)
         if sock._closed:  # type: ignore
             with self._lock:
                 self._active_connections -= 1
+                self._closed += 1
+                if self.adaptive:
+                    self._in_use[key] -= 1
+                self._available.notify()
+            if self.hooks.active:
+                self.hooks.emit(CONNECTION_CLOSE, host=host, port=port, origin=_origin(key), reason='closed')
             return
             
-        key = (host, port, ssl_context is not None, http_version)
+        # With TLS 1.3 the resumable session ticket arrives after the handshake
+        session = getattr(sock, 'session', None) if ssl_context is not None else None
         
+        reason = 'pool_full'
         with self._lock:
-            if len(self._pools[key]) < self.max_size:
-                self._pools[key].append((time.time(), sock))
+            if session is not None:
+                self._tls_sessions[(host, port, ssl_context)] = session
+            keep = len(self._pools[key]) < self.max_size
+            if self.adaptive:
+                in_use = self._in_use[key] = self._in_use[key] - 1
+                if keep and in_use + len(self._pools[key]) >= self._target(key, time.time()):
+                    keep = False
+                    reason = 'trimmed'
+                    self._trimmed += 1
+            self._available.notify()
+            if keep:
+                self._pools[key].append((time.time() + self.idle_timeout, sock))
+                return
+            self._active_connections -= 1
+            self._closed += 1
+        sock.close()
+        if self.hooks.active:
+            self.hooks.emit(CONNECTION_CLOSE, host=host, port=port, origin=_origin(key), reason=reason)
+
+    @staticmethod
+    def _is_alive(sock: socket.socket) -> bool:
+        """False when an idle connection was closed (or written to) by the server
+
+        An idle socket should have nothing to read; if it does, it is EOF
+        or stray data, except for TLS 1.3 session tickets, which a
+        non-blocking read consumes without returning application data.
+        """
+        try:
+            if hasattr(select, 'poll'):
+                poller = select.poll()
+                poller.register(sock, select.POLLIN)
+                readable = bool(poller.poll(0))
             else:
-                self._active_connections -= 1
-                sock.close()
+                readable = bool(select.select([sock], [], [], 0)[0])
+        except (OSError, ValueError):
+            return False
+        if not readable:
+            return True
+        if not hasattr(sock, 'pending'):
+            return False
+        import ssl
+        timeout = sock.gettimeout()
+        try:
+            sock.setblocking(False)
+            sock.recv(1)
+            return False
+        except ssl.SSLWantReadError:
+            return True
+        except (OSError, ValueError):
+            return False
+        finally:
+            if not sock._closed:  # type: ignore
+                sock.settimeout(timeout)
+
+    def _evict_idle(self, expired: list) -> bool:
+        """Close the idle connection of any origin nearest to expiry, to free a slot"""
+        oldest = None
+        for key, pool in self._pools.items():
+            if pool and (oldest is None or pool[0][0] < self._pools[oldest][0][0]):
+                oldest = key
+        if oldest is None:
+            return False
+        _, sock = self._pools[oldest].popleft()
+        sock.close()
+        self._active_connections -= 1
+        self._closed += 1
+        expired.append(oldest)
+        return True
 
-    def _cleanup(self) -> None:
-        """Clean up idle connections"""
+    def _cleanup(self) -> list:
+        """Clean up idle connections, returning the keys of those closed
+
+        Adaptive pools also close the oldest idle connections above each
+        origin's target.
+        """
         now = time.time()
+        expired = []
         for key in list(self._pools.keys()):
             pool = self._pools[key]
             while pool:
-                if now - pool[0][0] > self.idle_timeout:
+                if pool[0][0] < now:
                     _, sock = pool.popleft()
                     sock.close()
                     self._active_connections -= 1
+                    self._closed += 1
+                    expired.append(key)
                 else:
                     break
+            if self.adaptive and key not in self._filling:
+                excess = self._in_use[key] + len(pool) - self._target(key, now)
+                for _ in range(min(excess, len(pool))):
+                    _, sock = pool.popleft()
+                    sock.close()
+                    self._active_connections -= 1
+                    self._closed += 1
+                    self._trimmed += 1
+                    expired.append(key)
+        return expired
 
     def close(self) -> None:
         """Close all connections in pool"""
+        closed = []
         with self._lock:
-            for pool in self._pools.values():
+            for key, pool in self._pools.items():
                 for _, sock in pool:
                     try:
                         sock.close()
                     except:
                         pass
+                    closed.append(key)
                 pool.clear()
             self._pools.clear()
+            self._tls_sessions.clear()
+            self._in_use.clear()
+            self._demand.clear()
+            self._filling.clear()
+            self._generation += 1
+            self._closed += len(closed)
             self._active_connections = 0
+            self._available.notify_all()
+        if self.hooks.active:
+            for key in closed:
+                self.hooks.emit(CONNECTION_CLOSE, host=key[0], port=key[1], origin=_origin(key), reason='shutdown')
+
+    @property
+    def stats(self) -> dict:
+        """Get pool statistics"""
+        with self._lock:
+            idle = {
+                f"{key[0]}:{key[1]}": len(pool) for key, pool in self._pools.items() if pool
+            }
+            idle_total = sum(idle.values())
+            return {
+                'max_size': self.max_size,
+                'active': self._active_connections,
+                'idle': idle_total,
+                'in_use': self._active_connections - idle_total,
+                'idle_by_origin': idle,
+                'created': self._created,
+                'reused': self._reused,
+                'closed': self._closed,
+                'exhausted': self._exhausted,
+                'tls_resumed': self._tls_resumed,
+                'stale': self._stale,
+                'prewarmed': self._prewarmed,
+                'trimmed': self._trimmed
+            }
+
+def _budget(deadline: Optional[Deadline], phase: str) -> float:
+    """Socket timeout for the next step of phase; uncapped phases keep SOCKET_TIMEOUT"""
+    limit = deadline.remaining(phase) if deadline is not None else None
+    return SOCKET_TIMEOUT if limit is None else limit
 
 class HTTP1Connection:
     """HTTP/1.1 connection handler"""
     
-    def __init__(self, sock: socket.socket, host: str):
+    def __init__(self, sock: socket.socket, host: str, proxy: Optional['Proxy'] = None):
         self.sock = sock
         self.host = host
+        self.proxy = proxy  # forward proxy: requests use the absolute URL as target
+        self.deadline: Optional[Deadline] = None
         self._lock = threading.Lock()
+        self._buffer = bytearray()
         
-    def send_request(self, request: 'Request') -> 'Response':
+    def send_request(
+        self,
+        request: 'Request',
+        timings: Optional[Timings] = None,
+        deadline: Optional[Deadline] = None
+    ) -> 'Response':
         """Send HTTP/1.1 request"""
-        from .models import Response
-        from .utils import elapsed_time
-        
-        start = time.time()
+        body = request.body
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        head, chunked = self._build_head(request, body)
+        return self.send_raw(request, head, body, timings, chunked=chunked, deadline=deadline)
+    
+    def _build_head(self, request: 'Request', body: Any = None) -> Tuple[bytes, bool]:
+        """Encode request line and headers; the header block is encoded once per Headers
+
+        Returns the head and whether the body must be sent chunked: bytes
+        bodies get a Content-Length, iterables Transfer-Encoding: chunked,
+        unless the caller already framed the body itself.
+        """
+        headers = request.headers
+        if not isinstance(headers, Headers):
+            headers = Headers(headers)
+        if self.proxy is None:
+            head = f"{request.method.value} {split_url(request.url)[3]} HTTP/1.1\r\n".encode()
+        else:
+            head = f"{request.method.value} {request.url} HTTP/1.1\r\n".encode() + self.proxy.auth_line
+        if 'host' not in headers:
+            head += f"Host: {host_header(request.url)}\r\n".encode()
+        head += headers.encode()
+        if 'connection' not in headers:
+            head += b"Connection: keep-alive\r\n"
+        chunked = False
+        if body is not None and 'content-length' not in headers and 'transfer-encoding' not in headers:
+            if isinstance(body, (bytes, bytearray, memoryview)):
+                head += b"Content-Length: %d\r\n" % memoryview(body).nbytes
+            else:
+                head += b"Transfer-Encoding: chunked\r\n"
+                chunked = True
+        return head + b"\r\n", chunked
+    
+    def send_raw(
+        self,
+        request: 'Request',
+        head: bytes,
+        body: Any = None,
+        timings: Optional[Timings] = None,
+        chunked: bool = False,
+        deadline: Optional[Deadline] = None
+    ) -> 'Response':
+        """Send a pre-encoded request head and body, then read the response
+
+        With a deadline every send and receive is bounded by what is left
+        of it; otherwise each is bounded by SOCKET_TIMEOUT. A streamed body
+        is read with no limit but the read cap, if one is set.
+        """
+        if timings is None:
+            timings = Timings()
+            timings.pool_acquired = timings.tls_done = timings.start
         
         with self._lock:
+            self.deadline = deadline
+            if deadline is None and self.sock.gettimeout() != SOCKET_TIMEOUT:
+                self.sock.settimeout(SOCKET_TIMEOUT)
             try:
-                # Build request
-                request_lines = [
-                    f"{request.method.value} {request.url.path}?{request.url.query} HTTP/1.1",
-                    f"Host: {self.host}",
-                    *[f"{k}: {v}" for k, v in request.headers.items()],
-                    "Connection: keep-alive",
-                    "", ""
-                ]
-                
-                # Send headers
-                self.sock.sendall("\r\n".join(request_lines).encode())
-                
-                # Send body
-                if request.body:
-                    if isinstance(request.body, (str, bytes)):
-                        body = request.body if isinstance(request.body, bytes) else request.body.encode()
-                        self.sock.sendall(body)
-                    elif hasattr(request.body, '__iter__'):
-                        for chunk in request.body:
-                            self.sock.sendall(chunk if isinstance(chunk, bytes) else chunk.encode())
+                if isinstance(body, str):
+                    body = body.encode()
+                if body is None:
+                    self._send(head)
+                elif isinstance(body, (bytes, bytearray, memoryview)):
+                    # One write for head and body avoids a Nagle stall on small requests
+                    if not body:
+                        self._send(head)
+                    elif len(body) <= 65536:
+                        self._send(head + body)
+                    else:
+                        self._send(head)
+                        self._send(body)
+                else:
+                    self._send(head)
+                    for chunk in body:
+                        if isinstance(chunk, str):
+                            chunk = chunk.encode()
+                        if chunked:
+                            if not chunk:
+                                continue
+                            chunk = b"%x\r\n" % len(chunk) + chunk + b"\r\n"
+                        self._send(chunk)
+                    if chunked:
+                        self._send(b"0\r\n\r\n")
+                timings.request_sent = time.perf_counter()
                 
                 # Parse response
-                return self._parse_response(request, elapsed_time(start))
+                return self._parse_response(request, timings)
+            except TimeoutError:
+                raise
             except socket.timeout as e:
-                raise TimeoutError(str(e))
+                raise TimeoutError(f"Timed out {'sending to' if timings.request_sent is None else 'reading from'} {self.host}: {e}")
             except Exception as e:
                 raise ConnectionError(str(e))
     
-    def _parse_response(self, request: 'Request', elapsed: float) -> 'Response':
+    def _send(self, data: Any) -> None:
+        if self.deadline is not None:
+            self.sock.settimeout(_budget(self.deadline, 'write'))
+        self.sock.sendall(data)
+    
+    def _recv_timeout(self) -> None:
+        if self.deadline is not None:
+            self.sock.settimeout(_budget(self.deadline, 'read'))
+    
+    def _parse_response(self, request: 'Request', timings: Timings) -> 'Response':
         """Parse HTTP/1.1 response"""
         from .models import Response
         
-        # Read status line
-        status_line = self._read_line()
-        if not status_line.startswith("HTTP/1."):
-            raise ConnectionError("Invalid HTTP response")
-        
-        _, status_code, _ = status_line.split(maxsplit=2)
-        status_code = int(status_code)
+        if not self._buffer and not self._fill():
+            raise ConnectionError("Connection closed before response")
+        timings.first_byte = time.perf_counter()
         
-        # Read headers
-        headers = {}
+        # Read status line and header block; headers are parsed lazily
         while True:
-            line = self._read_line()
-            if not line:
-                break
-            key, value = line.split(":", 1)
-            headers[key.strip()] = value.strip()
+            status_line, _, raw_headers = self._read_until(b"\r\n\r\n").partition(b"\r\n")
+            if not status_line.startswith(b"HTTP/1."):
+                raise ConnectionError("Invalid HTTP response")
+            status_code = int(status_line.split(None, 2)[1])
+            if status_code >= 200 or status_code == 101:
+                break  # Skip interim 1xx responses such as 100 Continue
+        headers = Headers.from_raw(raw_headers)
         
         # Read body
-        body = b''
-        if "content-length" in headers:
-            length = int(headers["content-length"])
-            body = self._read_bytes(length)
-        elif "transfer-encoding" in headers and headers["transfer-encoding"].lower() == "chunked":
-            while True:
-                chunk_size_line = self._read_line()
-                chunk_size = int(chunk_size_line.split(";")[0], 16)
-                if chunk_size == 0:
-                    break
-                body += self._read_bytes(chunk_size)
-                self._read_line()  # Consume trailing \r\n
+        body: Any = b''
+        length = headers.peek('content-length')
+        transfer_encoding = headers.peek('transfer-encoding')
+        chunked = bool(transfer_encoding) and transfer_encoding.lower().endswith('chunked')
+        connection = headers.peek('connection')
+        keep_alive = not (connection and connection.lower() == 'close')
+        if request.method.value == 'HEAD' or status_code in (101, 204, 304):
+            pass
+        elif request.stream:
+            from .streaming import ResponseStream
+            # total covers the response head; the body is only bounded by a read cap
+            if self.deadline is not None:
+                self.deadline = self.deadline.open_ended()
+            if self.deadline is None:
+                self.sock.settimeout(None)
+            size = int(length) if length is not None and not chunked else None
+            body = ResponseStream(self._stream_body(chunked, size, keep_alive))
+            keep_alive = True  # the stream closes the socket when it is done
+        elif chunked:
+            body = self._read_chunked()
+        elif length is not None:
+            body = self._read_bytes(int(length))
+        else:
+            body = self._read_to_close()
+        
+        if not keep_alive:
+            self.sock.close()
+        timings.end = time.perf_counter()
         
         return Response(
             status_code=status_code,
             headers=headers,
             body=body,
             request=request,
-            elapsed=elapsed,
-            http_version=HTTPVersion.HTTP_1_1
+            elapsed=timings.total,
+            http_version=HTTPVersion.HTTP_1_1,
+            timings=timings
         )
     
+    def _fill(self) -> bool:
+        """Receive more data into the buffer; False once the peer has closed"""
+        self._recv_timeout()
+        data = self.sock.recv(16384)
+        if not data:
+            return False
+        self._buffer += data
+        return True
+    
+    def _read_until(self, delimiter: bytes) -> bytearray:
+        """Read up to (and consume) delimiter, without re-scanning old data"""
+        scanned = 0
+        while True:
+            index = self._buffer.find(delimiter, scanned)
+            if index >= 0:
+                data = self._buffer[:index]
+                del self._buffer[:index + len(delimiter)]
+                return data
+            scanned = max(0, len(self._buffer) - len(delimiter) + 1)
+            if not self._fill():
+                raise ConnectionError("Connection closed mid-response")
+    
     def _read_line(self) -> str:
-        """Read a line from socket"""
-        line = bytearray()
+        """Read a CRLF-terminated line"""
+        return self._read_until(b"\r\n").decode('latin-1')
+    
+    def _read_bytes(self, length: int) -> memoryview:
+        """Read exact number of bytes into a fresh buffer, returned as a memoryview"""
+        if len(self._buffer) >= length:
+            data = self._buffer[:length]
+            del self._buffer[:length]
+            return memoryview(data)
+        data = bytearray(length)
+        view = memoryview(data)
+        filled = len(self._buffer)
+        view[:filled] = self._buffer
+        self._buffer.clear()
+        while filled < length:
+            self._recv_timeout()
+            received = self.sock.recv_into(view[filled:])
+            if not received:
+                raise ConnectionError("Connection closed mid-body")
+            filled += received
+        return view
+    
+    def _read_chunked(self) -> bytes:
+        """Read a chunked body and its trailers"""
+        chunks = []
         while True:
-            char = self.sock.recv(1)
-            if char == b'\n':
+            chunk_size = int(self._read_line().split(";")[0], 16)
+            if chunk_size == 0:
                 break
-            line.extend(char)
-        return line.decode().rstrip('\r')
+            chunks.append(self._read_bytes(chunk_size))
+            self._read_line()  # Consume trailing \r\n
+        while self._read_line():
+            pass  # Discard trailers
+        return b''.join(chunks)
     
-    def _read_bytes(self, length: int) -> bytes:
-        """Read exact number of bytes from socket"""
-        data = bytearray()
-        while len(data) < length:
-            packet = self.sock.recv(length - len(data))
-            if not packet:
-                break
-            data.extend(packet)
-        return bytes(data)
\ No newline at end of file
+    def _read_to_close(self) -> memoryview:
+        """Read until the server closes the connection"""
+        while self._fill():
+            pass
+        data, self._buffer = self._buffer, bytearray()
+        self.sock.close()
+        return memoryview(data)
+    
+    def _stream_body(self, chunked: bool, length: Optional[int], keep_alive: bool) -> Iterator[bytes]:
+        """Yield the body as it arrives, buffering at most one receive at a time"""
+        try:
+            if chunked:
+                while True:
+                    chunk_size = int(self._read_line().split(";")[0], 16)
+                    if chunk_size == 0:
+                        break
+                    yield from self._stream_bytes(chunk_size)
+                    self._read_line()
+                while self._read_line():
+                    pass
+            elif length is not None:
+                yield from self._stream_bytes(length)
+            else:
+                keep_alive = False
+                while self._buffer or self._fill():
+                    chunk = bytes(self._buffer)
+                    self._buffer.clear()
+                    yield chunk
+        except socket.timeout as e:
+            raise TimeoutError(str(e))
+        except OSError as e:
+            raise ConnectionError(str(e))
+        if not keep_alive:
+            self.sock.close()
+    
+    def _stream_bytes(self, remaining: int) -> Iterator[bytes]:
+        while remaining:
+            if not self._buffer and not self._fill():
+                raise ConnectionError("Connection closed mid-body")
+            if len(self._buffer) <= remaining:
+                chunk = bytes(self._buffer)
+                self._buffer.clear()
+            else:
+                chunk = bytes(self._buffer[:remaining])
+                del self._buffer[:remaining]
+            remaining -= len(chunk)
+            yield chunk
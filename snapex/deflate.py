@@ -0,0 +1,94 @@
+import zlib
+from typing import Dict, Optional, Union
+from .exceptions import WebSocketError, WebSocketProtocolError
+from .frames import CLOSE_TOO_BIG
+
+_EMPTY_BLOCK = b'\x00\x00\xff\xff'
+
+class PerMessageDeflate:
+    """permessage-deflate (RFC 7692) state for one client connection
+
+    With context takeover (the default) the compressor and decompressor
+    keep their sliding windows across messages, so repetitive streams
+    such as market data compress far better than message by message.
+    """
+    name = 'permessage-deflate'
+
+    def __init__(
+        self,
+        server_no_context_takeover: bool = False,
+        client_no_context_takeover: bool = False,
+        server_max_window_bits: int = 15,
+        client_max_window_bits: int = 15,
+        level: int = zlib.Z_DEFAULT_COMPRESSION,
+        max_size: Optional[int] = None
+    ):
+        self.server_no_context_takeover = server_no_context_takeover
+        self.client_no_context_takeover = client_no_context_takeover
+        self.server_max_window_bits = server_max_window_bits
+        self.client_max_window_bits = client_max_window_bits
+        self.level = level
+        self.max_size = max_size
+        self._compressor = self._new_compressor()
+        self._decompressor = self._new_decompressor()
+
+    @staticmethod
+    def offer() -> str:
+        """Sec-WebSocket-Extensions value offered in the handshake"""
+        return 'permessage-deflate; client_max_window_bits'
+
+    @classmethod
+    def accept(cls, header: str, level: int = zlib.Z_DEFAULT_COMPRESSION, max_size: Optional[int] = None) -> 'PerMessageDeflate':
+        """Build the agreed state from the server's Sec-WebSocket-Extensions"""
+        extensions = [item.strip() for item in header.split(',') if item.strip()]
+        if len(extensions) != 1:
+            raise WebSocketError(f"Unexpected WebSocket extensions: {header}")
+        name, *params = [part.strip() for part in extensions[0].split(';')]
+        if name != cls.name:
+            raise WebSocketError(f"Server accepted an extension that was not offered: {name}")
+        options: Dict[str, Union[bool, int]] = {}
+        for param in params:
+            key, _, value = param.partition('=')
+            key, value = key.strip(), value.strip().strip('"')
+            if key in options:
+                raise WebSocketError(f"Duplicate permessage-deflate parameter: {key}")
+            if key in ('server_no_context_takeover', 'client_no_context_takeover'):
+                if value:
+                    raise WebSocketError(f"Invalid permessage-deflate parameter: {param}")
+                options[key] = True
+            elif key in ('server_max_window_bits', 'client_max_window_bits'):
+                # zlib cannot produce raw deflate streams with an 8-bit window
+                if not value.isdigit() or not 9 <= int(value) <= 15:
+                    raise WebSocketError(f"Unsupported permessage-deflate parameter: {param}")
+                options[key] = int(value)
+            else:
+                raise WebSocketError(f"Unknown permessage-deflate parameter: {param}")
+        return cls(level=level, max_size=max_size, **options)
+
+    def _new_compressor(self) -> 'zlib._Compress':
+        return zlib.compressobj(self.level, zlib.DEFLATED, -self.client_max_window_bits)
+
+    def _new_decompressor(self) -> 'zlib._Decompress':
+        return zlib.decompressobj(-self.server_max_window_bits)
+
+    def compress(self, payload: Union[bytes, bytearray, memoryview]) -> bytes:
+        """Compress one message payload for a frame with RSV1 set"""
+        if self.client_no_context_takeover:
+            self._compressor = self._new_compressor()
+        data = self._compressor.compress(payload) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+        return data[:-4] if data.endswith(_EMPTY_BLOCK) else data
+
+    def decompress(self, payload: bytes) -> bytes:
+        """Inflate one message, refusing to grow past max_size"""
+        if self.server_no_context_takeover:
+            self._decompressor = self._new_decompressor()
+        limit = self.max_size + 1 if self.max_size is not None else 0
+        try:
+            data = self._decompressor.decompress(payload + _EMPTY_BLOCK, limit)
+        except zlib.error as e:
+            raise WebSocketProtocolError(f"Invalid compressed message: {e}")
+        if self.max_size is not None and (len(data) > self.max_size or self._decompressor.unconsumed_tail):
+            raise WebSocketProtocolError(
+                f"Decompressed message exceeds max_size ({self.max_size} bytes)", CLOSE_TOO_BIG
+            )
+        return data
@@ -1,3 +1,5 @@
+from typing import Optional
+
 class SnapexError(Exception):
     """Base exception for all Snapex errors"""
     pass
@@ -16,6 +18,12 @@ class ConnectionError(SnapexError):
     """Network connection error"""
     pass
 
+class ProxyError(ConnectionError):
+    """Proxy refused or broke the connection; status is its HTTP status, if any"""
+    def __init__(self, message: str, status: Optional[int] = None):
+        self.status = status
+        super().__init__(message)
+
 class TooManyRedirects(SnapexError):
     """Too many redirects"""
     pass
@@ -32,6 +40,19 @@ class WebSocketError(SnapexError):
     """WebSocket related error"""
     pass
 
+class WebSocketProtocolError(WebSocketError):
+    """Peer violated RFC 6455; code is the close code to answer with"""
+    def __init__(self, message: str, code: int = 1002):
+        self.code = code
+        super().__init__(message)
+
+class WebSocketClosed(WebSocketError):
+    """WebSocket connection is closed"""
+    def __init__(self, message: str, code: int = 1006, reason: str = ''):
+        self.code = code
+        self.reason = reason
+        super().__init__(message)
+
 class CacheError(SnapexError):
     """Cache related error"""
     pass
\ No newline at end of file
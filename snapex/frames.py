@@ -0,0 +1,180 @@
+import os
+import struct
+from typing import List, Optional, Union
+from .exceptions import WebSocketProtocolError
+
+OP_CONTINUATION = 0x0
+OP_TEXT = 0x1
+OP_BINARY = 0x2
+OP_CLOSE = 0x8
+OP_PING = 0x9
+OP_PONG = 0xA
+
+CONTROL_OPCODES = (OP_CLOSE, OP_PING, OP_PONG)
+DATA_OPCODES = (OP_CONTINUATION, OP_TEXT, OP_BINARY)
+
+# Close codes used by the client itself (RFC 6455 section 7.4.1)
+CLOSE_NORMAL = 1000
+CLOSE_PROTOCOL_ERROR = 1002
+CLOSE_INVALID_DATA = 1007
+CLOSE_TOO_BIG = 1009
+
+_HEAD = struct.Struct('!BB')
+_LEN16 = struct.Struct('!H')
+_LEN64 = struct.Struct('!Q')
+
+def apply_mask(payload: Union[bytes, bytearray, memoryview], key: bytes) -> bytes:
+    """XOR payload with a 4-byte masking key
+
+    The payload and the repeated key are each read as one big integer and
+    XORed in a single operation, instead of looping over bytes in Python.
+    """
+    length = len(payload)
+    if not length:
+        return b''
+    keystream = key * (length // 4) + key[:length % 4]
+    return (int.from_bytes(payload, 'little') ^ int.from_bytes(keystream, 'little')).to_bytes(length, 'little')
+
+class Frame:
+    """A single WebSocket frame"""
+    __slots__ = ('fin', 'opcode', 'payload', 'rsv1')
+
+    def __init__(self, opcode: int, payload: bytes = b'', fin: bool = True, rsv1: bool = False):
+        self.opcode = opcode
+        self.payload = payload
+        self.fin = fin
+        self.rsv1 = rsv1
+
+    def __repr__(self) -> str:
+        return f"Frame(opcode={self.opcode:#x}, fin={self.fin}, length={len(self.payload)})"
+
+def encode_frame(
+    opcode: int,
+    payload: Union[bytes, bytearray, memoryview] = b'',
+    fin: bool = True,
+    rsv1: bool = False,
+    mask: bool = True
+) -> bytes:
+    """Encode one frame; client frames are always masked"""
+    first = (0x80 if fin else 0) | (0x40 if rsv1 else 0) | opcode
+    mask_bit = 0x80 if mask else 0
+    length = len(payload)
+    if length < 126:
+        head = _HEAD.pack(first, mask_bit | length)
+    elif length < 65536:
+        head = _HEAD.pack(first, mask_bit | 126) + _LEN16.pack(length)
+    else:
+        head = _HEAD.pack(first, mask_bit | 127) + _LEN64.pack(length)
+    if not mask:
+        return head + payload
+    key = os.urandom(4)
+    return head + key + apply_mask(payload, key)
+
+def encode_close(code: int = CLOSE_NORMAL, reason: str = '') -> bytes:
+    """Payload of a close frame"""
+    return _LEN16.pack(code) + reason.encode('utf-8')
+
+def decode_close(payload: bytes) -> tuple:
+    """(code, reason) from a close frame payload; 1005 when no code was sent"""
+    if len(payload) < 2:
+        return 1005, ''
+    return _LEN16.unpack_from(payload)[0], payload[2:].decode('utf-8', errors='replace')
+
+class FrameParser:
+    """Incremental frame decoder over a rolling receive buffer
+
+    Bytes are appended as they arrive; whole frames are sliced out and the
+    consumed prefix is dropped once per feed, so a large frame arriving
+    in many small reads is not re-copied on every read.
+    """
+    __slots__ = ('_buffer', 'max_size', 'allow_rsv1')
+
+    def __init__(self, max_size: Optional[int] = 2 ** 20, allow_rsv1: bool = False):
+        self._buffer = bytearray()
+        self.max_size = max_size
+        self.allow_rsv1 = allow_rsv1
+
+    def feed(self, data: bytes) -> List[Frame]:
+        buffer = self._buffer
+        buffer += data
+        frames = []
+        offset = 0
+        available = len(buffer)
+        while available - offset >= 2:
+            first, second = buffer[offset], buffer[offset + 1]
+            opcode = first & 0x0F
+            length = second & 0x7F
+            header = 2
+            if length == 126:
+                if available - offset < 4:
+                    break
+                length = _LEN16.unpack_from(buffer, offset + 2)[0]
+                header = 4
+            elif length == 127:
+                if available - offset < 10:
+                    break
+                length = _LEN64.unpack_from(buffer, offset + 2)[0]
+                header = 10
+            masked = second & 0x80
+            if masked:
+                header += 4
+            if first & 0x30 or (first & 0x40 and not self.allow_rsv1):
+                raise WebSocketProtocolError("Reserved bit set in frame", CLOSE_PROTOCOL_ERROR)
+            if opcode not in DATA_OPCODES and opcode not in CONTROL_OPCODES:
+                raise WebSocketProtocolError(f"Unknown opcode {opcode:#x}", CLOSE_PROTOCOL_ERROR)
+            if opcode in CONTROL_OPCODES and (length > 125 or not first & 0x80 or first & 0x40):
+                raise WebSocketProtocolError("Invalid control frame", CLOSE_PROTOCOL_ERROR)
+            if self.max_size is not None and length > self.max_size:
+                raise WebSocketProtocolError(f"Frame of {length} bytes exceeds max_size", CLOSE_TOO_BIG)
+            end = offset + header + length
+            if end > available:
+                break
+            payload = bytes(buffer[offset + header:end])
+            if masked:
+                payload = apply_mask(payload, bytes(buffer[offset + header - 4:offset + header]))
+            frames.append(Frame(opcode, payload, bool(first & 0x80), bool(first & 0x40)))
+            offset = end
+        if offset:
+            del buffer[:offset]
+        return frames
+
+class MessageAssembler:
+    """Join fragmented data frames into messages
+
+    Fragments are collected in a list and joined once when the final
+    frame arrives, so a message in n fragments costs O(total) bytes copied.
+    """
+    __slots__ = ('_opcode', '_fragments', '_size', 'max_size', '_compressed')
+
+    def __init__(self, max_size: Optional[int] = 2 ** 20):
+        self._opcode: Optional[int] = None
+        self._fragments: List[bytes] = []
+        self._size = 0
+        self._compressed = False
+        self.max_size = max_size
+
+    def add(self, frame: Frame) -> Optional[Frame]:
+        """Add a data frame; returns a complete message as a single FIN frame"""
+        if frame.opcode == OP_CONTINUATION:
+            if self._opcode is None:
+                raise WebSocketProtocolError("Continuation frame without a message", CLOSE_PROTOCOL_ERROR)
+            if frame.rsv1:
+                raise WebSocketProtocolError("RSV1 set on a continuation frame", CLOSE_PROTOCOL_ERROR)
+        elif self._opcode is not None:
+            raise WebSocketProtocolError("New message before the previous one finished", CLOSE_PROTOCOL_ERROR)
+        elif frame.fin:
+            return frame
+        else:
+            self._opcode = frame.opcode
+            self._compressed = frame.rsv1
+        self._size += len(frame.payload)
+        if self.max_size is not None and self._size > self.max_size:
+            raise WebSocketProtocolError(f"Message exceeds max_size ({self.max_size} bytes)", CLOSE_TOO_BIG)
+        self._fragments.append(frame.payload)
+        if not frame.fin:
+            return None
+        message = Frame(self._opcode, b''.join(self._fragments), True, self._compressed)
+        self._opcode = None
+        self._fragments = []
+        self._size = 0
+        return message
@@ -0,0 +1,195 @@
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple, Union
+
+HeaderItems = Union[Mapping[str, str], Iterable[Tuple[str, str]], 'Headers', None]
+
+def _encode_items(items: Iterable[Tuple[str, str]]) -> bytes:
+    lines = []
+    for name, value in items:
+        line = f"{name}: {value}\r\n"
+        if '\r' in line[:-2] or '\n' in line[:-2]:
+            raise ValueError(f"Invalid character in header {name!r}")
+        lines.append(line)
+    return ''.join(lines).encode('latin-1')
+
+def _pairs(headers: HeaderItems) -> Iterable[Tuple[str, str]]:
+    if isinstance(headers, Headers):
+        return headers.multi_items()
+    if isinstance(headers, Mapping):
+        return headers.items()
+    return headers or ()
+
+class Headers(MutableMapping):
+    """Case-insensitive, multi-valued HTTP headers
+
+    Entries are (name, value) pairs in arrival order, with a lowercase
+    index built on first lookup. Headers read off the wire keep the raw
+    block and are only split into pairs when accessed. A Headers may sit
+    on top of a base (for example a client's default headers): the base
+    is never copied or mutated, and while no base name is overridden the
+    base's cached wire encoding is reused as-is.
+    """
+    __slots__ = ('_raw', '_items', '_index', '_encoded', '_base')
+
+    def __init__(self, headers: HeaderItems = None, base: Optional['Headers'] = None):
+        self._raw: Optional[bytes] = None
+        self._items: Optional[List[Tuple[str, str]]] = []
+        self._index: Optional[Dict[str, List[str]]] = None
+        self._encoded: Optional[bytes] = None
+        self._base = base
+        if headers:
+            if base is None:
+                self._items = [(name, str(value)) for name, value in _pairs(headers)]
+            else:
+                self.update(headers)
+
+    @classmethod
+    def from_raw(cls, raw: bytes) -> 'Headers':
+        """Wrap a raw header block (without the status line) for lazy parsing"""
+        headers = cls()
+        headers._raw = raw
+        headers._items = None
+        return headers
+
+    def _own(self) -> List[Tuple[str, str]]:
+        items = self._items
+        if items is None:
+            items = self._items = []
+            for line in self._raw.split(b'\r\n'):
+                name, sep, value = line.partition(b':')
+                if sep:
+                    items.append((name.strip().decode('latin-1'), value.strip().decode('latin-1')))
+        return items
+
+    def _all(self) -> List[Tuple[str, str]]:
+        own = self._own()
+        if self._base is None:
+            return own
+        overridden = {name.lower() for name, _ in own}
+        return [item for item in self._base._all() if item[0].lower() not in overridden] + own
+
+    def _lookup(self) -> Dict[str, List[str]]:
+        index = self._index
+        if index is None:
+            index = {}
+            for name, value in self._all():
+                index.setdefault(name.lower(), []).append(value)
+            self._index = index
+        return index
+
+    def _changed(self) -> None:
+        self._own()
+        self._raw = None
+        self._index = None
+        self._encoded = None
+
+    def peek(self, name: str) -> Optional[str]:
+        """Look up one header without splitting an unparsed raw block"""
+        if self._items is not None:
+            return self.get(name)
+        needle = b'\n' + name.lower().encode('latin-1') + b':'
+        block = b'\n' + self._raw.lower()
+        start = block.find(needle)
+        if start < 0:
+            return None
+        start += len(needle)
+        end = block.find(b'\r', start)
+        return self._raw[start - 1:(end if end >= 0 else len(block)) - 1].strip().decode('latin-1')
+
+    def __getitem__(self, name: str) -> str:
+        return ', '.join(self._lookup()[name.lower()])
+
+    def __setitem__(self, name: str, value: str) -> None:
+        lowered = name.lower()
+        self._changed()
+        self._items = [item for item in self._items if item[0].lower() != lowered]
+        self._items.append((name, str(value)))
+        if self._base is not None and lowered in self._base:
+            self._flatten()
+
+    def __delitem__(self, name: str) -> None:
+        lowered = name.lower()
+        if lowered not in self._lookup():
+            raise KeyError(name)
+        if self._base is not None and lowered in self._base:
+            self._flatten()
+        self._changed()
+        self._items = [item for item in self._items if item[0].lower() != lowered]
+
+    def _flatten(self) -> None:
+        """Copy the base's entries in so a base name can be replaced or removed"""
+        self._items = self._all()
+        self._base = None
+        self._index = None
+        self._encoded = None
+
+    def __contains__(self, name: object) -> bool:
+        return isinstance(name, str) and name.lower() in self._lookup()
+
+    def __iter__(self) -> Iterator[str]:
+        seen = set()
+        for name, _ in self._all():
+            lowered = name.lower()
+            if lowered not in seen:
+                seen.add(lowered)
+                yield name
+
+    def __len__(self) -> int:
+        return len(self._lookup())
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Headers):
+            other_items = other._all()
+        elif isinstance(other, Mapping):
+            other_items = list(other.items())
+        else:
+            return NotImplemented
+        normalize = lambda items: sorted((name.lower(), value) for name, value in items)
+        return normalize(self._all()) == normalize(other_items)
+
+    def __repr__(self) -> str:
+        return f"Headers({self._all()!r})"
+
+    def add(self, name: str, value: str) -> None:
+        """Append a value without replacing existing ones"""
+        if self._base is not None and name.lower() in self._base:
+            self._flatten()
+        self._changed()
+        self._items.append((name, str(value)))
+
+    def get_list(self, name: str) -> List[str]:
+        """All values for a header, e.g. every Set-Cookie"""
+        return list(self._lookup().get(name.lower(), ()))
+
+    def multi_items(self) -> List[Tuple[str, str]]:
+        """Every (name, value) pair, including repeats, in order"""
+        return list(self._all())
+
+    def update(self, other: HeaderItems = None, **kwargs: str) -> None:
+        """Replace the values of every name in other, keeping all of other's repeats"""
+        replaced = set()
+        for name, value in [*_pairs(other), *kwargs.items()]:
+            lowered = name.lower()
+            if lowered in replaced:
+                self.add(name, value)
+            else:
+                self[name] = value
+                replaced.add(lowered)
+
+    def copy(self) -> 'Headers':
+        headers = Headers()
+        headers._items = list(self._all())
+        return headers
+
+    def encode(self) -> bytes:
+        """Wire form of the headers, each line ending in CRLF; cached until changed"""
+        encoded = self._encoded
+        if encoded is None:
+            if self._items is None:
+                encoded = self._raw + b'\r\n' if self._raw else b''
+            elif self._base is not None:
+                encoded = self._base.encode() + _encode_items(self._items)
+            else:
+                encoded = _encode_items(self._items)
+            self._encoded = encoded
+        return encoded
@@ -0,0 +1,61 @@
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Tuple
+
+REQUEST_START = 'request_start'
+REQUEST_END = 'request_end'
+CONNECTION_CREATE = 'connection_create'
+CONNECTION_REUSE = 'connection_reuse'
+CONNECTION_CLOSE = 'connection_close'
+CACHE_HIT = 'cache_hit'
+CACHE_MISS = 'cache_miss'
+REDIRECT = 'redirect'
+
+EVENTS = (
+    REQUEST_START, REQUEST_END,
+    CONNECTION_CREATE, CONNECTION_REUSE, CONNECTION_CLOSE,
+    CACHE_HIT, CACHE_MISS,
+    REDIRECT,
+)
+
+class Hooks:
+    """Event listener registry
+
+    Emit sites check ``active`` before building a payload, so a registry
+    with no listeners costs a single attribute read per event. Listeners
+    are called synchronously with the event payload as keyword arguments.
+    """
+
+    def __init__(self):
+        self._listeners: Dict[str, Tuple[Callable[..., Any], ...]] = {}
+        self._lock = Lock()
+        self.active = False
+
+    def on(self, event: str, callback: Optional[Callable[..., Any]] = None) -> Callable[..., Any]:
+        """Register a listener; usable as a decorator when callback is omitted"""
+        if event not in EVENTS:
+            raise ValueError(f"Unknown event: {event}")
+        if callback is None:
+            return lambda fn: self.on(event, fn)
+        with self._lock:
+            # Copy-on-write so emit() can iterate without locking
+            self._listeners[event] = self._listeners.get(event, ()) + (callback,)
+            self.active = True
+        return callback
+
+    def off(self, event: str, callback: Callable[..., Any]) -> None:
+        """Remove a previously registered listener"""
+        with self._lock:
+            listeners = tuple(fn for fn in self._listeners.get(event, ()) if fn != callback)
+            if listeners:
+                self._listeners[event] = listeners
+            else:
+                self._listeners.pop(event, None)
+            self.active = bool(self._listeners)
+
+    def emit(self, event: str, **payload: Any) -> None:
+        """Call every listener registered for event"""
+        for callback in self._listeners.get(event, ()):
+            callback(**payload)
+
+    def __contains__(self, event: str) -> bool:
+        return event in self._listeners
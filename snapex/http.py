@@ -1,11 +1,31 @@
-import ssl
-from typing import Optional, Dict, Any, Union, Tuple, Callable
-from urllib.parse import urlparse
+import time
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Optional, Dict, Any, Union, Tuple, Callable, Sequence
+from urllib.parse import urlencode
 from .connection import ConnectionPool, HTTP1Connection
-from .models import Request, Response, HTTPVersion, TimeoutConfig
+from .transports import BaseTransport, HTTPTransport
+from .models import (
+    Request, Response, HTTPVersion, TimeoutConfig, Timings, RequestMethod, CachePolicy
+)
+from .headers import Headers
 from .exceptions import InvalidURL, TooManyRedirects
-from .cache import CacheBackend
-from .utils import is_redirect, merge_headers, normalize_url
+from .stats import TimingStats
+from .codecs import CodecRegistry
+from .hooks import Hooks, REQUEST_START, REQUEST_END, CACHE_HIT, CACHE_MISS, REDIRECT
+from .utils import (
+    elapsed_time, is_redirect, join_url, merge_headers, normalize_url, origin_of, split_url,
+    unix_socket_path
+)
+
+if TYPE_CHECKING:
+    import ssl
+    from .cache import CacheBackend
+    from .prepared import PreparedRequest
+    from .proxy import Proxy, ProxyResolver, ProxySetting
+
+# Headers describing a request body, dropped along with it on a redirect
+_BODY_HEADERS = ('Content-Type', 'Content-Length', 'Transfer-Encoding', 'Content-Encoding')
 
 class HTTPClient:
     """Core HTTP client implementation"""
@@ -15,18 +35,67 @@ class HTTPClient:
         pool_size: int = 100,
         timeout: TimeoutConfig = TimeoutConfig(),
         verify: bool = True,
-        cache_ttl: int = 300
+        cache_ttl: int = 300,
+        hooks: Optional[Hooks] = None,
+        codecs: Optional[CodecRegistry] = None,
+        proxy: 'ProxySetting' = None,
+        no_proxy: Optional[str] = None,
+        trust_env: bool = True,
+        uds: Optional[str] = None,
+        transport: Optional[BaseTransport] = None,
+        adaptive_pool: bool = False,
+        redirect_memo_size: int = 256
     ):
-        self.pool = ConnectionPool(max_size=pool_size)
+        self.hooks = hooks or Hooks()
+        self.codecs = codecs or CodecRegistry()
+        self.pool = ConnectionPool(max_size=pool_size, hooks=self.hooks, adaptive=adaptive_pool)
         self.default_timeout = timeout
         self.verify = verify
-        self.cache = CacheBackend(ttl=cache_ttl)
-        self.ssl_context = self._create_ssl_context()
+        self.cache_ttl = cache_ttl
+        self.timings = TimingStats()
+        self._cache: Optional['CacheBackend'] = None
+        self._ssl_contexts: Dict[bool, 'ssl.SSLContext'] = {}
+        self._proxy_settings = (proxy, no_proxy, trust_env)
+        self._proxies: Optional['ProxyResolver'] = None
+        self.uds = uds
+        self.transport = transport or HTTPTransport(self.pool, self._route)
+        self.redirect_memo_size = redirect_memo_size
+        self._permanent_redirects: 'OrderedDict[str, str]' = OrderedDict()
+        self._redirect_lock = threading.Lock()
+        
+    @property
+    def cache(self) -> 'CacheBackend':
+        """Response cache, created on first use"""
+        if self._cache is None:
+            from .cache import CacheBackend
+            self._cache = CacheBackend(ttl=self.cache_ttl)
+        return self._cache
+        
+    @property
+    def proxies(self) -> 'ProxyResolver':
+        """Proxy selection, reading the environment once on first use"""
+        if self._proxies is None:
+            from .proxy import ProxyResolver
+            self._proxies = ProxyResolver(*self._proxy_settings)
+        return self._proxies
+        
+    @property
+    def ssl_context(self) -> 'ssl.SSLContext':
+        """Default SSL context, created on the first HTTPS request"""
+        return self._get_ssl_context(self.verify)
         
-    def _create_ssl_context(self) -> ssl.SSLContext:
+    def _get_ssl_context(self, verify: bool) -> 'ssl.SSLContext':
+        """Get the (lazily created) SSL context for a verification setting"""
+        ctx = self._ssl_contexts.get(verify)
+        if ctx is None:
+            ctx = self._ssl_contexts[verify] = self._create_ssl_context(verify)
+        return ctx
+        
+    def _create_ssl_context(self, verify: Optional[bool] = None) -> 'ssl.SSLContext':
         """Create default SSL context"""
+        import ssl
         ctx = ssl.create_default_context()
-        if not self.verify:
+        if not (self.verify if verify is None else verify):
             ctx.check_hostname = False
             ctx.verify_mode = ssl.CERT_NONE
         return ctx
@@ -39,95 +108,307 @@ class HTTPClient:
         if request.verify is None:
             request.verify = self.verify
             
+        # Encode json= and form bodies to bytes so they go out with a Content-Length
+        content_type = None
+        if request.json is not None:
+            request.body = self.codecs.json.dumps(request.json)
+            content_type = 'application/json'
+        elif isinstance(request.body, dict):
+            request.body = urlencode(request.body, doseq=True).encode()
+            content_type = 'application/x-www-form-urlencoded'
+        elif isinstance(request.body, str):
+            request.body = request.body.encode('utf-8')
+        if content_type is not None:
+            headers = request.headers
+            if not isinstance(headers, Headers):
+                headers = Headers(headers)
+            if 'content-type' not in headers:
+                request.headers = Headers({'Content-Type': content_type}, base=headers)
+            
         return request
     
+    @staticmethod
+    def _cacheable(request: Request) -> bool:
+        """Streamed responses and iterable request bodies bypass the cache"""
+        body = request.body
+        return request.cache_policy != CachePolicy.NEVER and not request.stream and (
+            body is None or isinstance(body, (bytes, bytearray, memoryview))
+        )
+    
     def _should_cache(self, request: Request, response: Response) -> bool:
         """Determine if response should be cached"""
-        if request.cache_policy == CachePolicy.NEVER:
+        if not self._cacheable(request):
             return False
         if request.cache_policy == CachePolicy.ALWAYS:
             return True
         return response.status_code in (200, 203, 300, 301, 302, 307, 308)
     
-    def _should_follow_redirect(self, request: Request, response: Response) -> bool:
+    def _should_follow_redirect(self, request: Request, response: Response, hops: int = 0) -> bool:
         """Determine if redirect should be followed"""
         if not request.allow_redirects:
             return False
         if not is_redirect(response.status_code):
             return False
-        if len(response.history) >= request.max_redirects:
+        if hops >= request.max_redirects:
             raise TooManyRedirects(f"Exceeded max redirects ({request.max_redirects})")
         return True
     
-    def _create_connection(self, url: str, verify: bool, http_version: HTTPVersion) -> HTTP1Connection:
+    def _resolve_permanent(self, url: str, limit: int) -> Tuple[str, int]:
+        """Follow remembered 301/308 redirects for url, at most limit hops
+
+        Returns the final URL and the hops taken, which count against
+        max_redirects like the ones sent over the network.
+        """
+        memo = self._permanent_redirects
+        hops = 0
+        with self._redirect_lock:
+            while hops < limit:
+                target = memo.get(url)
+                if target is None:
+                    break
+                memo.move_to_end(url)
+                url = target
+                hops += 1
+        return url, hops
+    
+    def _remember_redirect(self, url: str, location: str) -> None:
+        """Remember a permanent redirect, evicting the least recently used"""
+        memo = self._permanent_redirects
+        with self._redirect_lock:
+            memo[url] = location
+            memo.move_to_end(url)
+            if len(memo) > self.redirect_memo_size:
+                memo.popitem(last=False)
+    
+    @staticmethod
+    def _redirect_request(request: Request, status_code: int, location: str) -> Optional[Request]:
+        """The next hop's request, or None when its body cannot be sent again
+
+        303 switches to GET (HEAD stays HEAD), as do POSTs on 301 and 302,
+        the way browsers handle them; the body and its headers are dropped.
+        Otherwise the method and body are kept, which only works for bytes
+        bodies, as an iterable has been consumed by now.
+        """
+        method = request.method
+        if (status_code == 303 and method != RequestMethod.HEAD) or (
+            status_code in (301, 302) and method == RequestMethod.POST
+        ):
+            method = RequestMethod.GET
+        body = request.body if method == request.method else None
+        if body is not None and not isinstance(body, (bytes, bytearray, memoryview)):
+            return None
+        headers = request.headers
+        if body is None and headers:
+            if not isinstance(headers, Headers):
+                headers = Headers(headers)
+            if any(name in headers for name in _BODY_HEADERS):
+                headers = headers.copy()
+                for name in _BODY_HEADERS:
+                    if name in headers:
+                        del headers[name]
+        return Request(
+            method=method,
+            url=location,
+            headers=headers,
+            body=body,
+            cookies=request.cookies,
+            auth=request.auth,
+            timeout=request.timeout,
+            allow_redirects=request.allow_redirects,
+            max_redirects=request.max_redirects,
+            http_version=request.http_version,
+            stream=request.stream,
+            verify=request.verify,
+            cert=request.cert,
+            proxy=request.proxy,
+            cache_policy=request.cache_policy,
+            redirect_policy=request.redirect_policy
+        )
+    
+    @staticmethod
+    def _discard(response: Response) -> None:
+        """Finish with a redirect response so its connection can serve the next hop
+
+        A short streamed body is read to the end, keeping the connection
+        reusable; anything else is abandoned.
+        """
+        length = response.headers.get('content-length')
+        if hasattr(response.body, 'on_release') and length is not None and length.isdigit() and int(length) <= 65536:
+            try:
+                response.content
+                return
+            except Exception:
+                pass
+        response.close()
+    
+    def _route(
+        self,
+        url: str,
+        verify: bool,
+        proxy: 'ProxySetting' = None
+    ) -> Tuple[str, int, Optional['ssl.SSLContext'], Optional['Proxy'], Optional['Proxy'], Optional[str]]:
+        """Resolve (host, port, SSL context, tunnel proxy, forward proxy, Unix socket) for a URL
+
+        HTTPS is tunnelled with CONNECT, pooled per (proxy, origin). Plain
+        HTTP is forwarded in absolute form over connections to the proxy
+        itself, which are shared by every origin behind it. http+unix://
+        URLs and the client's uds option bypass proxies and TCP entirely.
+        """
+        scheme, host, port, _ = split_url(url)
+        if scheme == 'http+unix':
+            return 'localhost', 80, None, None, None, unix_socket_path(url)
+        if scheme not in ('http', 'https'):
+            raise InvalidURL(f"Unsupported scheme: {scheme}")
+        ssl_context = self._get_ssl_context(verify) if scheme == 'https' else None
+        if self.uds is not None:
+            return host, port, ssl_context, None, None, self.uds
+        selected = self.proxies.select(scheme, host, port, proxy)
+        if ssl_context is not None:
+            return host, port, ssl_context, selected, None, None
+        if selected is not None:
+            return selected.host, selected.port, None, None, selected, None
+        return host, port, None, None, None, None
+    
+    def _create_connection(
+        self,
+        url: str,
+        verify: bool,
+        http_version: HTTPVersion,
+        timings: Optional[Timings] = None
+    ) -> HTTP1Connection:
         """Create appropriate connection for URL"""
-        parsed = urlparse(url)
-        if parsed.scheme not in ('http', 'https'):
-            raise InvalidURL(f"Unsupported scheme: {parsed.scheme}")
-            
-        port = parsed.port or (443 if parsed.scheme == 'https' else 80)
-        ssl_context = self.ssl_context if parsed.scheme == 'https' and verify else None
+        host, port, ssl_context, tunnel, forward, uds = self._route(url, verify)
+        sock = self.pool.get_connection(host, port, ssl_context, http_version, timings, tunnel, uds)
+        return HTTP1Connection(sock, split_url(url)[1] if forward else host, forward)
+    
+    def warmup(
+        self,
+        origins: Sequence[str],
+        connections_per_origin: int = 1,
+        http_version: HTTPVersion = HTTPVersion.HTTP_1_1
+    ) -> Dict[str, int]:
+        """Open and handshake connections to every origin in parallel
+
+        Returns the number of connections opened per origin. Origins that
+        already hold enough idle connections, and clients whose transport
+        does not use the pool, open none.
+        """
+        opened = dict.fromkeys(origins, 0)
+        if not isinstance(self.transport, HTTPTransport):
+            return opened
+        routes = [(origin, self._route(origin, self.verify)) for origin in opened]
         
-        sock = self.pool.get_connection(parsed.hostname, port, ssl_context, http_version)
-        return HTTP1Connection(sock, parsed.hostname)
+        def warm(origin: str, route: Tuple) -> None:
+            host, port, ssl_context, tunnel, _, uds = route
+            opened[origin] = self.pool.warmup(
+                host, port, ssl_context, http_version, connections_per_origin, tunnel, uds
+            )
+            
+        threads = [threading.Thread(target=warm, args=item, daemon=True) for item in routes]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return opened
+    
+    def close(self) -> None:
+        """Close the transport and every pooled connection"""
+        self.transport.close()
+        if not (isinstance(self.transport, HTTPTransport) and self.transport.pool is self.pool):
+            # A custom transport leaves the pool to WebSockets and warm-up, so close it here
+            self.pool.close()
     
     def request(self, request: Request) -> Response:
         """Execute HTTP request"""
+        return self._dispatch(self._send, request)
+    
+    def send_prepared(self, prepared: 'PreparedRequest', request: Request, head: bytes, body: Any) -> Response:
+        """Execute a request whose head was encoded by a PreparedRequest"""
+        return self._dispatch(self._send_prepared, request, prepared, head, body)
+    
+    def _dispatch(self, send: Callable[..., Response], request: Request, *args: Any) -> Response:
+        """Run send, emitting request hooks around it when anyone listens"""
+        hooks = self.hooks
+        if not hooks.active:
+            return send(request, *args)
+            
+        hooks.emit(REQUEST_START, request=request)
+        start = time.perf_counter()
+        try:
+            response = send(request, *args)
+        except Exception as e:
+            hooks.emit(REQUEST_END, request=request, response=None, error=e, elapsed=elapsed_time(start))
+            raise
+        hooks.emit(REQUEST_END, request=request, response=response, error=None, elapsed=elapsed_time(start))
+        return response
+    
+    def _send_prepared(self, request: Request, prepared: 'PreparedRequest', head: bytes, body: Any) -> Response:
+        """Send a pre-encoded request; no cache lookup and no redirects"""
+        transport = self.transport
+        if isinstance(transport, HTTPTransport):
+            response = transport.send_prepared(prepared, request, head, body)
+        else:
+            response = transport.handle_request(request)
+        response.codecs = self.codecs
+        if response.timings is not None:
+            self.timings.record(prepared.origin, response.timings)
+        return response
+    
+    def _send(self, request: Request) -> Response:
+        """Execute HTTP request without request hooks"""
         request = self._prepare_request(request)
         request.url = normalize_url(request.url)
+        remembered = 0
+        if request.allow_redirects and self._permanent_redirects:
+            request.url, remembered = self._resolve_permanent(request.url, request.max_redirects)
         
         # Check cache first
-        if request.cache_policy != CachePolicy.NEVER:
+        if self._cacheable(request):
             cached = self.cache.get(request)
+            if self.hooks.active:
+                self.hooks.emit(CACHE_HIT if cached else CACHE_MISS, request=request)
             if cached:
                 return cached
                 
-        # Execute request
-        conn = self._create_connection(request.url, request.verify, request.http_version)
+        # Follow redirects iteratively: each hop's connection is back in the
+        # pool before the next is sent, so same-origin hops reuse it
+        history = []
+        current = request
+        while True:
+            response = self.transport.handle_request(current)
+            try:
+                response.codecs = self.codecs
+                if response.timings is not None:
+                    self.timings.record(origin_of(current.url), response.timings)
+                if not self._should_follow_redirect(current, response, remembered + len(history)):
+                    break
+                location = response.headers.get('location')
+                if not location:
+                    break
+                location = normalize_url(join_url(current.url, location))
+                next_request = self._redirect_request(current, response.status_code, location)
+                if next_request is None:
+                    break
+                if response.status_code in (301, 308):
+                    self._remember_redirect(current.url, location)
+                if self.hooks.active:
+                    self.hooks.emit(REDIRECT, request=current, response=response, location=location)
+            except Exception:
+                response.close()
+                raise
+            self._discard(response)
+            history.append(response)
+            current = next_request
+        
         try:
-            response = conn.send_request(request)
-            
-            # Handle redirects
-            if self._should_follow_redirect(request, response):
-                redirect_url = response.headers.get('location')
-                if not redirect_url:
-                    return response
-                    
-                if not urlparse(redirect_url).netloc:
-                    redirect_url = f"{request.url.scheme}://{request.url.netloc}{redirect_url}"
-                    
-                redirect_request = Request(
-                    method=RequestMethod.GET if response.status_code == 303 else request.method,
-                    url=redirect_url,
-                    headers=request.headers,
-                    cookies=request.cookies,
-                    auth=request.auth,
-                    timeout=request.timeout,
-                    allow_redirects=request.allow_redirects,
-                    max_redirects=request.max_redirects,
-                    http_version=request.http_version,
-                    stream=request.stream,
-                    verify=request.verify,
-                    cert=request.cert,
-                    proxy=request.proxy,
-                    cache_policy=request.cache_policy,
-                    redirect_policy=request.redirect_policy
-                )
+            if history:
+                response.history = history
                 
-                redirect_response = self.request(redirect_request)
-                redirect_response.history = [response] + response.history
-                response = redirect_response
-            
             # Cache response if needed
             if self._should_cache(request, response):
                 self.cache.set(request, response)
                 
             return response
-        finally:
-            self.pool.release_connection(
-                urlparse(request.url).hostname,
-                urlparse(request.url).port or (443 if urlparse(request.url).scheme == 'https' else 80),
-                conn.sock,
-                ssl_context if urlparse(request.url).scheme == 'https' else None,
-                request.http_version
-            )
\ No newline at end of file
+        except Exception:
+            response.close()
+            raise
@@ -0,0 +1,158 @@
+from collections import defaultdict
+from threading import Lock
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from .hooks import (
+    Hooks, REQUEST_END, CONNECTION_CREATE, CONNECTION_REUSE, CONNECTION_CLOSE,
+    CACHE_HIT, CACHE_MISS, REDIRECT
+)
+from .stats import DEFAULT_BUCKETS, Histogram
+from .utils import origin_of
+
+Labels = Tuple[Tuple[str, str], ...]
+
+def _escape(value: str) -> str:
+    """Escape a label value for the Prometheus text format"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels: Labels, extra: str = '') -> str:
+    parts = [f'{name}="{_escape(value)}"' for name, value in labels]
+    if extra:
+        parts.append(extra)
+    return '{' + ','.join(parts) + '}' if parts else ''
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+class MetricsCollector:
+    """Collect request, connection and cache metrics from client hooks
+
+    Attach to a Client (or a Hooks registry) and call ``render()`` to get
+    the Prometheus text exposition format.
+    """
+
+    def __init__(self, namespace: str = 'snapex', buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.namespace = namespace
+        self.buckets = tuple(buckets)
+        self._counters: Dict[str, Dict[Labels, float]] = defaultdict(lambda: defaultdict(float))
+        self._histograms: Dict[Labels, Histogram] = {}
+        self._lock = Lock()
+        self._hooks: Optional[Hooks] = None
+        self._pool = None
+        self._handlers = {
+            REQUEST_END: self._on_request_end,
+            CONNECTION_CREATE: self._on_connection('created'),
+            CONNECTION_REUSE: self._on_connection('reused'),
+            CONNECTION_CLOSE: self._on_connection('closed'),
+            CACHE_HIT: self._on_cache('hit'),
+            CACHE_MISS: self._on_cache('miss'),
+            REDIRECT: self._on_redirect,
+        }
+
+    def attach(self, target: Any) -> 'MetricsCollector':
+        """Start collecting from a Client, HTTPClient or Hooks registry"""
+        http = getattr(target, 'http', target)
+        hooks = getattr(http, 'hooks', target)
+        self.detach()
+        for event, handler in self._handlers.items():
+            hooks.on(event, handler)
+        self._hooks = hooks
+        self._pool = getattr(http, 'pool', None)
+        return self
+
+    def detach(self) -> None:
+        """Stop collecting"""
+        if self._hooks is not None:
+            for event, handler in self._handlers.items():
+                self._hooks.off(event, handler)
+        self._hooks = None
+        self._pool = None
+
+    def _inc(self, name: str, labels: Labels, amount: float = 1) -> None:
+        with self._lock:
+            self._counters[name][labels] += amount
+
+    def _on_request_end(
+        self,
+        request: Any,
+        response: Any,
+        error: Optional[Exception],
+        elapsed: float
+    ) -> None:
+        origin = origin_of(request.url)
+        method = request.method.value
+        if error is not None:
+            self._inc('request_errors_total', (('origin', origin), ('method', method), ('error', type(error).__name__)))
+            return
+        status = str(response.status_code)
+        self._inc('requests_total', (('origin', origin), ('method', method), ('status', status)))
+        labels = (('origin', origin), ('status', status))
+        with self._lock:
+            histogram = self._histograms.get(labels)
+            if histogram is None:
+                histogram = self._histograms[labels] = Histogram(self.buckets)
+            histogram.observe(elapsed)
+
+    def _on_connection(self, state: str):
+        def handler(origin: str, **_: Any) -> None:
+            self._inc('connections_total', (('origin', origin), ('state', state)))
+        return handler
+
+    def _on_cache(self, result: str):
+        def handler(request: Any) -> None:
+            self._inc('cache_requests_total', (('origin', origin_of(request.url)), ('result', result)))
+        return handler
+
+    def _on_redirect(self, request: Any, response: Any, location: str) -> None:
+        self._inc('redirects_total', (('origin', origin_of(request.url)), ('status', str(response.status_code))))
+
+    def reset(self) -> None:
+        """Drop all collected values"""
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        ns = self.namespace
+        helps = {
+            'requests_total': 'Completed HTTP requests',
+            'request_errors_total': 'HTTP requests that raised an error',
+            'connections_total': 'Connection pool events',
+            'cache_requests_total': 'Response cache lookups',
+            'redirects_total': 'Redirects followed',
+        }
+        lines: List[str] = []
+        with self._lock:
+            for name, help_text in helps.items():
+                series = self._counters.get(name)
+                if not series:
+                    continue
+                lines.append(f"# HELP {ns}_{name} {help_text}")
+                lines.append(f"# TYPE {ns}_{name} counter")
+                for labels, value in sorted(series.items()):
+                    lines.append(f"{ns}_{name}{_format_labels(labels)} {_format_value(value)}")
+
+            if self._histograms:
+                name = f"{ns}_request_duration_seconds"
+                lines.append(f"# HELP {name} Client-observed request latency")
+                lines.append(f"# TYPE {name} histogram")
+                for labels, histogram in sorted(self._histograms.items()):
+                    for bound, count in histogram.cumulative():
+                        le = 'le="' + _format_value(bound / 1000) + '"'
+                        lines.append(f"{name}_bucket{_format_labels(labels, le)} {count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {histogram.sum / 1000!r}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+        if self._pool is not None:
+            stats = self._pool.stats
+            name = f"{ns}_pool_connections"
+            lines.append(f"# HELP {name} Connections currently held by the pool")
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f'{name}{{state="idle"}} {stats["idle"]}')
+            lines.append(f'{name}{{state="in_use"}} {stats["in_use"]}')
+
+        return '\n'.join(lines) + '\n' if lines else ''
@@ -1,14 +1,23 @@
-from dataclasses import dataclass, field
+import time
+from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum, auto
 from typing import (
-    Any, Optional, Union, Dict, List, Tuple, Callable, 
+    TYPE_CHECKING, Any, Optional, Union, Dict, List, Tuple, Callable, 
     Iterator, AsyncIterator, TypeVar
 )
 from urllib.parse import urlparse
+from .headers import Headers
+
+if TYPE_CHECKING:
+    from .codecs import CodecRegistry
+    from .streaming import ServerSentEvent
 
 T = TypeVar('T')
 
+# Marks Response.json() as not decoded yet, since a JSON null body decodes to None
+_UNDECODED: Any = object()
+
 class HTTPVersion(Enum):
     HTTP_1_1 = auto()
     HTTP_2 = auto()
@@ -45,64 +54,398 @@ class TimeoutConfig:
     pool: Optional[float] = None
     total: Optional[float] = None
 
-@dataclass
+class Deadline:
+    """A request's time budget under a TimeoutConfig
+
+    total runs from the pool checkout to the last byte of the response;
+    every blocking step gets the smaller of its phase cap (connect also
+    covers the proxy tunnel and TLS) and what is left of total.
+    """
+    __slots__ = ('config', 'expires')
+
+    def __init__(self, config: TimeoutConfig, expires: Optional[float] = None):
+        self.config = config
+        self.expires = expires
+
+    @classmethod
+    def start(cls, config: Union[TimeoutConfig, float, None]) -> Optional['Deadline']:
+        """A deadline starting now, or None when config sets no limit; a number is a total"""
+        if config is None:
+            return None
+        if isinstance(config, (int, float)):
+            config = TimeoutConfig(total=config)
+        if config.total is not None:
+            return cls(config, time.perf_counter() + config.total)
+        if config.connect is None and config.read is None and config.write is None and config.pool is None:
+            return None
+        return cls(config)
+
+    def remaining(self, phase: str) -> Optional[float]:
+        """Seconds allowed for the next step of phase; raises TimeoutError once total is spent"""
+        cap = getattr(self.config, phase)
+        if self.expires is None:
+            return cap
+        left = self.expires - time.perf_counter()
+        if left <= 0:
+            from .exceptions import TimeoutError
+            raise TimeoutError(f"Request exceeded its total timeout of {self.config.total}s during {phase}")
+        return left if cap is None or cap > left else cap
+
+    def open_ended(self) -> Optional['Deadline']:
+        """The phase caps without total, for reading a streamed body; None if read is uncapped"""
+        return Deadline(self.config) if self.config.read is not None else None
+
+class Timings:
+    """Monotonic (perf_counter) timestamps for each phase of a request
+
+    Marks are filled in as the request progresses. A reused connection
+    sets the DNS, connect and TLS marks to the pool checkout time, so
+    those phases read as zero.
+    """
+    __slots__ = (
+        'start', 'pool_acquired', 'dns_done', 'connect_done', 'tls_done',
+        'request_sent', 'first_byte', 'end', 'reused'
+    )
+
+    PHASES = ('pool_wait', 'dns', 'connect', 'tls', 'write', 'ttfb', 'download')
+
+    def __init__(
+        self,
+        start: Optional[float] = None,
+        pool_acquired: Optional[float] = None,
+        dns_done: Optional[float] = None,
+        connect_done: Optional[float] = None,
+        tls_done: Optional[float] = None,
+        request_sent: Optional[float] = None,
+        first_byte: Optional[float] = None,
+        end: Optional[float] = None,
+        reused: bool = False
+    ):
+        self.start = time.perf_counter() if start is None else start
+        self.pool_acquired = pool_acquired
+        self.dns_done = dns_done
+        self.connect_done = connect_done
+        self.tls_done = tls_done
+        self.request_sent = request_sent
+        self.first_byte = first_byte
+        self.end = end
+        self.reused = reused
+
+    @staticmethod
+    def _span(begin: Optional[float], finish: Optional[float]) -> float:
+        if begin is None or finish is None:
+            return 0.0
+        return (finish - begin) * 1000
+
+    @property
+    def pool_wait(self) -> float:
+        return self._span(self.start, self.pool_acquired)
+
+    @property
+    def dns(self) -> float:
+        return self._span(self.pool_acquired, self.dns_done)
+
+    @property
+    def connect(self) -> float:
+        return self._span(self.dns_done, self.connect_done)
+
+    @property
+    def tls(self) -> float:
+        return self._span(self.connect_done, self.tls_done)
+
+    @property
+    def write(self) -> float:
+        return self._span(self.tls_done, self.request_sent)
+
+    @property
+    def ttfb(self) -> float:
+        return self._span(self.request_sent, self.first_byte)
+
+    @property
+    def download(self) -> float:
+        return self._span(self.first_byte, self.end)
+
+    @property
+    def total(self) -> float:
+        return self._span(self.start, self.end)
+
+    def mark_reused(self) -> None:
+        """Collapse the connection phases for a pooled connection"""
+        self.reused = True
+        self.dns_done = self.connect_done = self.tls_done = self.pool_acquired
+
+    def as_dict(self) -> Dict[str, float]:
+        """Phase durations in milliseconds"""
+        result = {phase: getattr(self, phase) for phase in self.PHASES}
+        result['total'] = self.total
+        return result
+
+    def __repr__(self) -> str:
+        phases = ', '.join(f"{name}={value:.3f}" for name, value in self.as_dict().items())
+        return f"Timings({phases})"
+
+Body = Optional[Union[bytes, bytearray, memoryview, str, Dict[str, Any], Iterator[bytes], AsyncIterator[bytes]]]
+
 class Request:
-    method: RequestMethod
-    url: str
-    headers: Dict[str, str] = field(default_factory=dict)
-    body: Optional[Union[bytes, str, Dict[str, Any], Iterator[bytes], AsyncIterator[bytes]]] = None
-    params: Dict[str, Any] = field(default_factory=dict)
-    cookies: Dict[str, str] = field(default_factory=dict)
-    auth: Optional[Tuple[str, str]] = None
-    timeout: Optional[TimeoutConfig] = None
-    allow_redirects: bool = True
-    max_redirects: int = 10
-    http_version: HTTPVersion = HTTPVersion.HTTP_1_1
-    stream: bool = False
-    verify: bool = True
-    cert: Optional[Union[str, Tuple[str, str]]] = None
-    proxy: Optional[Union[str, Dict[str, str]]] = None
-    cache_policy: CachePolicy = CachePolicy.DEFAULT
-    redirect_policy: RedirectPolicy = RedirectPolicy.SAFE_METHODS
-    created_at: datetime = field(default_factory=datetime.now)
+    """HTTP request
+
+    Slotted and lazily populated: headers, params and cookies are only
+    allocated when first accessed, and created_at is kept as a float.
+    """
+    __slots__ = (
+        'method', 'url', '_headers', 'body', '_params', '_cookies', 'auth', 'timeout',
+        'allow_redirects', 'max_redirects', 'http_version', 'stream', 'verify', 'cert',
+        'proxy', 'cache_policy', 'redirect_policy', '_created', 'json'
+    )
+
+    def __init__(
+        self,
+        method: RequestMethod,
+        url: str,
+        headers: Optional[Union[Headers, Dict[str, str]]] = None,
+        body: Body = None,
+        params: Optional[Dict[str, Any]] = None,
+        cookies: Optional[Dict[str, str]] = None,
+        auth: Optional[Tuple[str, str]] = None,
+        timeout: Optional[Union[TimeoutConfig, float]] = None,
+        allow_redirects: bool = True,
+        max_redirects: int = 10,
+        http_version: HTTPVersion = HTTPVersion.HTTP_1_1,
+        stream: bool = False,
+        verify: bool = True,
+        cert: Optional[Union[str, Tuple[str, str]]] = None,
+        proxy: Optional[Union[str, Dict[str, str]]] = None,
+        cache_policy: CachePolicy = CachePolicy.DEFAULT,
+        redirect_policy: RedirectPolicy = RedirectPolicy.SAFE_METHODS,
+        created_at: Optional[datetime] = None,
+        json: Any = None
+    ):
+        self.method = method
+        self.url = url
+        self._headers = headers
+        self.body = body
+        self._params = params
+        self._cookies = cookies
+        self.auth = auth
+        self.timeout = timeout
+        self.allow_redirects = allow_redirects
+        self.max_redirects = max_redirects
+        self.http_version = http_version
+        self.stream = stream
+        self.verify = verify
+        self.cert = cert
+        self.proxy = proxy
+        self.cache_policy = cache_policy
+        self.redirect_policy = redirect_policy
+        self._created = created_at.timestamp() if created_at is not None else time.time()
+        self.json = json
+
+    @property
+    def headers(self) -> Union[Headers, Dict[str, str]]:
+        if self._headers is None:
+            self._headers = {}
+        return self._headers
+
+    @headers.setter
+    def headers(self, value: Union[Headers, Dict[str, str]]) -> None:
+        self._headers = value
+
+    @property
+    def params(self) -> Dict[str, Any]:
+        if self._params is None:
+            self._params = {}
+        return self._params
+
+    @params.setter
+    def params(self, value: Dict[str, Any]) -> None:
+        self._params = value
+
+    @property
+    def cookies(self) -> Dict[str, str]:
+        if self._cookies is None:
+            self._cookies = {}
+        return self._cookies
+
+    @cookies.setter
+    def cookies(self, value: Dict[str, str]) -> None:
+        self._cookies = value
+
+    @property
+    def created_at(self) -> datetime:
+        return datetime.fromtimestamp(self._created)
+
+    @created_at.setter
+    def created_at(self, value: datetime) -> None:
+        self._created = value.timestamp()
+
+    def __repr__(self) -> str:
+        return f"<Request [{self.method.value} {self.url}]>"
 
-@dataclass
 class Response:
-    status_code: int
-    headers: Dict[str, str]
-    body: Union[bytes, str, None]
-    request: Request
-    elapsed: float
-    http_version: HTTPVersion
-    history: List['Response'] = field(default_factory=list)
-    _content: Optional[bytes] = None
-    _json: Optional[Any] = None
+    """HTTP response
+
+    The body is usually a memoryview over the buffer it was received into;
+    text and json() decode from that buffer without an intermediate bytes
+    copy, and content copies it to bytes at most once.
+    """
+    __slots__ = (
+        'status_code', 'headers', 'body', 'request', 'elapsed', 'http_version',
+        '_history', 'timings', '_content', '_json', 'codecs'
+    )
+
+    def __init__(
+        self,
+        status_code: int,
+        headers: Headers,
+        body: Union[bytes, bytearray, memoryview, str, None],
+        request: Request,
+        elapsed: float,
+        http_version: HTTPVersion,
+        history: Optional[List['Response']] = None,
+        timings: Optional[Timings] = None
+    ):
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+        self.request = request
+        self.elapsed = elapsed
+        self.http_version = http_version
+        self._history = history
+        self.timings = timings
+        self._content: Optional[bytes] = None
+        self._json: Any = _UNDECODED
+        self.codecs: Optional['CodecRegistry'] = None
+
+    @property
+    def history(self) -> List['Response']:
+        if self._history is None:
+            self._history = []
+        return self._history
+
+    @history.setter
+    def history(self, value: List['Response']) -> None:
+        self._history = value
+
+    def _buffer(self) -> Union[bytes, bytearray, memoryview]:
+        """The body as a bytes-like object, without copying"""
+        body = self.body
+        if isinstance(body, memoryview):
+            owner = body.obj
+            if isinstance(owner, (bytes, bytearray)) and len(owner) == body.nbytes:
+                return owner
+            return body
+        if isinstance(body, (bytes, bytearray)):
+            return body
+        return self.content
 
     @property
     def content(self) -> bytes:
         if self._content is not None:
             return self._content
-        if isinstance(self.body, bytes):
-            self._content = self.body
-        elif isinstance(self.body, str):
-            self._content = self.body.encode('utf-8')
-        else:
+        body = self.body
+        if isinstance(body, bytes):
+            self._content = body
+        elif isinstance(body, (bytearray, memoryview)):
+            self._content = bytes(body)
+        elif isinstance(body, str):
+            self._content = body.encode('utf-8')
+        elif body is None:
             self._content = b''
+        else:
+            # Streamed body: read the rest and keep it
+            self._content = self.body = b''.join(body)
         return self._content
 
     @property
     def text(self) -> str:
         if isinstance(self.body, str):
             return self.body
-        return self.content.decode('utf-8', errors='replace')
+        return str(self._buffer(), 'utf-8', errors='replace')
 
     def json(self) -> Any:
-        if self._json is None:
-            import json
-            self._json = json.loads(self.text)
+        """Decode the body with the client's JSON codec, straight from bytes"""
+        if self._json is _UNDECODED:
+            self._json = self._json_codec().loads(self._buffer())
         return self._json
 
+    def _json_codec(self) -> Any:
+        codecs = self.codecs
+        if codecs is None:
+            from .codecs import get_json_codec
+            return get_json_codec()
+        return codecs.get(self.headers.get('content-type')) or codecs.json
+
+    def iter_bytes(self) -> Iterator[bytes]:
+        """Body chunks as they arrive (a single chunk if already read)"""
+        body = self.body
+        if body is None or isinstance(body, (bytes, bytearray, memoryview, str)):
+            buffer = self._buffer()
+            if buffer:
+                yield buffer
+        else:
+            yield from body
+
+    def iter_lines(self) -> Iterator[str]:
+        """Decoded lines, without line endings, parsed incrementally"""
+        from .streaming import iter_lines
+        for line in iter_lines(self.iter_bytes()):
+            yield line.decode('utf-8', errors='replace')
+
+    def iter_ndjson(self) -> Iterator[Any]:
+        """One decoded JSON value per non-blank line (NDJSON / JSON Lines)"""
+        from .streaming import iter_lines
+        loads = self._json_codec().loads
+        for line in iter_lines(self.iter_bytes()):
+            if line.strip():
+                yield loads(line)
+
+    def iter_sse(self) -> Iterator['ServerSentEvent']:
+        """Server-Sent Events parsed from a text/event-stream body"""
+        from .streaming import iter_sse
+        return iter_sse(self.iter_bytes())
+
+    async def aiter_bytes(self) -> AsyncIterator[bytes]:
+        """Like iter_bytes, also accepting an async iterator body"""
+        body = self.body
+        if hasattr(body, '__aiter__'):
+            async for chunk in body:
+                yield chunk
+        else:
+            for chunk in self.iter_bytes():
+                yield chunk
+
+    async def aiter_lines(self) -> AsyncIterator[str]:
+        from .streaming import aiter_lines
+        async for line in aiter_lines(self.aiter_bytes()):
+            yield line.decode('utf-8', errors='replace')
+
+    async def aiter_ndjson(self) -> AsyncIterator[Any]:
+        from .streaming import aiter_lines
+        loads = self._json_codec().loads
+        async for line in aiter_lines(self.aiter_bytes()):
+            if line.strip():
+                yield loads(line)
+
+    def aiter_sse(self) -> AsyncIterator['ServerSentEvent']:
+        from .streaming import aiter_sse
+        return aiter_sse(self.aiter_bytes())
+
+    def close(self) -> None:
+        """Abandon an unread streamed body and free its connection"""
+        close = getattr(self.body, 'close', None)
+        if close is not None:
+            close()
+
+    def __enter__(self) -> 'Response':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
     def raise_for_status(self) -> None:
         if 400 <= self.status_code < 600:
             from .exceptions import HTTPError
-            raise HTTPError(f"HTTP {self.status_code}", response=self)
\ No newline at end of file
+            raise HTTPError(f"HTTP {self.status_code}", response=self)
+
+    def __repr__(self) -> str:
+        return f"<Response [{self.status_code}]>"
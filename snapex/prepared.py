@@ -0,0 +1,122 @@
+from string import Formatter
+from typing import TYPE_CHECKING, Any, Dict, Mapping, Optional, Union
+from urllib.parse import quote, urlencode, urlsplit
+from .exceptions import InvalidURL
+from .headers import Headers
+from .models import Request, Response, RequestMethod, HTTPVersion
+from .utils import host_header
+
+if TYPE_CHECKING:
+    from .http import HTTPClient
+
+class PreparedRequest:
+    """Request template for a hot endpoint, created by Client.prepare()
+
+    The origin, pool key, request-line prefix and header block are parsed
+    and encoded once. Each call only formats the path parameters, query
+    and body, then writes straight to a pooled connection. Prepared calls
+    skip the response cache and do not follow redirects.
+    """
+
+    def __init__(
+        self,
+        http: 'HTTPClient',
+        method: RequestMethod,
+        url_template: str,
+        headers: Headers,
+        http_version: HTTPVersion = HTTPVersion.HTTP_1_1,
+        verify: Optional[bool] = None
+    ):
+        parsed = urlsplit(url_template)
+        if parsed.scheme not in ('http', 'https', 'http+unix'):
+            raise InvalidURL(f"Unsupported scheme: {parsed.scheme}")
+        if '{' in parsed.netloc:
+            raise InvalidURL("Only the path of a prepared URL may contain placeholders")
+
+        self.http = http
+        self.method = method
+        self.url_template = url_template
+        self.headers = headers
+        self.http_version = http_version
+        self.host = parsed.hostname
+        self.port = parsed.port or (443 if parsed.scheme == 'https' else 80)
+        self.origin = f"{parsed.scheme}://{self.host}:{self.port}"
+        host, port, self.ssl_context, self.tunnel, forward, self.uds = http._route(
+            url_template, http.verify if verify is None else verify
+        )
+        self.address = (host, port)
+
+        self._base_url = f"{parsed.scheme}://{parsed.netloc}"
+        self._path = parsed.path or '/'
+        self._fields = {name for _, name, _, _ in Formatter().parse(self._path) if name}
+        self._static_query = parsed.query
+        # A forward proxy gets the absolute URL as the request target
+        self._line_prefix = f"{method.value} {self._base_url if forward else ''}".encode()
+        self._netloc = host_header(url_template)
+        self._proxy_line = forward.auth_line if forward else b''
+        self._head_suffix = self._suffix(headers)
+        self._json_line = b'' if 'content-type' in headers else b"Content-Type: application/json\r\n"
+
+    def _suffix(self, headers: Headers) -> bytes:
+        """Everything after the request target, up to the per-call lines"""
+        host_line = b'' if 'host' in headers else f"Host: {self._netloc}\r\n".encode()
+        connection_line = b'' if 'connection' in headers else b"Connection: keep-alive\r\n"
+        return b" HTTP/1.1\r\n" + self._proxy_line + host_line + headers.encode() + connection_line
+
+    def _target(self, path_params: Dict[str, Any], params: Optional[Mapping[str, Any]]) -> str:
+        if self._fields:
+            missing = self._fields.difference(path_params)
+            if missing:
+                raise ValueError(f"Missing path parameters: {', '.join(sorted(missing))}")
+            path = self._path.format_map({
+                name: quote(str(value), safe='') for name, value in path_params.items()
+            })
+        else:
+            path = self._path
+        query = self._static_query
+        if params:
+            extra = urlencode(params, doseq=True)
+            query = f"{query}&{extra}" if query else extra
+        return f"{path}?{query}" if query else path
+
+    def __call__(
+        self,
+        body: Optional[Union[bytes, str]] = None,
+        params: Optional[Mapping[str, Any]] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        json: Any = None,
+        **path_params: Any
+    ) -> Response:
+        """Send the request, filling in path parameters, query and body"""
+        target = self._target(path_params, params)
+        head = self._line_prefix + target.encode()
+        extra = Headers(headers) if headers else None
+        if extra is None:
+            head += self._head_suffix
+        elif any(name in self.headers or name.lower() in ('host', 'connection') for name in extra):
+            # Overriding a default: re-encode the merged block so no header goes out twice
+            head += self._suffix(Headers(extra, base=self.headers))
+        else:
+            head += self._head_suffix + extra.encode()
+        if json is not None:
+            body = self.http.codecs.json.dumps(json)
+            if extra is None or 'content-type' not in extra:
+                head += self._json_line
+        elif isinstance(body, str):
+            body = body.encode()
+        if body is not None:
+            head += b"Content-Length: %d\r\n" % len(body)
+        head += b"\r\n"
+
+        request = Request(
+            method=self.method,
+            url=self._base_url + target,
+            headers=Headers(extra, base=self.headers) if extra is not None else self.headers,
+            body=body,
+            timeout=self.http.default_timeout,
+            http_version=self.http_version
+        )
+        return self.http.send_prepared(self, request, head, body)
+
+    def __repr__(self) -> str:
+        return f"<PreparedRequest {self.method.value} {self.url_template}>"
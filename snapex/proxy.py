@@ -0,0 +1,214 @@
+import base64
+import ipaddress
+import os
+import re
+import socket
+from typing import Dict, List, Optional, Union
+from urllib.parse import unquote, urlsplit
+from .exceptions import InvalidURL, ProxyError
+
+ProxySetting = Union[str, Dict[str, str], None]
+
+class Proxy:
+    """An HTTP proxy parsed once from its URL
+
+    Credentials in the URL become a Proxy-Authorization header that is
+    sent with CONNECT and with requests forwarded in absolute form.
+    """
+    __slots__ = ('url', 'host', 'port', 'origin', 'auth_line')
+
+    def __init__(self, url: str):
+        if '://' not in url:
+            url = f"http://{url}"
+        parsed = urlsplit(url)
+        if parsed.scheme != 'http' or not parsed.hostname:
+            raise InvalidURL(f"Unsupported proxy URL: {url}")
+        self.url = url
+        self.host = parsed.hostname
+        self.port = parsed.port or 80
+        self.origin = f"http://{self.host}:{self.port}"
+        self.auth_line = b''
+        if parsed.username is not None:
+            credentials = f"{unquote(parsed.username)}:{unquote(parsed.password or '')}"
+            token = base64.b64encode(credentials.encode('utf-8')).decode('ascii')
+            self.auth_line = f"Proxy-Authorization: Basic {token}\r\n".encode()
+
+    def connect_head(self, host: str, port: int) -> bytes:
+        """CONNECT request opening a tunnel to host:port"""
+        authority = f"[{host}]:{port}" if ':' in host else f"{host}:{port}"
+        return (
+            f"CONNECT {authority} HTTP/1.1\r\nHost: {authority}\r\n".encode()
+            + self.auth_line + b"\r\n"
+        )
+
+    def __repr__(self) -> str:
+        return f"Proxy({self.origin!r})"
+
+def _check_tunnel(head: bytes, host: str, port: int) -> None:
+    status_line = head.split(b"\r\n", 1)[0]
+    parts = status_line.split(None, 2)
+    if len(parts) < 2 or not parts[0].startswith(b"HTTP/1.") or not parts[1].isdigit():
+        raise ProxyError(f"Invalid proxy response to CONNECT {host}:{port}")
+    status = int(parts[1])
+    if not 200 <= status < 300:
+        reason = parts[2].decode('latin-1') if len(parts) > 2 else ''
+        raise ProxyError(f"Proxy refused CONNECT {host}:{port}: {status} {reason}".rstrip(), status)
+
+def open_tunnel(sock: socket.socket, proxy: Proxy, host: str, port: int) -> None:
+    """Turn a connected proxy socket into a tunnel to host:port"""
+    sock.sendall(proxy.connect_head(host, port))
+    head = b''
+    while b"\r\n\r\n" not in head:
+        data = sock.recv(4096)
+        if not data:
+            raise ProxyError(f"Proxy closed the connection during CONNECT {host}:{port}")
+        head += data
+    _check_tunnel(head, host, port)
+
+async def open_tunnel_async(proxy: Proxy, host: str, port: int, timeout: Optional[float] = None) -> socket.socket:
+    """Connect to the proxy and CONNECT to host:port without blocking the loop"""
+    import asyncio
+    loop = asyncio.get_running_loop()
+
+    async def connect() -> socket.socket:
+        infos = await loop.getaddrinfo(proxy.host, proxy.port, type=socket.SOCK_STREAM)
+        error: Optional[Exception] = None
+        for family, type_, proto, _, address in infos:
+            sock = socket.socket(family, type_, proto)
+            sock.setblocking(False)
+            try:
+                await loop.sock_connect(sock, address)
+                break
+            except OSError as e:
+                sock.close()
+                error = e
+        else:
+            raise error or OSError(f"No addresses for {proxy.host}")
+        try:
+            await loop.sock_sendall(sock, proxy.connect_head(host, port))
+            head = b''
+            while b"\r\n\r\n" not in head:
+                data = await loop.sock_recv(sock, 4096)
+                if not data:
+                    raise ProxyError(f"Proxy closed the connection during CONNECT {host}:{port}")
+                head += data
+            _check_tunnel(head, host, port)
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+
+    return await asyncio.wait_for(connect(), timeout)
+
+class NoProxy:
+    """NO_PROXY matcher, compiled once from the comma-separated list
+
+    Host names match themselves and their subdomains (a leading '.' or
+    '*.' is ignored), `host:port` entries match that port only, IP
+    addresses and CIDR ranges match literal IP hosts, and '*' matches all.
+    """
+    __slots__ = ('match_all', '_names', '_ports', '_networks')
+
+    def __init__(self, value: Optional[str] = None):
+        self.match_all = False
+        names: List[str] = []
+        ports: Dict[str, set] = {}
+        networks: List[Union[ipaddress.IPv4Network, ipaddress.IPv6Network]] = []
+        for entry in re.split(r'[,\s]+', (value or '').strip().lower()):
+            if not entry:
+                continue
+            if entry == '*':
+                self.match_all = True
+                continue
+            try:
+                networks.append(ipaddress.ip_network(entry.strip('[]'), strict=False))
+                continue
+            except ValueError:
+                pass
+            host, port = entry, None
+            match = re.fullmatch(r'\[?(.+?)\]?:(\d+)', entry)
+            if match:
+                host, port = match.group(1), int(match.group(2))
+            host = host.lstrip('*').lstrip('.')
+            if port is not None:
+                ports.setdefault(host, set()).add(port)
+            else:
+                names.append(re.escape(host))
+        self._names = re.compile(r'(?:^|\.)(?:%s)$' % '|'.join(names)) if names else None
+        self._ports = ports
+        self._networks = tuple(networks)
+
+    def __call__(self, host: str, port: Optional[int] = None) -> bool:
+        """True when requests to host (and port) must not use a proxy"""
+        if self.match_all:
+            return True
+        host = host.lower()
+        if self._names is not None and self._names.search(host):
+            return True
+        if self._ports and port is not None:
+            for name, allowed in self._ports.items():
+                if port in allowed and (host == name or host.endswith('.' + name)):
+                    return True
+        if self._networks:
+            try:
+                address = ipaddress.ip_address(host)
+            except ValueError:
+                return False
+            return any(address in network for network in self._networks)
+        return False
+
+class ProxyResolver:
+    """Pick the proxy for each request
+
+    Client-level proxies and HTTP(S)_PROXY / ALL_PROXY / NO_PROXY from the
+    environment are read once; parsed Proxy objects are cached by URL. A
+    proxy given on the request itself always applies.
+    """
+
+    def __init__(self, proxy: ProxySetting = None, no_proxy: Optional[str] = None, trust_env: bool = True):
+        self._cache: Dict[str, Proxy] = {}
+        self._default: Dict[str, Proxy] = {}
+        if trust_env:
+            for scheme in ('http', 'https'):
+                url = _environ(f'{scheme}_proxy') or _environ('all_proxy')
+                # HTTP_PROXY is ignored under CGI, where clients can set it (httpoxy)
+                if url and not (scheme == 'http' and 'REQUEST_METHOD' in os.environ):
+                    self._default[scheme] = self.parse(url)
+            if no_proxy is None:
+                no_proxy = _environ('no_proxy')
+        self._default.update(self._mapping(proxy))
+        self.no_proxy = NoProxy(no_proxy)
+
+    def parse(self, url: str) -> Proxy:
+        proxy = self._cache.get(url)
+        if proxy is None:
+            proxy = self._cache[url] = Proxy(url)
+        return proxy
+
+    def _mapping(self, setting: ProxySetting) -> Dict[str, Proxy]:
+        if not setting:
+            return {}
+        if isinstance(setting, str):
+            proxy = self.parse(setting)
+            return {'http': proxy, 'https': proxy}
+        return {
+            scheme.split('://')[0]: self.parse(url)
+            for scheme, url in setting.items() if url and scheme.split('://')[0] in ('http', 'https')
+        }
+
+    def select(self, scheme: str, host: str, port: int, override: ProxySetting = None) -> Optional[Proxy]:
+        """Proxy for a request; ws and wss follow the http and https settings"""
+        scheme = 'https' if scheme in ('https', 'wss') else 'http'
+        if override:
+            if isinstance(override, str):
+                return self.parse(override)
+            url = override.get(scheme) or override.get('all')
+            if url:
+                return self.parse(url)
+        proxy = self._default.get(scheme)
+        if proxy is None or self.no_proxy(host, port):
+            return None
+        return proxy
+
+def _environ(name: str) -> Optional[str]:
+    return os.environ.get(name) or os.environ.get(name.upper())
@@ -0,0 +1,126 @@
+from bisect import bisect_left
+from threading import Lock
+from typing import Dict, Iterable, List, Optional, Sequence
+from .models import Timings
+
+# Upper bounds in milliseconds; the implicit last bucket is +Inf
+DEFAULT_BUCKETS = (
+    0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000
+)
+
+class Histogram:
+    """Fixed-bucket histogram for latencies in milliseconds
+
+    Not thread-safe on its own; owners guard it with their lock.
+    """
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.counts: List[int] = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = float('inf')
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record a single value"""
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+
+    def merge(self, other: 'Histogram') -> None:
+        """Add the counts of another histogram with the same buckets"""
+        if other.buckets != self.buckets:
+            raise ValueError("Cannot merge histograms with different buckets")
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """Estimate the q-th percentile (0-100) by interpolating inside its bucket"""
+        if not self.count:
+            return 0.0
+        rank = q / 100 * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            if not n or seen + n < rank:
+                seen += n
+                continue
+            lower = self.buckets[i - 1] if i > 0 else 0.0
+            upper = self.buckets[i] if i < len(self.buckets) else self.max
+            lower, upper = max(lower, self.min), min(upper, self.max)
+            return lower + (upper - lower) * ((rank - seen) / n)
+        return self.max
+
+    def cumulative(self) -> Iterable[tuple]:
+        """Yield (upper_bound, cumulative_count) pairs, ending with +Inf"""
+        total = 0
+        for bound, n in zip(self.buckets + (float('inf'),), self.counts):
+            total += n
+            yield bound, total
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'min': self.min if self.count else 0.0,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+        }
+
+class TimingStats:
+    """Aggregate per-origin histograms of request phase timings"""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._origins: Dict[str, Dict[str, Histogram]] = {}
+        self._lock = Lock()
+
+    def record(self, origin: str, timings: Timings) -> None:
+        """Add one completed request's timings under its origin"""
+        phases = timings.as_dict()
+        with self._lock:
+            histograms = self._origins.get(origin)
+            if histograms is None:
+                histograms = self._origins[origin] = {
+                    phase: Histogram(self.buckets) for phase in phases
+                }
+            for phase, value in phases.items():
+                histograms[phase].observe(value)
+
+    def histogram(self, origin: str, phase: str = 'total') -> Optional[Histogram]:
+        """Get the histogram for one origin and phase"""
+        with self._lock:
+            return self._origins.get(origin, {}).get(phase)
+
+    @property
+    def origins(self) -> List[str]:
+        with self._lock:
+            return list(self._origins)
+
+    def clear(self) -> None:
+        """Drop all recorded timings"""
+        with self._lock:
+            self._origins.clear()
+
+    @property
+    def stats(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """Get per-origin, per-phase summaries"""
+        with self._lock:
+            return {
+                origin: {phase: h.summary() for phase, h in histograms.items()}
+                for origin, histograms in self._origins.items()
+            }
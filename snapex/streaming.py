@@ -0,0 +1,267 @@
+import time
+from typing import (
+    TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional
+)
+from .exceptions import ConnectionError, StreamError, TimeoutError
+
+if TYPE_CHECKING:
+    from .client import Client
+    from .models import Response
+
+class ResponseStream:
+    """Iterator over a response body as it arrives from the socket
+
+    The connection stays checked out of the pool until the body has been
+    read to the end (it is then returned for reuse) or the stream is
+    closed early (the connection is then discarded).
+    """
+    __slots__ = ('_chunks', '_release', 'consumed', 'closed')
+
+    def __init__(self, chunks: Iterator[bytes], release: Optional[Callable[[bool], None]] = None):
+        self._chunks = chunks
+        self._release = release
+        self.consumed = 0
+        self.closed = False
+
+    def on_release(self, callback: Callable[[bool], None]) -> None:
+        """Call callback(reusable) once the body is finished or abandoned"""
+        self._release = callback
+
+    def __iter__(self) -> 'ResponseStream':
+        return self
+
+    def __next__(self) -> bytes:
+        if self.closed:
+            raise StopIteration
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            self._finish(True)
+            raise
+        except BaseException:
+            self._finish(False)
+            raise
+        self.consumed += len(chunk)
+        return chunk
+
+    def read(self) -> bytes:
+        """Read the rest of the body"""
+        return b''.join(self)
+
+    def close(self) -> None:
+        """Abandon the rest of the body"""
+        if not self.closed:
+            self._chunks.close()
+            self._finish(False)
+
+    def _finish(self, reusable: bool) -> None:
+        self.closed = True
+        release, self._release = self._release, None
+        if release is not None:
+            release(reusable)
+
+class LineDecoder:
+    """Split a byte stream into lines with a rolling buffer
+
+    Only newly received bytes are scanned for a newline, and complete
+    lines are dropped from the buffer as they are returned, so the buffer
+    never holds more than one partial line.
+    """
+    __slots__ = ('_buffer',)
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, chunk: bytes) -> List[bytes]:
+        """Add a chunk and return the lines it completes, without line endings"""
+        buffer = self._buffer
+        scan = len(buffer)
+        buffer += chunk
+        lines = []
+        start = 0
+        while True:
+            end = buffer.find(b'\n', scan)
+            if end < 0:
+                break
+            stop = end - 1 if end > start and buffer[end - 1] == 13 else end
+            lines.append(bytes(buffer[start:stop]))
+            start = scan = end + 1
+        if start:
+            del buffer[:start]
+        return lines
+
+    def flush(self) -> List[bytes]:
+        """Return a final line that had no trailing newline"""
+        if not self._buffer:
+            return []
+        line = bytes(self._buffer.rstrip(b'\r'))
+        self._buffer.clear()
+        return [line]
+
+class ServerSentEvent:
+    """A dispatched Server-Sent Event"""
+    __slots__ = ('event', 'data', 'id', 'retry')
+
+    def __init__(self, event: str = 'message', data: str = '', id: Optional[str] = None, retry: Optional[int] = None):
+        self.event = event
+        self.data = data
+        self.id = id
+        self.retry = retry
+
+    def json(self) -> Any:
+        from .codecs import get_json_codec
+        return get_json_codec().loads(self.data.encode('utf-8'))
+
+    def __repr__(self) -> str:
+        return f"ServerSentEvent(event={self.event!r}, data={self.data!r}, id={self.id!r})"
+
+class SSEDecoder:
+    """Incremental text/event-stream parser (WHATWG HTML, "Server-sent events")
+
+    last_event_id and retry persist across events, as a reconnecting
+    client needs them.
+    """
+    __slots__ = ('_event', '_data', 'last_event_id', 'retry')
+
+    def __init__(self, last_event_id: Optional[str] = None):
+        self._event = ''
+        self._data: List[str] = []
+        self.last_event_id = last_event_id
+        self.retry: Optional[int] = None
+
+    def reset(self) -> None:
+        """Drop a partially received event, e.g. when the connection is lost"""
+        self._event = ''
+        self._data = []
+
+    def decode(self, line: bytes) -> Optional[ServerSentEvent]:
+        """Process one line; returns an event when a blank line dispatches one"""
+        if not line:
+            if not self._data:
+                self._event = ''
+                return None
+            event = ServerSentEvent(
+                self._event or 'message', '\n'.join(self._data), self.last_event_id, self.retry
+            )
+            self._event = ''
+            self._data = []
+            return event
+        if line[0] == 58:  # ':' starts a comment
+            return None
+        name, _, value = line.partition(b':')
+        if value[:1] == b' ':
+            value = value[1:]
+        if name == b'data':
+            self._data.append(value.decode('utf-8', errors='replace'))
+        elif name == b'event':
+            self._event = value.decode('utf-8', errors='replace')
+        elif name == b'id':
+            if b'\0' not in value:
+                self.last_event_id = value.decode('utf-8', errors='replace')
+        elif name == b'retry':
+            if value.isdigit():
+                self.retry = int(value)
+        return None
+
+    def feed(self, lines: Iterable[bytes]) -> List[ServerSentEvent]:
+        events = []
+        for line in lines:
+            # A lone CR is also a line ending in event streams
+            for part in (line.split(b'\r') if b'\r' in line else (line,)):
+                event = self.decode(part)
+                if event is not None:
+                    events.append(event)
+        return events
+
+def iter_lines(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    decoder = LineDecoder()
+    for chunk in chunks:
+        yield from decoder.feed(chunk)
+    yield from decoder.flush()
+
+def iter_sse(chunks: Iterable[bytes], decoder: Optional[SSEDecoder] = None) -> Iterator[ServerSentEvent]:
+    decoder = decoder or SSEDecoder()
+    lines = LineDecoder()
+    for chunk in chunks:
+        yield from decoder.feed(lines.feed(chunk))
+    # An event is only dispatched by a blank line; a truncated one is dropped
+    decoder.reset()
+
+async def aiter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    decoder = LineDecoder()
+    async for chunk in chunks:
+        for line in decoder.feed(chunk):
+            yield line
+    for line in decoder.flush():
+        yield line
+
+async def aiter_sse(chunks: AsyncIterator[bytes], decoder: Optional[SSEDecoder] = None) -> AsyncIterator[ServerSentEvent]:
+    decoder = decoder or SSEDecoder()
+    lines = LineDecoder()
+    async for chunk in chunks:
+        for event in decoder.feed(lines.feed(chunk)):
+            yield event
+    decoder.reset()
+
+class EventSource:
+    """Server-Sent Events subscription that reconnects with Last-Event-ID
+
+    Created by Client.sse(). A dropped connection is retried after the
+    server's retry interval (or the default); a 204 response ends the
+    subscription, and any other non-2xx status raises HTTPError.
+    """
+
+    def __init__(
+        self,
+        client: 'Client',
+        url: str,
+        last_event_id: Optional[str] = None,
+        retry: float = 3.0,
+        max_reconnects: Optional[int] = None,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs: Any
+    ):
+        self.client = client
+        self.url = url
+        self.decoder = SSEDecoder(last_event_id)
+        self.retry = retry
+        self.max_reconnects = max_reconnects
+        self.headers = headers or {}
+        self.kwargs = kwargs
+        self.reconnects = 0
+
+    @property
+    def last_event_id(self) -> Optional[str]:
+        return self.decoder.last_event_id
+
+    def _connect(self) -> 'Response':
+        from .models import CachePolicy
+        headers = {'Accept': 'text/event-stream', 'Cache-Control': 'no-cache', **self.headers}
+        if self.decoder.last_event_id:
+            headers['Last-Event-ID'] = self.decoder.last_event_id
+        return self.client.request(
+            'GET', self.url, headers=headers, stream=True, cache_policy=CachePolicy.NEVER, **self.kwargs
+        )
+
+    def __iter__(self) -> Iterator[ServerSentEvent]:
+        while True:
+            self.decoder.reset()
+            try:
+                response = self._connect()
+            except (ConnectionError, TimeoutError):
+                pass
+            else:
+                with response:
+                    if response.status_code == 204:
+                        return
+                    response.raise_for_status()
+                    try:
+                        for event in iter_sse(response.iter_bytes(), self.decoder):
+                            yield event
+                    except (ConnectionError, TimeoutError, StreamError):
+                        pass
+            self.reconnects += 1
+            if self.max_reconnects is not None and self.reconnects > self.max_reconnects:
+                return
+            retry = self.decoder.retry
+            time.sleep(retry / 1000 if retry is not None else self.retry)
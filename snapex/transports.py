@@ -0,0 +1,420 @@
+import threading
+import time
+from functools import partial
+from typing import (
+    TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+)
+from urllib.parse import unquote, urlsplit
+from .connection import ConnectionPool, HTTP1Connection
+from .exceptions import ConnectionError
+from .headers import Headers
+from .models import Deadline, HTTPVersion, Request, Response, Timings
+from .utils import split_url
+
+if TYPE_CHECKING:
+    import asyncio
+    from .prepared import PreparedRequest
+
+class BaseTransport:
+    """Sends one request and returns its response
+
+    HTTPClient keeps caching, redirects, hooks and body encoding; a
+    transport only moves a prepared Request (bytes or iterable body). It
+    may return a streaming body for request.stream, or a complete one.
+    """
+
+    def handle_request(self, request: Request) -> Response:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        pass
+
+class HTTPTransport(BaseTransport):
+    """The network transport: pooled sockets and HTTP/1.1
+
+    route maps (url, verify, proxy) to the connection route, as
+    HTTPClient._route does, so proxies and Unix sockets apply here too.
+    """
+
+    def __init__(self, pool: ConnectionPool, route: Callable[..., Tuple]):
+        self.pool = pool
+        self.route = route
+
+    def handle_request(self, request: Request) -> Response:
+        timings = Timings()
+        deadline = Deadline.start(request.timeout)
+        route = self.route(request.url, request.verify, request.proxy)
+        try:
+            return self._exchange(request, route, timings, deadline)
+        except ConnectionError:
+            if not _retryable(request, request.body, timings):
+                raise
+        return self._exchange(request, route, Timings(start=timings.start), deadline, fresh=True)
+
+    def _exchange(
+        self,
+        request: Request,
+        route: Tuple,
+        timings: Timings,
+        deadline: Optional[Deadline],
+        fresh: bool = False
+    ) -> Response:
+        host, port, ssl_context, tunnel, forward, uds = route
+        pool = self.pool
+        sock = pool.get_connection(host, port, ssl_context, request.http_version, timings, tunnel, uds, deadline, fresh)
+        release = partial(pool.release_connection, host, port, sock, ssl_context, request.http_version, tunnel, uds)
+        try:
+            target_host = split_url(request.url)[1] if forward else host
+            response = HTTP1Connection(sock, target_host, forward).send_request(request, timings, deadline)
+        except Exception:
+            # Timed out or broken: the connection is dropped and its slot freed now
+            sock.close()
+            release()
+            raise
+        stream = response.body
+        if request.stream and hasattr(stream, 'on_release'):
+            # The connection goes back to the pool once the body is read
+            stream.on_release(partial(self._release_stream, sock, release))
+        else:
+            release()
+        return response
+
+    def send_prepared(self, prepared: 'PreparedRequest', request: Request, head: bytes, body: Any) -> Response:
+        """Write a head encoded by a PreparedRequest straight to a pooled connection"""
+        timings = Timings()
+        deadline = Deadline.start(request.timeout)
+        try:
+            return self._exchange_prepared(prepared, request, head, body, timings, deadline)
+        except ConnectionError:
+            if not _retryable(request, body, timings):
+                raise
+        return self._exchange_prepared(prepared, request, head, body, Timings(start=timings.start), deadline, True)
+
+    def _exchange_prepared(
+        self,
+        prepared: 'PreparedRequest',
+        request: Request,
+        head: bytes,
+        body: Any,
+        timings: Timings,
+        deadline: Optional[Deadline],
+        fresh: bool = False
+    ) -> Response:
+        host, port = prepared.address
+        sock = self.pool.get_connection(
+            host, port, prepared.ssl_context, prepared.http_version, timings,
+            prepared.tunnel, prepared.uds, deadline, fresh
+        )
+        try:
+            return HTTP1Connection(sock, prepared.host).send_raw(request, head, body, timings, deadline=deadline)
+        except Exception:
+            sock.close()
+            raise
+        finally:
+            self.pool.release_connection(
+                host, port, sock, prepared.ssl_context, prepared.http_version, prepared.tunnel, prepared.uds
+            )
+
+    @staticmethod
+    def _release_stream(sock: Any, release: Callable[[], None], reusable: bool) -> None:
+        """Return a streamed response's connection; an unfinished body poisons it"""
+        if not reusable:
+            sock.close()
+        release()
+
+    def close(self) -> None:
+        self.pool.close()
+
+_IDEMPOTENT = frozenset(('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE', 'TRACE'))
+
+def _retryable(request: Request, body: Any, timings: Timings) -> bool:
+    """An idempotent request failed on a reused connection before any response byte can be resent once
+
+    The server most likely closed the idle connection as it was being
+    reused, so the request was never processed. It may also have
+    processed it and dropped the connection before replying, so only
+    idempotent methods, or requests carrying an Idempotency-Key, are
+    retried; a consumed iterable body cannot be sent again.
+    """
+    if not timings.reused or timings.first_byte is not None:
+        return False
+    if body is not None and not isinstance(body, (bytes, bytearray, memoryview)):
+        return False
+    if request.method.value in _IDEMPOTENT:
+        return True
+    headers = request.headers
+    if not isinstance(headers, Headers):
+        headers = Headers(headers)
+    return 'idempotency-key' in headers
+
+def _body_bytes(body: Any) -> bytes:
+    if body is None:
+        return b''
+    if isinstance(body, (bytes, bytearray, memoryview)):
+        return bytes(body)
+    return b''.join(chunk.encode() if isinstance(chunk, str) else chunk for chunk in body)
+
+def _app_response(
+    request: Request,
+    status: int,
+    headers: Iterable[Tuple[str, str]],
+    chunks: List[bytes],
+    timings: Timings
+) -> Response:
+    response_headers = Headers()
+    for name, value in headers:
+        response_headers.add(name, value)
+    timings.end = time.perf_counter()
+    return Response(
+        status_code=status,
+        headers=response_headers,
+        body=b''.join(chunks),
+        request=request,
+        elapsed=timings.total,
+        http_version=HTTPVersion.HTTP_1_1,
+        timings=timings
+    )
+
+def _app_timings() -> Timings:
+    timings = Timings()
+    timings.pool_acquired = timings.dns_done = timings.connect_done = timings.tls_done = timings.start
+    return timings
+
+class WSGITransport(BaseTransport):
+    """Call a WSGI application in-process instead of opening sockets"""
+
+    def __init__(self, app: Callable[..., Iterable[bytes]], script_name: str = '', remote_addr: str = '127.0.0.1'):
+        self.app = app
+        self.script_name = script_name
+        self.remote_addr = remote_addr
+
+    def _environ(self, request: Request, body: bytes) -> Dict[str, Any]:
+        import io
+        import sys
+        url = urlsplit(request.url)
+        scheme, host, port, _ = split_url(request.url)
+        environ = {
+            'REQUEST_METHOD': request.method.value,
+            'SCRIPT_NAME': self.script_name,
+            'PATH_INFO': unquote(url.path or '/', 'latin-1'),
+            'QUERY_STRING': url.query,
+            'SERVER_NAME': host or 'localhost',
+            'SERVER_PORT': str(port),
+            'SERVER_PROTOCOL': 'HTTP/1.1',
+            'REMOTE_ADDR': self.remote_addr,
+            'CONTENT_LENGTH': str(len(body)) if body else '',
+            'wsgi.version': (1, 0),
+            'wsgi.url_scheme': 'https' if scheme == 'https' else 'http',
+            'wsgi.input': io.BytesIO(body),
+            'wsgi.errors': sys.stderr,
+            'wsgi.multithread': True,
+            'wsgi.multiprocess': False,
+            'wsgi.run_once': False,
+        }
+        headers = request.headers
+        items = headers.multi_items() if isinstance(headers, Headers) else headers.items()
+        if 'host' not in headers:
+            environ['HTTP_HOST'] = url.netloc
+        for name, value in items:
+            key = name.upper().replace('-', '_')
+            if key in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+                environ[key] = value
+                continue
+            key = f'HTTP_{key}'
+            environ[key] = f"{environ[key]},{value}" if key in environ and key != 'HTTP_HOST' else value
+        return environ
+
+    def handle_request(self, request: Request) -> Response:
+        timings = _app_timings()
+        environ = self._environ(request, _body_bytes(request.body))
+        started: List[Any] = []
+
+        def start_response(status: str, headers: List[Tuple[str, str]], exc_info: Any = None) -> Callable[[bytes], None]:
+            if exc_info and started:
+                raise exc_info[1].with_traceback(exc_info[2])
+            started[:] = [status, headers]
+            return chunks.append
+
+        chunks: List[bytes] = []
+        timings.request_sent = time.perf_counter()
+        result = self.app(environ, start_response)
+        try:
+            for chunk in result:
+                if chunk:
+                    chunks.append(chunk)
+        finally:
+            if hasattr(result, 'close'):
+                result.close()
+        if not started:
+            raise ConnectionError("WSGI application did not call start_response")
+        timings.first_byte = time.perf_counter()
+        return _app_response(request, int(started[0].split(None, 1)[0]), started[1], chunks, timings)
+
+class ASGITransport(BaseTransport):
+    """Call an ASGI application in-process instead of opening sockets
+
+    The application runs on one event loop in a background thread, so
+    state it binds to the loop survives between requests and the sync
+    client can be used from inside another event loop. The response body
+    is collected in full before it is returned.
+    """
+
+    def __init__(self, app: Callable[..., Any], root_path: str = '', client: Tuple[str, int] = ('127.0.0.1', 123)):
+        self.app = app
+        self.root_path = root_path
+        self.client = client
+        self._loop: Optional['asyncio.AbstractEventLoop'] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def _get_loop(self) -> 'asyncio.AbstractEventLoop':
+        with self._lock:
+            if self._loop is None:
+                import asyncio
+                loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=loop.run_forever, name='snapex-asgi', daemon=True)
+                self._thread.start()
+                self._loop = loop
+            return self._loop
+
+    def _scope(self, request: Request) -> Dict[str, Any]:
+        url = urlsplit(request.url)
+        scheme, host, port, _ = split_url(request.url)
+        headers = request.headers
+        items = headers.multi_items() if isinstance(headers, Headers) else list(headers.items())
+        raw_headers = [(name.lower().encode('latin-1'), value.encode('latin-1')) for name, value in items]
+        if 'host' not in headers:
+            raw_headers.insert(0, (b'host', url.netloc.encode('latin-1')))
+        return {
+            'type': 'http',
+            'asgi': {'version': '3.0', 'spec_version': '2.3'},
+            'http_version': '1.1',
+            'method': request.method.value,
+            'scheme': 'https' if scheme == 'https' else 'http',
+            'path': unquote(url.path or '/'),
+            'raw_path': (url.path or '/').encode('latin-1'),
+            'query_string': url.query.encode('latin-1'),
+            'root_path': self.root_path,
+            'headers': raw_headers,
+            'client': self.client,
+            'server': (host or 'localhost', port),
+        }
+
+    async def _call(self, request: Request, body: bytes, timings: Timings) -> Response:
+        scope = self._scope(request)
+        received = False
+        status: Optional[int] = None
+        headers: Sequence[Tuple[bytes, bytes]] = ()
+        chunks: List[bytes] = []
+
+        async def receive() -> Dict[str, Any]:
+            nonlocal received
+            if not received:
+                received = True
+                return {'type': 'http.request', 'body': body, 'more_body': False}
+            return {'type': 'http.disconnect'}
+
+        async def send(message: Dict[str, Any]) -> None:
+            nonlocal status, headers
+            if message['type'] == 'http.response.start':
+                status = message['status']
+                headers = message.get('headers', ())
+                timings.first_byte = time.perf_counter()
+            elif message['type'] == 'http.response.body':
+                chunk = message.get('body', b'')
+                if chunk:
+                    chunks.append(chunk)
+
+        timings.request_sent = time.perf_counter()
+        await self.app(scope, receive, send)
+        if status is None:
+            raise ConnectionError("ASGI application did not start a response")
+        decoded = [(name.decode('latin-1'), value.decode('latin-1')) for name, value in headers]
+        return _app_response(request, status, decoded, chunks, timings)
+
+    def handle_request(self, request: Request) -> Response:
+        import asyncio
+        timings = _app_timings()
+        future = asyncio.run_coroutine_threadsafe(
+            self._call(request, _body_bytes(request.body), timings), self._get_loop()
+        )
+        return future.result()
+
+    def close(self) -> None:
+        with self._lock:
+            loop, self._loop = self._loop, None
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            self._thread.join()
+            loop.close()
+
+def _request_key(request: Request) -> str:
+    import hashlib
+    body = request.body
+    digest = hashlib.sha256(body).hexdigest() if isinstance(body, (bytes, bytearray, memoryview)) else ''
+    return f"{request.method.value} {request.url} {digest}"
+
+class RecordingTransport(BaseTransport):
+    """Pass requests to another transport and record each exchange
+
+    save() writes the recording as JSON for ReplayTransport. Streamed
+    responses are read in full so they can be recorded.
+    """
+
+    def __init__(self, transport: BaseTransport):
+        self.transport = transport
+        self.entries: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def handle_request(self, request: Request) -> Response:
+        import base64
+        response = self.transport.handle_request(request)
+        if request.stream:
+            response.body = response.content
+        entry = {
+            'request': _request_key(request),
+            'status': response.status_code,
+            'headers': response.headers.multi_items(),
+            'body': base64.b64encode(response.content).decode('ascii'),
+        }
+        with self._lock:
+            self.entries.append(entry)
+        return response
+
+    def save(self, path: str) -> None:
+        import json
+        with open(path, 'w') as f:
+            json.dump(self.entries, f, indent=1)
+
+    def close(self) -> None:
+        self.transport.close()
+
+class ReplayTransport(BaseTransport):
+    """Answer requests from a recording, without any network access
+
+    Requests match on method, URL and body. Repeats of a request are
+    answered in recorded order, and the last answer is reused once they
+    run out; an unrecorded request raises ConnectionError.
+    """
+
+    def __init__(self, entries: Any):
+        if isinstance(entries, str):
+            import json
+            with open(entries) as f:
+                entries = json.load(f)
+        self._answers: Dict[str, List[Dict[str, Any]]] = {}
+        for entry in entries:
+            self._answers.setdefault(entry['request'], []).append(entry)
+        self._lock = threading.Lock()
+
+    def handle_request(self, request: Request) -> Response:
+        key = _request_key(request)
+        with self._lock:
+            answers = self._answers.get(key)
+            if not answers:
+                raise ConnectionError(f"No recorded response for {key.rstrip()}")
+            entry = answers.pop(0) if len(answers) > 1 else answers[0]
+        import base64
+        timings = _app_timings()
+        body = base64.b64decode(entry['body'])
+        return _app_response(request, entry['status'], entry['headers'], [body], timings)
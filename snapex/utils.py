@@ -1,23 +1,27 @@
-import hashlib
-import json
 import time
-from typing import Any, Dict, Optional, Union
-from urllib.parse import urlencode, urlparse
+from functools import lru_cache
+from typing import Any, Dict, Optional, Tuple, Union
+from urllib.parse import unquote, urlencode, urljoin, urlparse, urlsplit, parse_qsl
 from .models import Request
+from .headers import Headers
 
 def generate_cache_key(request: Request) -> str:
     """Generate a unique cache key for the request"""
+    import hashlib
+    import json
+    
     key_parts = [
         request.method.value,
         request.url,
-        urlencode(sorted(request.params.items()) if request.params else '',
-        json.dumps(request.headers, sort_keys=True) if request.headers else '',
+        urlencode(sorted(request.params.items())) if request.params else '',
+        request.headers.encode().decode('latin-1') if isinstance(request.headers, Headers)
+        else json.dumps(request.headers, sort_keys=True) if request.headers else '',
         json.dumps(request.cookies, sort_keys=True) if request.cookies else ''
     ]
     
     if request.body:
-        if isinstance(request.body, (bytes, str)):
-            body = request.body if isinstance(request.body, bytes) else request.body.encode()
+        if isinstance(request.body, (bytes, bytearray, memoryview, str)):
+            body = request.body if not isinstance(request.body, str) else request.body.encode()
         else:
             body = json.dumps(request.body).encode()
         key_parts.append(hashlib.sha256(body).hexdigest())
@@ -26,25 +30,68 @@ def generate_cache_key(request: Request) -> str:
 
 def normalize_url(url: str) -> str:
     """Normalize URL by removing fragments and sorting query params"""
+    if '?' not in url and '#' not in url:
+        return url
     parsed = urlparse(url)
-    query = urlencode(sorted(parse_qs(parsed.query).items()))
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
     return parsed._replace(query=query, fragment='').geturl()
 
 def merge_headers(
-    base: Optional[Dict[str, str]],
-    update: Optional[Dict[str, str]]
-) -> Dict[str, str]:
-    """Merge two headers dictionaries"""
-    result = {}
-    if base:
-        result.update(base)
-    if update:
-        result.update(update)
-    return result
+    base: Optional[Union[Headers, Dict[str, str]]],
+    update: Optional[Union[Headers, Dict[str, str]]]
+) -> Headers:
+    """Layer update over base without copying or mutating base"""
+    if not isinstance(base, Headers):
+        base = Headers(base)
+    return Headers(update, base=base)
 
 def elapsed_time(start: float) -> float:
-    """Calculate elapsed time in milliseconds"""
-    return (time.time() - start) * 1000
+    """Calculate elapsed time in milliseconds since a perf_counter() timestamp"""
+    return (time.perf_counter() - start) * 1000
+
+@lru_cache(maxsize=1024)
+def split_url(url: str) -> Tuple[str, Optional[str], int, str]:
+    """Split a URL into (scheme, host, port, request target), memoized per URL"""
+    parsed = urlsplit(url)
+    port = parsed.port or (443 if parsed.scheme in ('https', 'wss') else 80)
+    target = parsed.path or '/'
+    if parsed.query:
+        target = f"{target}?{parsed.query}"
+    return parsed.scheme, parsed.hostname, port, target
+
+@lru_cache(maxsize=256)
+def unix_socket_path(url: str) -> str:
+    """Socket path of an http+unix://<percent-encoded path>/... URL"""
+    return unquote(urlsplit(url).netloc)
+
+@lru_cache(maxsize=256)
+def host_header(url: str) -> str:
+    """Host header value for a URL: its host, with the port unless it is the scheme's default
+
+    http+unix URLs, whose authority is a socket path, get 'localhost'.
+    """
+    scheme, host, port, _ = split_url(url)
+    if scheme == 'http+unix':
+        return 'localhost'
+    if ':' in host:
+        host = f"[{host}]"
+    return host if port == (443 if scheme in ('https', 'wss') else 80) else f"{host}:{port}"
+
+def origin_of(url: str) -> str:
+    """Return scheme://host:port for a URL"""
+    scheme, host, port, _ = split_url(url)
+    return f"{scheme}://{host}:{port}"
+
+def join_url(base: str, location: str) -> str:
+    """Resolve a Location header against the URL it came from
+
+    urljoin leaves relative references alone for schemes it does not
+    know, such as http+unix, so those are joined as if they were http.
+    """
+    scheme, _, rest = base.partition('://')
+    if scheme in ('http', 'https') or '://' in location:
+        return urljoin(base, location)
+    return scheme + urljoin(f"http://{rest}", location)[4:]
 
 def is_redirect(status_code: int) -> bool:
     """Check if status code is a redirect"""
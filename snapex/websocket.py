@@ -0,0 +1,736 @@
+import base64
+import hashlib
+import os
+import select
+import socket
+import threading
+from collections import deque
+from typing import (
+    TYPE_CHECKING, Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+)
+from .exceptions import (
+    ConnectionError, TimeoutError, WebSocketClosed, WebSocketError, WebSocketProtocolError
+)
+from .frames import (
+    OP_BINARY, OP_CLOSE, OP_PING, OP_PONG, OP_TEXT,
+    CLOSE_INVALID_DATA, CLOSE_NORMAL, FrameParser, MessageAssembler,
+    decode_close, encode_close, encode_frame
+)
+from .headers import Headers
+from .utils import host_header, split_url
+
+if TYPE_CHECKING:
+    import asyncio
+    from .client import Client
+    from .deflate import PerMessageDeflate
+    from .proxy import Proxy
+
+_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+Message = Union[str, bytes]
+
+def _accept_key(key: bytes) -> str:
+    return base64.b64encode(hashlib.sha1(key + _GUID).digest()).decode()
+
+class Handshake:
+    """Opening handshake for one connection attempt (RFC 6455 section 4.1)"""
+
+    def __init__(
+        self,
+        url: str,
+        headers: Optional[Headers] = None,
+        subprotocols: Optional[Sequence[str]] = None,
+        compression: bool = False
+    ):
+        scheme, host, port, target = split_url(url)
+        if scheme not in ('ws', 'wss'):
+            raise WebSocketError(f"Unsupported WebSocket scheme: {scheme}")
+        self.secure = scheme == 'wss'
+        self.host = host
+        self.port = port
+        self.target = target
+        self.netloc = host_header(url)
+        self.http_url = f"{'https' if self.secure else 'http'}://{host}:{self.port}{target}"
+        self.key = base64.b64encode(os.urandom(16))
+        self.headers = Headers({
+            'Upgrade': 'websocket',
+            'Connection': 'Upgrade',
+            'Sec-WebSocket-Key': self.key.decode(),
+            'Sec-WebSocket-Version': '13',
+        }, base=headers)
+        if subprotocols:
+            self.headers['Sec-WebSocket-Protocol'] = ', '.join(subprotocols)
+        if compression:
+            from .deflate import PerMessageDeflate
+            self.headers['Sec-WebSocket-Extensions'] = PerMessageDeflate.offer()
+        self.subprotocols = subprotocols
+        self.compression = compression
+
+    def encode(self) -> bytes:
+        return (
+            f"GET {self.target} HTTP/1.1\r\nHost: {self.netloc}\r\n".encode()
+            + self.headers.encode() + b"\r\n"
+        )
+
+    def verify(
+        self,
+        status_code: int,
+        headers: Headers,
+        max_size: Optional[int] = None
+    ) -> Tuple[Optional[str], Optional['PerMessageDeflate']]:
+        """Check the server's answer; returns the subprotocol and agreed compression"""
+        if status_code != 101:
+            raise WebSocketError(f"Server rejected WebSocket upgrade with HTTP {status_code}")
+        if (headers.get('upgrade') or '').lower() != 'websocket':
+            raise WebSocketError("Missing 'Upgrade: websocket' in handshake response")
+        if 'upgrade' not in (headers.get('connection') or '').lower():
+            raise WebSocketError("Missing 'Connection: Upgrade' in handshake response")
+        if headers.get('sec-websocket-accept') != _accept_key(self.key):
+            raise WebSocketError("Invalid Sec-WebSocket-Accept in handshake response")
+        subprotocol = headers.get('sec-websocket-protocol')
+        if subprotocol is not None and subprotocol not in (self.subprotocols or ()):
+            raise WebSocketError(f"Server selected unknown subprotocol {subprotocol!r}")
+        deflate = None
+        extensions = headers.get('sec-websocket-extensions')
+        if extensions:
+            if not self.compression:
+                raise WebSocketError(f"Server enabled extensions that were not offered: {extensions}")
+            from .deflate import PerMessageDeflate
+            deflate = PerMessageDeflate.accept(extensions, max_size=max_size)
+        return subprotocol, deflate
+
+class Protocol:
+    """Sans-IO RFC 6455 client state shared by the sync and async connections
+
+    receive_data() turns received bytes into queued messages and queues
+    anything that must be written back (pongs, the close reply), which the
+    connection collects with data_to_send() - also after a protocol error.
+    """
+
+    def __init__(self, max_size: Optional[int] = 2 ** 20, deflate: Optional['PerMessageDeflate'] = None):
+        self.parser = FrameParser(max_size, allow_rsv1=deflate is not None)
+        self.assembler = MessageAssembler(max_size)
+        self.deflate = deflate
+        self.messages: Deque[Message] = deque()
+        self.close_sent = False
+        self.close_received = False
+        self.close_code: Optional[int] = None
+        self.close_reason = ''
+        self._outgoing: List[bytes] = []
+
+    @property
+    def closed(self) -> bool:
+        return self.close_sent or self.close_received
+
+    def encode_message(self, data: Message) -> bytes:
+        """Frame a message; with compression, frames must be sent in encoding order"""
+        if self.close_sent:
+            raise WebSocketClosed("WebSocket is closed", self.close_code or 1006, self.close_reason)
+        if isinstance(data, str):
+            opcode, payload = OP_TEXT, data.encode('utf-8')
+        else:
+            opcode, payload = OP_BINARY, data
+        if self.deflate is not None:
+            return encode_frame(opcode, self.deflate.compress(payload), rsv1=True)
+        return encode_frame(opcode, payload)
+
+    def encode_ping(self, data: bytes = b'') -> bytes:
+        return encode_frame(OP_PING, data)
+
+    def encode_close(self, code: int = CLOSE_NORMAL, reason: str = '') -> bytes:
+        self.close_sent = True
+        if self.close_code is None:
+            self.close_code, self.close_reason = code, reason
+        return encode_frame(OP_CLOSE, encode_close(code, reason))
+
+    def data_to_send(self) -> bytes:
+        data = b''.join(self._outgoing)
+        self._outgoing.clear()
+        return data
+
+    def receive_data(self, data: bytes) -> None:
+        """Process received bytes, queueing messages and replies"""
+        replies = self._outgoing
+        try:
+            for frame in self.parser.feed(data):
+                opcode = frame.opcode
+                if opcode == OP_PING:
+                    if not self.close_sent:
+                        replies.append(encode_frame(OP_PONG, frame.payload))
+                elif opcode == OP_PONG:
+                    continue
+                elif opcode == OP_CLOSE:
+                    self.close_received = True
+                    code, reason = decode_close(frame.payload)
+                    if not self.close_sent:
+                        self.close_code, self.close_reason = code, reason
+                        replies.append(self.encode_close(code if code != 1005 else CLOSE_NORMAL))
+                    break
+                else:
+                    message = self.assembler.add(frame)
+                    if message is not None:
+                        self.messages.append(self._decode(message))
+        except WebSocketProtocolError as e:
+            if not self.close_sent:
+                replies.append(self.encode_close(e.code, str(e)[:100]))
+            self.close_received = True
+            raise
+
+    def _decode(self, message: Any) -> Message:
+        payload = message.payload
+        if message.rsv1:
+            payload = self.deflate.decompress(payload)
+        if message.opcode == OP_TEXT:
+            try:
+                return payload.decode('utf-8')
+            except UnicodeDecodeError:
+                raise WebSocketProtocolError("Invalid UTF-8 in text message", CLOSE_INVALID_DATA)
+        return payload
+
+    def closed_error(self) -> WebSocketClosed:
+        code = self.close_code if self.close_code is not None else 1006
+        return WebSocketClosed(f"WebSocket closed with code {code}", code, self.close_reason)
+
+class SendQueue:
+    """Outbound frames awaiting a socket write, with watermark accounting
+
+    Frames queued while a write is in flight are joined into the next
+    write. queued_bytes includes the frames being written, so a sender
+    waits once it reaches high_watermark and resumes at low_watermark.
+    """
+
+    def __init__(self, high_watermark: int = 2 ** 20, low_watermark: Optional[int] = None):
+        if low_watermark is None:
+            low_watermark = high_watermark // 4
+        if not 0 <= low_watermark <= high_watermark:
+            raise ValueError("low_watermark must be between 0 and high_watermark")
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self._frames: List[bytes] = []
+        self.queued_bytes = 0
+        self.queued_frames = 0
+        self.peak_bytes = 0
+        self.frames_sent = 0
+        self.bytes_sent = 0
+        self.writes = 0
+        self.backpressure_waits = 0
+
+    @property
+    def pending(self) -> bool:
+        """Frames not yet handed to a write"""
+        return bool(self._frames)
+
+    @property
+    def full(self) -> bool:
+        return self.queued_bytes >= self.high_watermark
+
+    @property
+    def drained(self) -> bool:
+        return self.queued_bytes <= self.low_watermark
+
+    def put(self, frame: bytes) -> None:
+        self._frames.append(frame)
+        self.queued_bytes += len(frame)
+        self.queued_frames += 1
+        if self.queued_bytes > self.peak_bytes:
+            self.peak_bytes = self.queued_bytes
+
+    def take(self) -> Tuple[bytes, int]:
+        """Everything pending, joined for a single write"""
+        frames, self._frames = self._frames, []
+        return frames[0] if len(frames) == 1 else b''.join(frames), len(frames)
+
+    def done(self, size: int, count: int) -> None:
+        """Account for a completed write of take()'s result"""
+        self.queued_bytes -= size
+        self.queued_frames -= count
+        self.frames_sent += count
+        self.bytes_sent += size
+        self.writes += 1
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            'queued_frames': self.queued_frames,
+            'queued_bytes': self.queued_bytes,
+            'peak_bytes': self.peak_bytes,
+            'high_watermark': self.high_watermark,
+            'low_watermark': self.low_watermark,
+            'frames_sent': self.frames_sent,
+            'bytes_sent': self.bytes_sent,
+            'writes': self.writes,
+            'backpressure_waits': self.backpressure_waits,
+        }
+
+class WebSocketConnection:
+    """Blocking WebSocket connection on a socket checked out of the client's pool
+
+    send() hands frames to a writer thread and only blocks while the send
+    queue is above its high watermark; frames queued during a write go
+    out together in the next one. recv() may run in another thread. The
+    socket is discarded, not returned to the pool, on close.
+    """
+
+    def __init__(
+        self,
+        sock: socket.socket,
+        protocol: Protocol,
+        subprotocol: Optional[str] = None,
+        initial: bytes = b'',
+        release: Optional[Callable[[], None]] = None,
+        high_watermark: int = 2 ** 20,
+        low_watermark: Optional[int] = None
+    ):
+        self.sock = sock
+        self.protocol = protocol
+        self.subprotocol = subprotocol
+        self.queue = SendQueue(high_watermark, low_watermark)
+        self._release = release
+        self._cond = threading.Condition()
+        self._recv_lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+        self._write_error: Optional[BaseException] = None
+        self._closing = False
+        if initial:
+            self._feed(initial)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Send queue depth and write counters"""
+        with self._cond:
+            return self.queue.stats
+
+    def _enqueue(self, frame: bytes) -> None:
+        # Called with _cond held
+        self.queue.put(frame)
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, name='snapex-ws-writer', daemon=True)
+            self._writer.start()
+        self._cond.notify_all()
+
+    def _write_loop(self) -> None:
+        cond, queue = self._cond, self.queue
+        while True:
+            with cond:
+                cond.wait_for(lambda: queue.pending or self._closing)
+                if not queue.pending:
+                    return
+                data, count = queue.take()
+            try:
+                self.sock.sendall(data)
+            except OSError as e:
+                with cond:
+                    self._write_error = e
+                    cond.notify_all()
+                return
+            with cond:
+                queue.done(len(data), count)
+                cond.notify_all()
+
+    def _check_writable(self) -> None:
+        if self._write_error is not None:
+            raise ConnectionError(f"WebSocket write failed: {self._write_error}")
+        if self._closing:
+            raise self.protocol.closed_error()
+
+    def _wait(self, predicate: Callable[[], bool], timeout: Optional[float]) -> None:
+        # Called with _cond held
+        done = lambda: predicate() or self._write_error is not None or self._closing
+        if not self._cond.wait_for(done, timeout):
+            raise TimeoutError("Timed out waiting for the WebSocket send queue to drain")
+        if not predicate():
+            self._check_writable()
+
+    def send(self, data: Message, timeout: Optional[float] = None) -> None:
+        """Queue a text (str) or binary (bytes) message, waiting while the queue is full"""
+        with self._cond:
+            self._check_writable()
+            queue = self.queue
+            if queue.full:
+                queue.backpressure_waits += 1
+                self._wait(lambda: queue.drained, timeout)
+            # Encoding under the lock keeps the compressor's state in queue order
+            self._enqueue(self.protocol.encode_message(data))
+
+    def ping(self, data: bytes = b'') -> None:
+        with self._cond:
+            self._check_writable()
+            self._enqueue(self.protocol.encode_ping(data))
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """Wait until every queued frame has been written"""
+        with self._cond:
+            self._wait(lambda: not self.queue.queued_bytes, timeout)
+
+    def recv(self, timeout: Optional[float] = None) -> Message:
+        """Receive the next message; raises WebSocketClosed once the peer has closed"""
+        protocol = self.protocol
+        with self._recv_lock:
+            while not protocol.messages:
+                if protocol.close_received or self.sock.fileno() < 0:
+                    self._abort()
+                    raise protocol.closed_error()
+                self._receive(timeout)
+            return protocol.messages.popleft()
+
+    def _receive(self, timeout: Optional[float]) -> None:
+        # The socket stays blocking for the writer thread, so wait for input with select
+        pending = getattr(self.sock, 'pending', None)
+        if timeout is not None and not (pending and pending()):
+            try:
+                readable = select.select([self.sock], [], [], timeout)[0]
+            except (OSError, ValueError) as e:
+                self._abort()
+                raise ConnectionError(str(e))
+            if not readable:
+                raise TimeoutError("Timed out waiting for a WebSocket message")
+        try:
+            data = self.sock.recv(65536)
+        except OSError as e:
+            self._abort()
+            raise ConnectionError(str(e))
+        if not data:
+            self.protocol.close_received = True
+            return
+        self._feed(data)
+
+    def _feed(self, data: bytes) -> None:
+        try:
+            self.protocol.receive_data(data)
+        except WebSocketProtocolError:
+            try:
+                self.sock.sendall(self.protocol.data_to_send())
+            except OSError:
+                pass
+            self._abort()
+            raise
+        replies = self.protocol.data_to_send()
+        if replies:
+            with self._cond:
+                if self._write_error is None and not self._closing:
+                    self._enqueue(replies)
+
+    def close(self, code: int = CLOSE_NORMAL, reason: str = '', timeout: float = 5.0) -> None:
+        """Flush queued messages, run the closing handshake, then discard the socket"""
+        protocol = self.protocol
+        try:
+            with self._cond:
+                if not protocol.close_sent and not self._closing and self._write_error is None:
+                    self._enqueue(protocol.encode_close(code, reason))
+            self.flush(timeout)
+            while not protocol.close_received and self.sock.fileno() >= 0:
+                self._receive(timeout)
+        except (ConnectionError, TimeoutError, WebSocketError):
+            pass
+        finally:
+            self._abort()
+
+    def _abort(self) -> None:
+        with self._cond:
+            self._closing = True
+            self._cond.notify_all()
+        self.sock.close()
+        release, self._release = self._release, None
+        if release is not None:
+            release()
+
+    def __iter__(self) -> Iterator[Message]:
+        """Messages until the connection is closed"""
+        while True:
+            try:
+                yield self.recv()
+            except WebSocketClosed:
+                return
+
+    def __enter__(self) -> 'WebSocketConnection':
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+class AsyncWebSocketConnection:
+    """asyncio WebSocket connection sharing the sync connection's protocol core
+
+    A writer task drains the send queue, so awaiting send() only suspends
+    while the queue is above its high watermark.
+    """
+
+    def __init__(
+        self,
+        reader: 'asyncio.StreamReader',
+        writer: 'asyncio.StreamWriter',
+        protocol: Protocol,
+        subprotocol: Optional[str] = None,
+        high_watermark: int = 2 ** 20,
+        low_watermark: Optional[int] = None
+    ):
+        self.reader = reader
+        self.writer = writer
+        self.protocol = protocol
+        self.subprotocol = subprotocol
+        self.queue = SendQueue(high_watermark, low_watermark)
+        self._writer_task: Optional['asyncio.Task'] = None
+        self._wakeup: Optional['asyncio.Event'] = None
+        self._progress: Optional['asyncio.Event'] = None
+        self._write_error: Optional[BaseException] = None
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        """Send queue depth and write counters"""
+        return self.queue.stats
+
+    def _enqueue(self, frame: bytes) -> None:
+        self.queue.put(frame)
+        if self._writer_task is None:
+            import asyncio
+            self._wakeup = asyncio.Event()
+            self._progress = asyncio.Event()
+            self._writer_task = asyncio.get_running_loop().create_task(self._write_loop())
+        self._wakeup.set()
+
+    async def _write_loop(self) -> None:
+        queue = self.queue
+        try:
+            while True:
+                while not queue.pending:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                data, count = queue.take()
+                self.writer.write(data)
+                await self.writer.drain()
+                queue.done(len(data), count)
+                self._progress.set()
+        except (OSError, RuntimeError) as e:
+            self._write_error = e
+            self._progress.set()
+
+    def _check_writable(self) -> None:
+        if self._write_error is not None:
+            raise ConnectionError(f"WebSocket write failed: {self._write_error}")
+
+    async def _wait(self, predicate: Callable[[], bool]) -> None:
+        while not predicate():
+            self._check_writable()
+            self._progress.clear()
+            await self._progress.wait()
+
+    async def send(self, data: Message) -> None:
+        """Queue a message, suspending while the queue is above its high watermark"""
+        self._check_writable()
+        queue = self.queue
+        if queue.full:
+            queue.backpressure_waits += 1
+            await self._wait(lambda: queue.drained)
+        self._enqueue(self.protocol.encode_message(data))
+
+    async def ping(self, data: bytes = b'') -> None:
+        self._check_writable()
+        self._enqueue(self.protocol.encode_ping(data))
+
+    async def flush(self) -> None:
+        """Wait until every queued frame has been written"""
+        if self._writer_task is not None:
+            await self._wait(lambda: not self.queue.queued_bytes)
+
+    async def recv(self) -> Message:
+        protocol = self.protocol
+        while not protocol.messages:
+            if protocol.close_received:
+                self._shutdown()
+                raise protocol.closed_error()
+            await self._receive()
+        return protocol.messages.popleft()
+
+    async def _receive(self) -> None:
+        try:
+            data = await self.reader.read(65536)
+        except OSError as e:
+            self._shutdown()
+            raise ConnectionError(str(e))
+        if not data:
+            self.protocol.close_received = True
+            return
+        try:
+            self.protocol.receive_data(data)
+        except WebSocketProtocolError:
+            self.writer.write(self.protocol.data_to_send())
+            self._shutdown()
+            raise
+        replies = self.protocol.data_to_send()
+        if replies and self._write_error is None:
+            self._enqueue(replies)
+
+    async def close(self, code: int = CLOSE_NORMAL, reason: str = '', timeout: float = 5.0) -> None:
+        """Flush queued messages, run the closing handshake, then close the transport"""
+        import asyncio
+        protocol = self.protocol
+        try:
+            if not protocol.close_sent and self._write_error is None:
+                self._enqueue(protocol.encode_close(code, reason))
+            await asyncio.wait_for(self.flush(), timeout)
+            while not protocol.close_received:
+                await asyncio.wait_for(self._receive(), timeout)
+        except (ConnectionError, WebSocketError, asyncio.TimeoutError):
+            pass
+        finally:
+            self._shutdown()
+
+    def _shutdown(self) -> None:
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+        self.writer.close()
+
+    def __aiter__(self) -> 'AsyncWebSocketConnection':
+        return self
+
+    async def __anext__(self) -> Message:
+        try:
+            return await self.recv()
+        except WebSocketClosed:
+            raise StopAsyncIteration
+
+    async def __aenter__(self) -> 'AsyncWebSocketConnection':
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.close()
+
+class WebSocketConnect:
+    """Pending WebSocket connection returned by Client.websocket()
+
+    Use `with` for a blocking connection upgraded on a pooled socket, or
+    `async with` / `await` for an asyncio connection. permessage-deflate
+    is offered unless compression=False.
+    """
+
+    def __init__(
+        self,
+        client: 'Client',
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        subprotocols: Optional[Sequence[str]] = None,
+        max_size: Optional[int] = 2 ** 20,
+        timeout: Optional[float] = None,
+        compression: bool = True,
+        high_watermark: int = 2 ** 20,
+        low_watermark: Optional[int] = None
+    ):
+        self.client = client
+        self.url = url
+        self.headers = headers
+        self.subprotocols = subprotocols
+        self.max_size = max_size
+        self.timeout = timeout
+        self.compression = compression
+        self.high_watermark = high_watermark
+        self.low_watermark = low_watermark
+        self._sync: Optional[WebSocketConnection] = None
+        self._async: Optional[AsyncWebSocketConnection] = None
+
+    def _handshake(self) -> Handshake:
+        from .utils import merge_headers
+        return Handshake(
+            self.url, merge_headers(self.client.default_headers, self.headers),
+            self.subprotocols, self.compression
+        )
+
+    def _ssl_context(self, handshake: Handshake) -> Any:
+        http = self.client.http
+        return http._get_ssl_context(http.verify) if handshake.secure else None
+
+    def _proxy(self, handshake: Handshake) -> Optional['Proxy']:
+        """Proxy to tunnel through; WebSockets always use CONNECT, even for ws://"""
+        return self.client.http.proxies.select(
+            'wss' if handshake.secure else 'ws', handshake.host, handshake.port
+        )
+
+    def connect(self) -> WebSocketConnection:
+        """Open a blocking connection through the client's connection pool"""
+        from .connection import HTTP1Connection
+        from .models import Deadline, Request, RequestMethod
+        handshake = self._handshake()
+        pool = self.client.http.pool
+        ssl_context = self._ssl_context(handshake)
+        proxy = self._proxy(handshake)
+        # timeout bounds the whole opening: pool, connect, tunnel, TLS and the upgrade
+        deadline = Deadline.start(self.timeout)
+        sock = pool.get_connection(handshake.host, handshake.port, ssl_context, proxy=proxy, deadline=deadline)
+        release = lambda: pool.release_connection(
+            handshake.host, handshake.port, sock, ssl_context, proxy=proxy
+        )
+        try:
+            connection = HTTP1Connection(sock, handshake.host)
+            request = Request(RequestMethod.GET, handshake.http_url, headers=handshake.headers)
+            response = connection.send_raw(request, handshake.encode(), deadline=deadline)
+            subprotocol, deflate = handshake.verify(response.status_code, response.headers, self.max_size)
+            # recv() enforces its own timeouts; the writer thread needs a blocking socket
+            sock.settimeout(None)
+        except BaseException:
+            sock.close()
+            release()
+            raise
+        # Frames the server sent right behind the 101 response are already buffered
+        initial = bytes(connection._buffer)
+        return WebSocketConnection(
+            sock, Protocol(self.max_size, deflate), subprotocol, initial, release,
+            self.high_watermark, self.low_watermark
+        )
+
+    async def connect_async(self) -> AsyncWebSocketConnection:
+        """Open an asyncio connection, reusing the client's TLS settings"""
+        import asyncio
+        handshake = self._handshake()
+        ssl_context = self._ssl_context(handshake)
+        proxy = self._proxy(handshake)
+        server_hostname = handshake.host if ssl_context else None
+        try:
+            if proxy is not None:
+                from .proxy import open_tunnel_async
+                sock = await open_tunnel_async(proxy, handshake.host, handshake.port, self.timeout)
+                connect = asyncio.open_connection(sock=sock, ssl=ssl_context, server_hostname=server_hostname)
+            else:
+                connect = asyncio.open_connection(
+                    handshake.host, handshake.port, ssl=ssl_context, server_hostname=server_hostname
+                )
+            reader, writer = await asyncio.wait_for(connect, self.timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            raise ConnectionError(f"Failed to establish connection: {e}")
+        try:
+            writer.write(handshake.encode())
+            await writer.drain()
+            head = await reader.readuntil(b"\r\n\r\n")
+            status_line, _, raw_headers = head[:-4].partition(b"\r\n")
+            parts = status_line.split(None, 2)
+            if len(parts) < 2 or not parts[0].startswith(b"HTTP/1."):
+                raise WebSocketError("Invalid HTTP response to WebSocket upgrade")
+            subprotocol, deflate = handshake.verify(
+                int(parts[1]), Headers.from_raw(raw_headers), self.max_size
+            )
+        except BaseException:
+            writer.close()
+            raise
+        return AsyncWebSocketConnection(
+            reader, writer, Protocol(self.max_size, deflate), subprotocol,
+            self.high_watermark, self.low_watermark
+        )
+
+    def __enter__(self) -> WebSocketConnection:
+        self._sync = self.connect()
+        return self._sync
+
+    def __exit__(self, *exc_info: Any) -> None:
+        if self._sync is not None:
+            self._sync.close()
+            self._sync = None
+
+    async def __aenter__(self) -> AsyncWebSocketConnection:
+        self._async = await self.connect_async()
+        return self._async
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self._async is not None:
+            await self._async.close()
+            self._async = None
+
+    def __await__(self) -> Any:
+        return self.connect_async().__await__()
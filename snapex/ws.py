@@ -1,35 +1,37 @@
-import asyncio
 import ssl
 from typing import Any, Optional, Dict, Union
 from .exceptions import WebSocketError
-from .models import RequestMethod
 
-try:
-    import websockets
-    WEBSOCKETS_AVAILABLE = True
-except ImportError:
-    WEBSOCKETS_AVAILABLE = False
+def _import_websockets() -> Any:
+    """Import the optional websockets package on first use"""
+    try:
+        import websockets
+    except ImportError:
+        raise WebSocketError("websockets package is not installed")
+    return websockets
 
 class WebSocket:
-    """WebSocket client implementation"""
+    """WebSocket client built on the optional websockets package
+
+    Client.websocket() uses snapex's own engine (snapex.websocket) and
+    does not need this dependency.
+    """
     
     def __init__(self, client: 'Client', url: str):
-        if not WEBSOCKETS_AVAILABLE:
-            raise WebSocketError("websockets package is not installed")
-            
+        self._websockets = _import_websockets()
         self.client = client
         self.url = url
         self.connection = None
-        self._ssl_context = ssl.create_default_context()
-        if not self.client.http.verify:
-            self._ssl_context.check_hostname = False
-            self._ssl_context.verify_mode = ssl.CERT_NONE
+        if self.client is not None:
+            self._ssl_context = self.client.http._get_ssl_context(self.client.http.verify)
+        else:
+            self._ssl_context = ssl.create_default_context()
         
     async def connect(self) -> None:
         """Establish WebSocket connection"""
-        headers = self.client.default_headers.copy()
+        headers = self.client.default_headers.copy() if self.client is not None else {}
         try:
-            self.connection = await websockets.connect(
+            self.connection = await self._websockets.connect(
                 self.url,
                 extra_headers=headers,
                 ssl=self._ssl_context
@@ -1,3 +1,17 @@
+import base64
+import hashlib
+import http.client
+import json
+import select
+import socket
+import struct
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
 import pytest
 from snapex import Client
 
@@ -28,4 +42,300 @@ def vcr_config():
 def mock_environment(monkeypatch):
     """Mock environment variables for testing"""
     monkeypatch.setenv("TESTING", "true")
-    monkeypatch.setenv("API_KEY", "test_key")
\ No newline at end of file
+    monkeypatch.setenv("API_KEY", "test_key")
+
+class _LocalHandler(BaseHTTPRequestHandler):
+    """Tiny httpbin-like handler for offline tests"""
+    protocol_version = "HTTP/1.1"
+    redirect_log = []
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body=b"", headers=()):
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in headers:
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_body(self):
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            chunks = []
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                chunk = self.rfile.read(size + 2)[:-2]
+                if not size:
+                    return b"".join(chunks)
+                chunks.append(chunk)
+        return self.rfile.read(int(self.headers.get("Content-Length", 0)))
+
+    def _redirect(self, path, query):
+        """/redirect/<status>?to=<location>, logged in redirect_log"""
+        self.redirect_log.append(self.path)
+        location = unquote(query.partition("to=")[2])
+        self._reply(int(path.rsplit("/", 1)[1]), b"moved", [("Location", location)])
+
+    def do_POST(self):
+        body = self._read_body()
+        path, _, query = self.path.partition("?")
+        if path.startswith("/redirect/"):
+            self._redirect(path, query)
+            return
+        payload = json.dumps({"path": self.path, "data": body.decode()}).encode()
+        self._reply(200, payload, [("Content-Type", "application/json")])
+
+    do_PUT = do_POST
+
+    def _ws_frame(self, first, payload):
+        if len(payload) < 126:
+            head = struct.pack("!BB", first, len(payload))
+        elif len(payload) < 65536:
+            head = struct.pack("!BBH", first, 126, len(payload))
+        else:
+            head = struct.pack("!BBQ", first, 127, len(payload))
+        return head + payload
+
+    def _ws_read(self):
+        head = self.rfile.read(2)
+        if len(head) < 2:
+            return None, b""
+        length = head[1] & 0x7F
+        if length == 126:
+            length = struct.unpack("!H", self.rfile.read(2))[0]
+        elif length == 127:
+            length = struct.unpack("!Q", self.rfile.read(8))[0]
+        key = self.rfile.read(4) if head[1] & 0x80 else b"\0\0\0\0"
+        data = self.rfile.read(length)
+        return head[0], bytes(byte ^ key[i % 4] for i, byte in enumerate(data))
+
+    def _websocket(self, path):
+        accept = base64.b64encode(hashlib.sha1(
+            self.headers["Sec-WebSocket-Key"].encode() + b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+        ).digest())
+        response = b"HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+        response += b"Sec-WebSocket-Accept: " + accept + b"\r\n"
+        if "chat" in self.headers.get("Sec-WebSocket-Protocol", ""):
+            response += b"Sec-WebSocket-Protocol: chat\r\n"
+        deflate = path == "/ws/deflate" and "permessage-deflate" in self.headers.get("Sec-WebSocket-Extensions", "")
+        if deflate:
+            response += b"Sec-WebSocket-Extensions: permessage-deflate\r\n"
+            inflater, compressor = zlib.decompressobj(-15), zlib.compressobj(wbits=-15)
+        response += b"\r\n"
+        if path == "/ws/fragments":
+            # Sent in the same write as the 101 response, with a ping between fragments
+            response += self._ws_frame(0x01, b"hel") + self._ws_frame(0x89, b"p")
+            response += self._ws_frame(0x00, b"lo ") + self._ws_frame(0x80, b"world")
+        elif path == "/ws/goodbye":
+            response += self._ws_frame(0x88, struct.pack("!H", 1001) + b"bye")
+        self.wfile.write(response)
+        self.close_connection = True
+        while True:
+            first, payload = self._ws_read()
+            if first is None:
+                return
+            opcode = first & 0x0F
+            if opcode == 0x8:
+                self.wfile.write(self._ws_frame(0x88, payload))
+                return
+            if opcode == 0x9:
+                self.wfile.write(self._ws_frame(0x8A, payload))
+            elif opcode != 0xA:
+                if deflate and first & 0x40:
+                    payload = inflater.decompress(payload + b"\x00\x00\xff\xff")
+                    payload = (compressor.compress(payload) + compressor.flush(zlib.Z_SYNC_FLUSH))[:-4]
+                self.wfile.write(self._ws_frame(first, payload))
+
+    def do_GET(self):
+        path, _, query = self.path.partition("?")
+        if self.headers.get("Upgrade", "").lower() == "websocket":
+            self._websocket(path)
+            return
+        if path.startswith("/redirect/"):
+            self._redirect(path, query)
+        elif path.startswith("/drip/"):
+            # One byte every 50ms
+            size = int(path.rsplit("/", 1)[1])
+            self.send_response(200)
+            self.send_header("Content-Length", str(size))
+            self.end_headers()
+            try:
+                for _ in range(size):
+                    self.wfile.write(b"x")
+                    self.wfile.flush()
+                    time.sleep(0.05)
+            except OSError:
+                self.close_connection = True
+        elif path.startswith("/bytes/"):
+            self._reply(200, b"x" * int(path.rsplit("/", 1)[1]))
+        elif path.startswith("/status/"):
+            self._reply(int(path.rsplit("/", 1)[1]))
+        elif path == "/cookies/set":
+            self._reply(200, b"", [("Set-Cookie", "a=1"), ("Set-Cookie", "b=2")])
+        elif path == "/chunked":
+            self.send_response(200)
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for chunk in (b"hello ", b"chunked ", b"world"):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+        elif path == "/ndjson":
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for chunk in (b'{"n": 1}\n{"n"', b': 2}\r\n\n{"n": 3}'):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+            self.wfile.write(b"0\r\n\r\n")
+        elif path == "/ndjson/pause":
+            # Goes quiet for 0.5s between records
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            for chunk in (b'{"n": 1}\n', b'{"n": 2}\n'):
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(chunk), chunk))
+                self.wfile.flush()
+                time.sleep(0.5)
+            self.wfile.write(b"0\r\n\r\n")
+        elif path == "/sse":
+            # Each connection sends one event then drops mid-stream
+            last_id = self.headers.get("Last-Event-ID")
+            if last_id == "2":
+                self._reply(204)
+                return
+            if last_id is None:
+                events = b": hello\nretry: 10\nid: 1\ndata: one\ndata: two\n\ndata: cut"
+            else:
+                events = b'id: 2\r\nevent: update\r\ndata: {"n": 2}\r\n\r\n'
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.wfile.write(events)
+            self.close_connection = True
+        elif path == "/headers/list":
+            body = json.dumps(list(self.headers.items())).encode()
+            self._reply(200, body, [("Content-Type", "application/json")])
+        elif path == "/headers":
+            body = json.dumps({"headers": dict(self.headers.items())}).encode()
+            self._reply(200, body, [("Content-Type", "application/json")])
+        else:
+            body = json.dumps({"path": path, "args": query}).encode()
+            self._reply(200, body, [("Content-Type", "application/json")])
+
+
+@contextmanager
+def _serve(server):
+    """Run server on a daemon thread, shutting it down on exit"""
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture(scope="session")
+def local_server():
+    with _serve(ThreadingHTTPServer(("127.0.0.1", 0), _LocalHandler)) as server:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+
+
+class _ProxyHandler(BaseHTTPRequestHandler):
+    """Forward proxy with CONNECT tunnels; 'user:pass' is the only valid login"""
+    protocol_version = "HTTP/1.1"
+    log = []
+
+    def log_message(self, *args):
+        pass
+
+    def _authorized(self):
+        auth = self.headers.get("Proxy-Authorization")
+        self.log.append((self.command, self.path, auth))
+        if auth is not None and auth != "Basic " + base64.b64encode(b"user:pass").decode():
+            self.send_response(407)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return False
+        return True
+
+    def do_CONNECT(self):
+        if not self._authorized():
+            return
+        host, _, port = self.path.rpartition(":")
+        upstream = socket.create_connection((host, int(port)))
+        self.wfile.write(b"HTTP/1.1 200 Connection established\r\n\r\n")
+        self.close_connection = True
+        sockets = [self.connection, upstream]
+        try:
+            while True:
+                for sock in select.select(sockets, [], [], 5)[0]:
+                    data = sock.recv(65536)
+                    if not data:
+                        return
+                    (upstream if sock is self.connection else self.connection).sendall(data)
+        except OSError:
+            pass
+        finally:
+            upstream.close()
+
+    def _forward(self):
+        if not self._authorized():
+            return
+        target = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length) if length else None
+        headers = {k: v for k, v in self.headers.items() if k.lower() != "proxy-authorization"}
+        upstream = http.client.HTTPConnection(target.hostname, target.port)
+        path = (target.path or "/") + ("?" + target.query if target.query else "")
+        upstream.request(self.command, path, body, headers)
+        response = upstream.getresponse()
+        payload = response.read()
+        upstream.close()
+        self.send_response(response.status)
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Via", "1.1 test-proxy")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = _forward
+
+
+@pytest.fixture(scope="session")
+def proxy_server():
+    with _serve(ThreadingHTTPServer(("127.0.0.1", 0), _ProxyHandler)) as server:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+
+
+@pytest.fixture
+def proxy_log(proxy_server):
+    _ProxyHandler.log.clear()
+    return _ProxyHandler.log
+
+
+class _IdleCloseHandler(_LocalHandler):
+    """Closes keep-alive connections after 0.2s idle, like a short server keep-alive timeout"""
+    timeout = 0.2
+
+
+@pytest.fixture(scope="session")
+def idle_close_server():
+    with _serve(ThreadingHTTPServer(("127.0.0.1", 0), _IdleCloseHandler)) as server:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+
+
+@pytest.fixture
+def redirect_log(local_server):
+    _LocalHandler.redirect_log.clear()
+    return _LocalHandler.redirect_log
+
+
+@pytest.fixture(scope="session")
+def unix_server(tmp_path_factory):
+    import socketserver
+    path = str(tmp_path_factory.mktemp("uds") / "snapex.sock")
+    with _serve(socketserver.ThreadingUnixStreamServer(path, _LocalHandler)):
+        yield path
@@ -0,0 +1,34 @@
+import json
+import pytest
+from snapex.bench import BenchConfig, LatencyHistogram, _split, run_bench
+from snapex.cli import main
+
+def test_latency_histogram_precision():
+    histogram = LatencyHistogram()
+    for value in range(1, 100001):
+        histogram.record(value)
+    assert histogram.count == 100000
+    assert histogram.percentile(50) == pytest.approx(50000, rel=0.001)
+    assert histogram.percentile(99.9) == pytest.approx(99900, rel=0.001)
+    assert histogram.percentile(100) == 100000
+
+def test_workers_split_exactly_the_requested_connections():
+    few = _split(BenchConfig(url="http://x", concurrency=10, workers=16))
+    uneven = _split(BenchConfig(url="http://x", concurrency=10, workers=4, rate=100))
+    assert [share.concurrency for share, _ in few] == [1] * 10
+    assert [share.concurrency for share, _ in uneven] == [3, 3, 2, 2]
+    assert sum(rate for _, rate in uneven) == pytest.approx(100)
+
+def test_open_loop_holds_target_rate(local_server):
+    config = BenchConfig(url=f"{local_server}/get", duration=1.0, concurrency=4, rate=200)
+    result = run_bench(config)
+    assert not result.errors
+    assert result.statuses[200] == pytest.approx(200, abs=5)
+
+def test_cli_bench_json(local_server, capsys):
+    code = main(['bench', f"{local_server}/get", '-d', '0.3', '-c', '2', '-w', '1', '--json'])
+    report = json.loads(capsys.readouterr().out)
+    assert code == 0
+    assert report['mode'] == 'closed'
+    assert report['statuses']['200'] == report['requests'] > 0
+    assert report['latency_ms']['p99'] >= report['latency_ms']['p50'] > 0
@@ -0,0 +1,76 @@
+import pytest
+from snapex import Client
+from snapex.codecs import CodecRegistry, JSONCodec, OrjsonCodec, get_json_codec
+from snapex.models import Request, Response, RequestMethod, HTTPVersion
+from snapex.headers import Headers
+
+def test_default_codec_prefers_fast_library():
+    pytest.importorskip('orjson')
+    assert isinstance(get_json_codec(), OrjsonCodec)
+    with pytest.raises(ValueError):
+        get_json_codec('yaml')
+
+@pytest.mark.parametrize('name', ['json', 'orjson'])
+def test_codecs_round_trip_bytes(name):
+    if name == 'orjson':
+        pytest.importorskip('orjson')
+    codec = get_json_codec(name)
+    encoded = codec.dumps({'name': 'snäpex', 'n': [1, 2]})
+    assert isinstance(encoded, bytes)
+    assert codec.loads(memoryview(bytearray(encoded))) == {'name': 'snäpex', 'n': [1, 2]}
+
+def test_registry_matches_structured_json_types():
+    registry = CodecRegistry('json')
+    assert registry.get('application/problem+json; charset=utf-8') is registry.json
+    assert registry.get('text/plain') is None
+
+    class Upper(JSONCodec):
+        def loads(self, data):
+            return super().loads(data).upper()
+
+    registry.register('application/vnd.upper', Upper())
+    request = Request(RequestMethod.GET, "http://test.com")
+    response = Response(200, Headers({'Content-Type': 'application/vnd.upper'}), b'"shout"', request, 0.1, HTTPVersion.HTTP_1_1)
+    response.codecs = registry
+    assert response.json() == 'SHOUT'
+
+def test_json_argument_sends_content_length(local_server):
+    with Client(json_codec='json') as client:
+        response = client.post(f"{local_server}/items", json={'key': 'value'})
+        form = client.post(f"{local_server}/form", data={'a': '1', 'b': 'x y'})
+        prepared = client.prepare('PUT', f"{local_server}/items/{{id}}")(id=7, json=[1, 2])
+    assert response.json() == {'path': '/items', 'data': '{"key":"value"}'}
+    assert response.request.headers['content-type'] == 'application/json'
+    assert form.json()['data'] == 'a=1&b=x+y'
+    assert prepared.json() == {'path': '/items/7', 'data': '[1,2]'}
+
+def test_iterable_body_is_sent_chunked(local_server):
+    with Client() as client:
+        response = client.post(f"{local_server}/upload", data=iter([b'ab', b'', b'cd']))
+        follow_up = client.post(f"{local_server}/upload", data=b'next')
+    assert response.json()['data'] == 'abcd'
+    assert follow_up.json()['data'] == 'next'
+
+def test_empty_iterable_body_is_terminated(local_server):
+    with Client() as client:
+        empty_list = client.post(f"{local_server}/upload", data=[], timeout=2)
+        empty_gen = client.post(f"{local_server}/upload", data=(chunk for chunk in ()), timeout=2)
+    assert empty_list.json()['data'] == ''
+    assert empty_gen.json()['data'] == ''
+
+def test_stdlib_codec_detects_utf16_and_caches_null():
+    codec = get_json_codec('json')
+    assert codec.loads(memoryview('{"a": "ü"}'.encode('utf-16'))) == {'a': 'ü'}
+
+    calls = []
+    class Counting(JSONCodec):
+        def loads(self, data):
+            calls.append(data)
+            return super().loads(data)
+
+    registry = CodecRegistry(Counting())
+    request = Request(RequestMethod.GET, "http://test.com")
+    response = Response(200, Headers({'Content-Type': 'application/json'}), b'null', request, 0.1, HTTPVersion.HTTP_1_1)
+    response.codecs = registry
+    assert response.json() is None and response.json() is None
+    assert len(calls) == 1
@@ -0,0 +1,58 @@
+import pytest
+from snapex import Client
+from snapex.headers import Headers
+
+def test_case_insensitive_multi_values():
+    headers = Headers([('Set-Cookie', 'a=1'), ('Content-Type', 'text/plain')])
+    headers.add('set-cookie', 'b=2')
+    assert headers['content-type'] == 'text/plain'
+    assert headers.get_list('SET-COOKIE') == ['a=1', 'b=2']
+    assert headers['Set-Cookie'] == 'a=1, b=2'
+    headers['CONTENT-TYPE'] = 'application/json'
+    assert headers.multi_items()[-1] == ('CONTENT-TYPE', 'application/json')
+    assert len(headers) == 2
+
+def test_repeated_headers_survive_construction_copy_and_update():
+    pairs = [('Set-Cookie', 'a=1'), ('Set-Cookie', 'b=2'), ('Vary', 'Accept')]
+    headers = Headers(pairs)
+    for copied in (headers.copy(), Headers(headers), Headers(Headers.from_raw(b'Set-Cookie: a=1\r\nSet-Cookie: b=2'))):
+        assert copied.get_list('set-cookie') == ['a=1', 'b=2']
+    headers.update([('vary', 'Origin'), ('Vary', 'Cookie')])
+    assert headers.get_list('Vary') == ['Origin', 'Cookie']
+    assert headers.get_list('Set-Cookie') == ['a=1', 'b=2']
+    layered = Headers([('Accept', 'a'), ('Accept', 'b')], base=Headers({'Accept': '*/*'}))
+    assert layered.get_list('accept') == ['a', 'b']
+
+def test_raw_block_parsed_lazily():
+    headers = Headers.from_raw(b'Content-Length: 5\r\nX-Thing:  yes ')
+    assert headers.peek('content-length') == '5'
+    assert headers._items is None
+    assert headers['x-thing'] == 'yes'
+    assert headers.encode() == b'Content-Length: 5\r\nX-Thing: yes\r\n'
+
+def test_layered_headers_reuse_base_encoding():
+    base = Headers({'User-Agent': 'snapex', 'Accept': '*/*'})
+    encoded = base.encode()
+    layered = Headers({'X-Request': '1'}, base=base)
+    assert layered.encode() == encoded + b'X-Request: 1\r\n'
+    assert base.encode() is encoded
+
+    layered['accept'] = 'application/json'
+    assert layered['Accept'] == 'application/json'
+    assert base['Accept'] == '*/*'
+
+def test_header_injection_rejected():
+    with pytest.raises(ValueError):
+        Headers({'X-Bad': 'a\r\nInjected: 1'}).encode()
+
+def test_response_headers_from_server(local_server):
+    with Client(default_headers={'X-Default': 'yes'}) as client:
+        response = client.get(f"{local_server}/cookies/set")
+        echoed = client.get(f"{local_server}/headers", headers={'X-Extra': '1'}).json()
+        chunked = client.get(f"{local_server}/chunked")
+
+    assert response.headers.get_list('set-cookie') == ['a=1', 'b=2']
+    assert response.headers['content-length'] == '0'
+    assert echoed['headers']['X-Default'] == 'yes'
+    assert echoed['headers']['X-Extra'] == '1'
+    assert chunked.content == b'hello chunked world'
@@ -1,8 +1,20 @@
+import socket
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 from snapex.http import HTTPClient
-from snapex.models import Request, Response, HTTPVersion
+from snapex.models import Request, Response, HTTPVersion, RequestMethod, CachePolicy
 from snapex.exceptions import ConnectionError, InvalidURL
+from snapex.transports import BaseTransport
+
+class StubTransport(BaseTransport):
+    """Answers every request with 200 "test", keeping what it was sent"""
+
+    def __init__(self):
+        self.sent = []
+
+    def handle_request(self, request):
+        self.sent.append(request)
+        return Response(200, {}, b"test", request, 0.1, HTTPVersion.HTTP_1_1)
 
 @pytest.fixture
 def http_client():
@@ -24,19 +36,15 @@ def test_connection_error(mock_connect, http_client):
     with pytest.raises(ConnectionError):
         http_client._create_connection("http://test.com", True, HTTPVersion.HTTP_1_1)
 
-@patch('snapex.connection.HTTP1Connection')
-def test_request_success(mock_conn, http_client):
-    mock_instance = MagicMock()
-    mock_instance.send_request.return_value = Response(
-        200, {}, b"test", Request(RequestMethod.GET, "http://test.com"), 0.1, HTTPVersion.HTTP_1_1
-    )
-    mock_conn.return_value = mock_instance
-    
+def test_request_success():
+    transport = StubTransport()
+    http_client = HTTPClient(transport=transport)
     request = Request(RequestMethod.GET, "http://test.com")
     response = http_client.request(request)
     
     assert response.status_code == 200
     assert response.content == b"test"
+    assert [sent.url for sent in transport.sent] == ["http://test.com"]
 
 def test_should_cache(http_client):
     request = Request(RequestMethod.GET, "http://test.com", cache_policy=CachePolicy.ALWAYS)
@@ -44,4 +52,10 @@ def test_should_cache(http_client):
     assert http_client._should_cache(request, response) is True
 
     request.cache_policy = CachePolicy.NEVER
-    assert http_client._should_cache(request, response) is False
\ No newline at end of file
+    assert http_client._should_cache(request, response) is False
+def test_close_closes_the_pool_once():
+    for transport in (None, StubTransport()):
+        http_client = HTTPClient(transport=transport)
+        with patch.object(http_client.pool, 'close') as close_pool:
+            http_client.close()
+        assert close_pool.call_count == 1
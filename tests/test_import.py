@@ -0,0 +1,40 @@
+import subprocess
+import sys
+
+# Generous enough for slow CI machines; the eager tree took ~100ms
+IMPORT_BUDGET_US = 30000
+
+def _import_times(code):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        capture_output=True, text=True, check=True
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = int(cumulative)
+    return times, result.stdout
+
+def test_import_time_budget():
+    times, _ = _import_times('import snapex')
+    assert times['snapex'] < IMPORT_BUDGET_US
+
+def test_import_loads_no_subsystems():
+    heavy = ('snapex.client', 'snapex.http', 'snapex.ws', 'snapex.cache', 'ssl', 'asyncio', 'websockets')
+    code = f"import snapex, sys; print(','.join(m for m in {heavy!r} if m in sys.modules))"
+    _, loaded = _import_times(code)
+    assert loaded.strip() == ''
+
+def test_client_construction_skips_optional_subsystems():
+    heavy = ('snapex.ws', 'snapex.cache', 'ssl', 'asyncio', 'websockets', 'hashlib')
+    code = f"import snapex, sys; snapex.Client(); print(','.join(m for m in {heavy!r} if m in sys.modules))"
+    _, loaded = _import_times(code)
+    assert loaded.strip() == ''
+
+def test_lazy_attributes_resolve():
+    import snapex
+    from snapex.client import Client
+    assert snapex.Client is Client
+    assert 'WebSocket' in dir(snapex)
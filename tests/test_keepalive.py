@@ -0,0 +1,41 @@
+import time
+import pytest
+from snapex import Client
+from snapex.connection import ConnectionPool
+from snapex.exceptions import ConnectionError
+
+def test_connections_closed_by_the_server_are_not_reused(idle_close_server):
+    with Client(base_url=idle_close_server, trust_env=False) as client:
+        assert client.get("/items").status_code == 200
+        time.sleep(0.4)
+        assert client.post("/upload", data=b"after idle").json()["data"] == "after idle"
+        stats = client.http.pool.stats
+    assert (stats["created"], stats["reused"], stats["stale"]) == (2, 0, 1)
+
+def test_request_is_retried_once_when_a_reused_connection_fails(idle_close_server, monkeypatch):
+    # Simulate the server closing the connection just as it is reused
+    monkeypatch.setattr(ConnectionPool, "_is_alive", staticmethod(lambda sock: True))
+    with Client(base_url=idle_close_server, trust_env=False) as client:
+        client.get("/items")
+        time.sleep(0.4)
+        response = client.put("/upload", data=b"retried")
+        prepared = client.prepare("GET", "/items/{id}")
+        client.get("/items")
+        time.sleep(0.4)
+        assert prepared(id=1).json()["path"] == "/items/1"
+        stats = client.http.pool.stats
+    assert response.json()["data"] == "retried"
+    assert response.timings.reused is False
+    assert stats["reused"] == 2
+
+def test_non_idempotent_request_is_not_retried(idle_close_server, monkeypatch):
+    monkeypatch.setattr(ConnectionPool, "_is_alive", staticmethod(lambda sock: True))
+    with Client(base_url=idle_close_server, trust_env=False) as client:
+        client.get("/items")
+        time.sleep(0.4)
+        with pytest.raises(ConnectionError):
+            client.post("/upload", data=b"maybe applied")
+        client.get("/items")
+        time.sleep(0.4)
+        keyed = client.post("/upload", data=b"keyed", headers={"Idempotency-Key": "abc"})
+    assert keyed.json()["data"] == "keyed"
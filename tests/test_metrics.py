@@ -0,0 +1,46 @@
+import pytest
+from snapex import Client, Hooks, MetricsCollector
+from snapex.hooks import REQUEST_START, REQUEST_END, CONNECTION_CREATE, CONNECTION_REUSE, CACHE_HIT
+
+def test_hooks_inactive_until_listener_registered():
+    hooks = Hooks()
+    assert not hooks.active
+    seen = []
+    callback = hooks.on(REQUEST_START, lambda **kw: seen.append(kw))
+    assert hooks.active
+    hooks.emit(REQUEST_START, request='r')
+    assert seen == [{'request': 'r'}]
+    hooks.off(REQUEST_START, callback)
+    assert not hooks.active
+
+def test_unknown_event_rejected():
+    with pytest.raises(ValueError):
+        Hooks().on('request_begin', print)
+
+def test_client_events(local_server):
+    events = []
+    with Client() as client:
+        for event in (REQUEST_END, CONNECTION_CREATE, CONNECTION_REUSE, CACHE_HIT):
+            client.on(event, lambda event=event, **kw: events.append(event))
+        client.get(f"{local_server}/get?a=1")
+        client.get(f"{local_server}/get?a=2")
+        client.get(f"{local_server}/get?a=1")
+
+    assert events.count(REQUEST_END) == 3
+    assert events.count(CONNECTION_CREATE) == 1
+    assert events.count(CONNECTION_REUSE) == 1
+    assert events.count(CACHE_HIT) == 1
+
+def test_prometheus_render(local_server):
+    with Client() as client:
+        metrics = MetricsCollector().attach(client)
+        client.get(f"{local_server}/get")
+        client.get(f"{local_server}/status/404")
+        text = metrics.render()
+
+    assert '# TYPE snapex_requests_total counter' in text
+    assert f'snapex_requests_total{{origin="{local_server}",method="GET",status="404"}} 1' in text
+    assert f'snapex_request_duration_seconds_bucket{{origin="{local_server}",status="200",le="+Inf"}} 1' in text
+    assert 'snapex_pool_connections{state="idle"} 1' in text
+    # Connection and request series share one origin label format
+    assert f'snapex_connections_total{{origin="{local_server}",state="created"}} 1' in text
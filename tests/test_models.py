@@ -0,0 +1,34 @@
+from datetime import datetime
+from snapex.models import Request, Response, RequestMethod, HTTPVersion, Timings
+
+def test_models_are_slotted():
+    request = Request(RequestMethod.GET, "http://test.com")
+    response = Response(200, {}, b"", request, 0.1, HTTPVersion.HTTP_1_1)
+    for obj in (request, response, Timings()):
+        assert not hasattr(obj, '__dict__')
+
+def test_request_containers_allocated_lazily():
+    request = Request(RequestMethod.GET, "http://test.com")
+    assert request._params is None and request._cookies is None
+    request.params['page'] = 2
+    assert request.params == {'page': 2}
+    assert isinstance(request.created_at, datetime)
+
+def test_memoryview_body_is_not_copied_for_text_and_json():
+    buffer = bytearray(b'{"name": "snapex"}')
+    request = Request(RequestMethod.GET, "http://test.com")
+    response = Response(200, {}, memoryview(buffer), request, 0.1, HTTPVersion.HTTP_1_1)
+    assert response._buffer() is buffer
+    assert response.text == '{"name": "snapex"}'
+    assert response.json() == {'name': 'snapex'}
+    assert response._content is None
+    assert response.content == bytes(buffer)
+    assert response.content is response.content
+
+def test_received_body_is_memoryview(local_server):
+    from snapex import Client
+    with Client() as client:
+        response = client.get(f"{local_server}/bytes/100000")
+    assert isinstance(response.body, memoryview)
+    assert len(response.content) == 100000
+    assert response.history == []
@@ -0,0 +1,48 @@
+import pytest
+from snapex import Client
+from snapex.exceptions import InvalidURL
+from snapex.utils import host_header
+
+def test_prepared_get_fills_path_and_query(local_server):
+    with Client(base_url=local_server, default_headers={'X-Default': '1'}) as client:
+        user = client.prepare('GET', '/users/{user_id}?v=2')
+        first = user(user_id=42, params={'expand': 'teams'})
+        second = user(user_id='a b')
+
+    assert first.json() == {'path': '/users/42', 'args': 'v=2&expand=teams'}
+    assert second.json()['path'] == '/users/a%20b'
+    assert second.timings.reused
+
+def test_prepared_post_sets_content_length(local_server):
+    with Client() as client:
+        create = client.prepare('POST', f"{local_server}/items", headers={'Content-Type': 'text/plain'})
+        response = create(body='hello')
+    assert response.json() == {'path': '/items', 'data': 'hello'}
+    assert response.request.headers['content-type'] == 'text/plain'
+
+def test_prepared_validation(local_server):
+    with Client() as client:
+        with pytest.raises(InvalidURL):
+            client.prepare('GET', 'ftp://example.com/{x}')
+        with pytest.raises(ValueError, match='user_id'):
+            client.prepare('GET', f"{local_server}/users/{{user_id}}")()
+
+def test_host_header_matches_across_send_paths(local_server):
+    assert host_header("http://example.com:80/") == "example.com"
+    assert host_header("https://[::1]:8443/x") == "[::1]:8443"
+    with Client(base_url=local_server) as client:
+        plain = client.get("/headers/list").json()
+        prepared = client.prepare("GET", "/headers/list")().json()
+    assert ["Host", local_server.split("//")[1]] in plain
+    assert plain == prepared
+
+def test_prepared_header_override_is_sent_once(local_server):
+    with Client(base_url=local_server, default_headers={"Authorization": "Bearer old"}) as client:
+        get_headers = client.prepare("GET", "/headers/list", headers={"Accept": "text/plain"})
+        sent = get_headers(headers={"authorization": "Bearer new", "Host": "example.test"}).json()
+        added = get_headers(headers={"X-Trace": "1"}).json()
+    names = [name.lower() for name, _ in sent]
+    assert (names.count("authorization"), names.count("host")) == (1, 1)
+    assert ["authorization", "Bearer new"] in [[name.lower(), value] for name, value in sent]
+    assert ["Host", "example.test"] in sent
+    assert ["Authorization", "Bearer old"] in added and ["X-Trace", "1"] in added
@@ -0,0 +1,58 @@
+from urllib.parse import quote
+import pytest
+from snapex import Client
+from snapex.exceptions import TooManyRedirects
+from snapex.models import CachePolicy, Request, RequestMethod
+
+def redirect(status, location):
+    return f"/redirect/{status}?to={quote(location, safe='')}"
+
+def test_relative_redirects_reuse_one_connection(local_server, redirect_log):
+    with Client(base_url=local_server, trust_env=False) as client:
+        response = client.get(redirect(302, redirect(307, "../items?x=1")))
+        stats = client.http.pool.stats
+    assert response.json() == {"path": "/items", "args": "x=1"}
+    assert [r.status_code for r in response.history] == [302, 307]
+    assert (stats["created"], stats["reused"]) == (1, 2)
+    assert len(redirect_log) == 2
+
+def test_permanent_redirects_are_memoized(local_server, redirect_log):
+    with Client(base_url=local_server, trust_env=False) as client:
+        for _ in range(3):
+            response = client.get(redirect(301, "/items"), cache_policy=CachePolicy.NEVER)
+            assert response.json()["path"] == "/items"
+        temporary = [client.get(redirect(302, "/items"), cache_policy=CachePolicy.NEVER) for _ in range(2)]
+    assert len(redirect_log) == 3
+    assert redirect_log[0].startswith("/redirect/301")
+    assert [len(r.history) for r in temporary] == [1, 1]
+
+def test_redirect_memo_is_bounded(local_server, redirect_log):
+    with Client(base_url=local_server, trust_env=False) as client:
+        client.http.redirect_memo_size = 2
+        for path in ("/a", "/b", "/c", "/a", "/c"):
+            client.get(redirect(308, path), cache_policy=CachePolicy.NEVER)
+        assert len(client.http._permanent_redirects) == 2
+    # /a was evicted by /c and had to be fetched again; /c was still remembered
+    assert len(redirect_log) == 4
+
+def test_308_resends_the_body_and_303_switches_to_get(local_server):
+    with Client(base_url=local_server, trust_env=False) as client:
+        kept = client.post(redirect(308, "/upload"), data=b"payload")
+        switched = client.post(redirect(303, "/items"), data=b"payload")
+    assert kept.json() == {"path": "/upload", "data": "payload"}
+    assert switched.json() == {"path": "/items", "args": ""}
+
+def test_remembered_hops_count_against_max_redirects(local_server, redirect_log):
+    chain = f"{local_server}{redirect(301, redirect(301, '/items'))}"
+    with Client(trust_env=False) as client:
+        assert client.get(chain).json()["path"] == "/items"
+        with pytest.raises(TooManyRedirects):
+            # The first hop comes from the memo, the second from the server
+            client.http.request(Request(RequestMethod.GET, chain, max_redirects=1, cache_policy=CachePolicy.NEVER))
+
+def test_post_on_302_switches_to_get_without_body_headers(local_server):
+    with Client(base_url=local_server, trust_env=False) as client:
+        response = client.post(redirect(302, "/headers/list"), json={"a": 1})
+    names = {name.lower() for name, _ in response.json()}
+    assert response.request.method == RequestMethod.GET and response.request.body is None
+    assert not names & {"content-type", "content-length", "transfer-encoding"}
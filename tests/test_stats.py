@@ -0,0 +1,37 @@
+import pytest
+from snapex import Client
+from snapex.models import Timings
+from snapex.stats import Histogram, TimingStats
+
+def test_histogram_percentiles():
+    histogram = Histogram(buckets=(1, 10, 100))
+    for value in (0.5, 5, 5, 50, 500):
+        histogram.observe(value)
+    assert histogram.count == 5
+    assert histogram.counts == [1, 2, 1, 1]
+    assert 1 <= histogram.percentile(50) <= 10
+    assert histogram.percentile(100) == 500
+
+def test_timings_phases_are_ordered():
+    timings = Timings(start=0.0)
+    timings.pool_acquired, timings.dns_done, timings.connect_done = 0.001, 0.003, 0.004
+    timings.tls_done, timings.request_sent = 0.004, 0.005
+    timings.first_byte, timings.end = 0.015, 0.020
+    assert timings.dns == pytest.approx(2.0)
+    assert timings.tls == 0.0
+    assert timings.ttfb == pytest.approx(10.0)
+    assert timings.total == pytest.approx(sum(timings.as_dict()[p] for p in Timings.PHASES))
+
+def test_response_timings_and_origin_histogram(local_server):
+    with Client() as client:
+        first = client.get(f"{local_server}/get")
+        second = client.get(f"{local_server}/get?page=2")
+
+    assert not first.timings.reused
+    assert second.timings.reused
+    assert second.timings.connect == 0.0
+    assert first.elapsed == first.timings.total > 0
+
+    stats = client.http.timings.stats[local_server]
+    assert stats['total']['count'] == 2
+    assert set(Timings.PHASES) <= set(stats)
@@ -0,0 +1,68 @@
+import asyncio
+import pytest
+from snapex import Client
+from snapex.exceptions import TimeoutError
+from snapex.models import TimeoutConfig
+from snapex.models import Request, Response, RequestMethod, HTTPVersion
+from snapex.streaming import LineDecoder, SSEDecoder
+
+def test_line_decoder_keeps_only_partial_line():
+    decoder = LineDecoder()
+    assert decoder.feed(b"a\r") == []
+    assert decoder.feed(b"\nb\nc") == [b"a", b"b"]
+    assert decoder._buffer == bytearray(b"c")
+    for _ in range(1000):
+        decoder.feed(b"x" * 100 + b"\n")
+    assert len(decoder._buffer) == 0
+    assert decoder.flush() == []
+
+def test_streamed_ndjson_releases_connection(local_server):
+    with Client() as client:
+        response = client.get(f"{local_server}/ndjson", stream=True)
+        assert client.http.pool.stats['in_use'] == 1
+        assert list(response.iter_ndjson()) == [{'n': 1}, {'n': 2}, {'n': 3}]
+        assert client.http.pool.stats['in_use'] == 0
+        assert client.http.pool.stats['idle'] == 1
+
+        with client.get(f"{local_server}/bytes/100000", stream=True) as abandoned:
+            next(abandoned.iter_bytes())
+        assert client.http.pool.stats['in_use'] == 0
+        assert client.http.pool.stats['closed'] == 1
+
+def test_streamed_body_outlasts_the_socket_timeout(local_server, monkeypatch):
+    monkeypatch.setattr("snapex.connection.SOCKET_TIMEOUT", 0.2)
+    with Client() as client:
+        for timeout in (None, TimeoutConfig(total=5)):
+            response = client.get(f"{local_server}/ndjson/pause", stream=True, timeout=timeout)
+            assert list(response.iter_ndjson()) == [{'n': 1}, {'n': 2}]
+
+        response = client.get(f"{local_server}/ndjson/pause", stream=True, timeout=TimeoutConfig(read=0.2))
+        with pytest.raises(TimeoutError):
+            list(response.iter_ndjson())
+
+def test_sse_decoder_fields():
+    decoder = SSEDecoder()
+    events = decoder.feed([b"event: tick", b"id: 7", b"data:a", b"data: b", b"", b"retry: x", b"", b"data: c\rdata: d", b""])
+    assert [(e.event, e.data, e.id) for e in events] == [('tick', 'a\nb', '7'), ('message', 'c\nd', '7')]
+    assert decoder.retry is None
+
+def test_sse_reconnects_with_last_event_id(local_server):
+    with Client() as client:
+        source = client.sse(f"{local_server}/sse", retry=0.01)
+        events = list(source)
+    assert [(e.event, e.data, e.id) for e in events] == [('message', 'one\ntwo', '1'), ('update', '{"n": 2}', '2')]
+    assert events[1].json() == {'n': 2}
+    assert source.reconnects == 2
+    assert source.decoder.retry == 10
+
+def test_async_iterators_over_async_body():
+    async def body():
+        for chunk in (b'{"n": 1}\n{"n"', b': 2}\n'):
+            yield chunk
+
+    async def collect():
+        request = Request(RequestMethod.GET, "http://test.com")
+        response = Response(200, {}, body(), request, 0.1, HTTPVersion.HTTP_1_1)
+        return [item async for item in response.aiter_ndjson()]
+
+    assert asyncio.run(collect()) == [{'n': 1}, {'n': 2}]
@@ -0,0 +1,41 @@
+import threading
+import time
+import pytest
+from snapex import Client
+from snapex.exceptions import ConnectionError, TimeoutError
+from snapex.models import CachePolicy, Deadline, TimeoutConfig
+
+def test_deadline_caps_each_phase_by_what_is_left():
+    assert Deadline.start(TimeoutConfig()) is None
+    deadline = Deadline.start(TimeoutConfig(connect=0.5, read=10, total=2))
+    assert deadline.remaining("connect") == 0.5
+    assert 1.9 < deadline.remaining("read") <= 2
+    assert deadline.remaining("write") <= 2
+    deadline.expires = time.perf_counter() - 1
+    with pytest.raises(TimeoutError):
+        deadline.remaining("read")
+    assert Deadline.start(1.5).config.total == 1.5
+
+def test_total_timeout_stops_a_slow_drip_and_frees_the_slot(local_server):
+    with Client(base_url=local_server, trust_env=False) as client:
+        start = time.perf_counter()
+        with pytest.raises(TimeoutError):
+            # Every read arrives well inside the read cap, but the whole body cannot
+            client.get("/drip/40", timeout=TimeoutConfig(read=1, total=0.3), cache_policy=CachePolicy.NEVER)
+        assert time.perf_counter() - start < 1
+        stats = client.http.pool.stats
+        assert (stats["active"], stats["idle"]) == (0, 0)
+        assert client.get("/items", timeout=0.5).status_code == 200
+
+def test_pool_wait_is_bounded_by_the_deadline(local_server):
+    with Client(base_url=local_server, pool_size=1, trust_env=False) as client:
+        held = client.get("/bytes/10", stream=True)
+        with pytest.raises(ConnectionError, match="limit"):
+            client.get("/items")
+        with pytest.raises(TimeoutError, match="pooled connection"):
+            client.get("/items", timeout=TimeoutConfig(pool=0.1))
+
+        threading.Timer(0.1, held.close).start()
+        response = client.get("/items", timeout=TimeoutConfig(pool=2))
+        assert response.status_code == 200
+        assert client.http.pool.stats["exhausted"] == 2
@@ -0,0 +1,87 @@
+import asyncio
+import json
+import pytest
+from snapex import Client
+from snapex.exceptions import ConnectionError
+from snapex.transports import ASGITransport, RecordingTransport, ReplayTransport, WSGITransport
+
+def wsgi_app(environ, start_response):
+    wsgi_app.calls += 1
+    if environ["PATH_INFO"] == "/old":
+        start_response("301 Moved Permanently", [("Location", "http://app.local/new")])
+        return [b""]
+    body = environ["wsgi.input"].read(int(environ["CONTENT_LENGTH"] or 0))
+    payload = json.dumps({
+        "method": environ["REQUEST_METHOD"],
+        "path": environ["PATH_INFO"],
+        "query": environ["QUERY_STRING"],
+        "host": environ["HTTP_HOST"],
+        "type": environ.get("CONTENT_TYPE"),
+        "body": body.decode(),
+    }).encode()
+    start_response("200 OK", [
+        ("Content-Type", "application/json"), ("Set-Cookie", "a=1"), ("Set-Cookie", "b=2")
+    ])
+    return [payload]
+
+wsgi_app.calls = 0
+
+async def asgi_app(scope, receive, send):
+    message = await receive()
+    asgi_app.loops.add(id(asyncio.get_running_loop()))
+    headers = dict(scope["headers"])
+    await send({"type": "http.response.start", "status": 201, "headers": [(b"x-path", scope["path"].encode())]})
+    await send({"type": "http.response.body", "body": headers[b"host"] + b" ", "more_body": True})
+    await send({"type": "http.response.body", "body": message["body"]})
+
+asgi_app.loops = set()
+
+def test_wsgi_transport_runs_without_sockets():
+    with Client(base_url="http://app.local", transport=WSGITransport(wsgi_app)) as client:
+        response = client.post("/items?x=1", json={"n": 1})
+        redirected = client.get("/old")
+        assert client.http.pool.stats["created"] == 0
+    assert response.json() == {
+        "method": "POST", "path": "/items", "query": "x=1", "host": "app.local",
+        "type": "application/json", "body": '{"n":1}',
+    }
+    assert response.headers.get_list("set-cookie") == ["a=1", "b=2"]
+    assert response.timings.total > 0
+    assert redirected.json()["path"] == "/new"
+    assert [r.status_code for r in redirected.history] == [301]
+
+def test_cache_and_hooks_sit_above_the_transport():
+    wsgi_app.calls = 0
+    seen = []
+    with Client(transport=WSGITransport(wsgi_app)) as client:
+        client.on("request_end", lambda **event: seen.append(event["response"].status_code))
+        for _ in range(3):
+            assert client.get("http://app.local/cached").status_code == 200
+    assert wsgi_app.calls == 1
+    assert seen == [200, 200, 200]
+
+def test_asgi_transport_keeps_one_event_loop():
+    transport = ASGITransport(asgi_app)
+    with Client(transport=transport) as client:
+        first = client.put("http://svc.local:8080/a%20b", data=b"one")
+        second = client.put("http://svc.local:8080/c", data=b"two")
+    assert (first.status_code, first.headers["x-path"], first.content) == (201, "/a b", b"svc.local:8080 one")
+    assert second.content.endswith(b"two")
+    assert len(asgi_app.loops) == 1
+    assert transport._loop is None
+
+def test_record_then_replay(local_server, tmp_path):
+    cassette = str(tmp_path / "cassette.json")
+    with Client() as client:
+        client.http.transport = RecordingTransport(client.http.transport)
+        recorded = client.get(f"{local_server}/items?x=1").json()
+        client.post(f"{local_server}/upload", data=b"first")
+        client.post(f"{local_server}/upload", data=b"second")
+        client.http.transport.save(cassette)
+
+    with Client(transport=ReplayTransport(cassette)) as client:
+        assert client.get(f"{local_server}/items?x=1").json() == recorded
+        assert client.post(f"{local_server}/upload", data=b"second").json()["data"] == "second"
+        with pytest.raises(ConnectionError):
+            client.get(f"{local_server}/never-recorded")
+        assert client.http.pool.stats["created"] == 0
@@ -0,0 +1,36 @@
+import socket
+from urllib.parse import quote
+import pytest
+from snapex import Client
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="Unix domain sockets unavailable")
+
+def test_http_unix_url_is_pooled(unix_server):
+    base = f"http+unix://{quote(unix_server, safe='')}"
+    with Client(trust_env=False) as client:
+        first = client.get(f"{base}/items?x=1")
+        second = client.post(f"{base}/upload", data=b"payload")
+        prepared = client.prepare("GET", f"{base}/items/{{id}}")(id=3)
+        stats = client.http.pool.stats
+    assert first.json() == {"path": "/items", "args": "x=1"}
+    assert second.json()["data"] == "payload"
+    assert prepared.json()["path"] == "/items/3"
+    assert (stats["created"], stats["reused"]) == (1, 2)
+
+def test_client_uds_option_keeps_url_host(unix_server, local_server):
+    with Client(uds=unix_server, trust_env=False) as client:
+        response = client.get("http://docker.local/headers")
+        assert response.json()["headers"]["Host"] == "docker.local"
+        assert client.get("http://docker.local/bytes/4").content == b"xxxx"
+        assert client.http.pool.stats["created"] == 1
+
+    # The same origin over TCP and over a Unix socket never share connections
+    with Client(trust_env=False) as client:
+        pool = client.http.pool
+        host, port = local_server.rsplit("//", 1)[1].split(":")
+        tcp = pool.get_connection(host, int(port))
+        pool.release_connection(host, int(port), tcp)
+        unix = pool.get_connection(host, int(port), uds=unix_server)
+        assert unix.family == socket.AF_UNIX
+        pool.release_connection(host, int(port), unix, uds=unix_server)
+        assert (pool.stats["created"], pool.stats["reused"]) == (2, 0)
@@ -0,0 +1,66 @@
+import threading
+import time
+from urllib.parse import urlsplit
+from snapex import Client
+from snapex.connection import ConnectionPool
+
+def wait_for_fill(pool):
+    deadline = time.time() + 5
+    while pool._filling and time.time() < deadline:
+        time.sleep(0.01)
+
+def test_warmup_preconnects_in_parallel(local_server):
+    created = []
+    with Client(base_url=local_server, trust_env=False) as client:
+        client.on("connection_create", lambda **event: created.append(threading.current_thread().name))
+        assert client.warmup(connections_per_origin=4) == {local_server: 4}
+        assert client.warmup([local_server], 4) == {local_server: 0}
+        assert client.get("/items").status_code == 200
+        stats = client.http.pool.stats
+    assert len(set(created)) == 4
+    assert (stats["created"], stats["prewarmed"], stats["reused"]) == (4, 4, 1)
+
+def test_warmup_is_a_noop_without_a_pooled_transport():
+    from snapex.transports import ReplayTransport
+    with Client(transport=ReplayTransport([])) as client:
+        assert client.warmup("http://app.local", 8) == {"http://app.local": 0}
+        assert client.http.pool.stats["created"] == 0
+
+def test_adaptive_pool_grows_ahead_and_shrinks_when_idle(local_server):
+    url = urlsplit(local_server)
+    pool = ConnectionPool(adaptive=True, adapt_interval=0.2)
+    socks = []
+    for _ in range(8):
+        socks.append(pool.get_connection(url.hostname, url.port))
+        wait_for_fill(pool)
+    stats = pool.stats
+    # Only the first checkout waits for a connect; the target for 8 is 10
+    assert (stats["reused"], stats["created"], stats["active"]) == (7, 10, 10)
+
+    for sock in socks:
+        pool.release_connection(url.hostname, url.port, sock)
+    assert pool.stats["idle"] <= 10
+
+    time.sleep(0.5)
+    sock = pool.get_connection(url.hostname, url.port)
+    pool.release_connection(url.hostname, url.port, sock)
+    stats = pool.stats
+    assert stats["trimmed"] >= 8
+    assert stats["idle"] <= 2
+    pool.close()
+
+def test_warmed_connections_survive_a_server_keepalive_timeout(idle_close_server):
+    with Client(base_url=idle_close_server, trust_env=False) as client:
+        client.warmup(connections_per_origin=3)
+        time.sleep(0.4)  # the server has closed all three
+        assert [client.get(f"/items/{i}").status_code for i in range(3)] == [200] * 3
+        assert client.http.pool.stats["stale"] == 3
+
+        client.http.pool.warm_idle_timeout = 0.1
+        client.warmup(connections_per_origin=3)
+        time.sleep(0.15)
+        assert client.get("/items/3").status_code == 200
+        stats = client.http.pool.stats
+    # The two new warm sockets expired in the pool before the server closed them;
+    # the request reused the one left over from the burst
+    assert (stats["stale"], stats["created"], stats["reused"]) == (3, 6, 3)
@@ -0,0 +1,82 @@
+import asyncio
+import socket
+import time
+import pytest
+from snapex import Client
+from snapex.exceptions import TimeoutError, WebSocketClosed, WebSocketProtocolError
+from snapex.frames import (
+    OP_BINARY, OP_CONTINUATION, OP_TEXT, Frame, FrameParser, MessageAssembler, apply_mask, encode_frame
+)
+
+def test_mask_matches_bytewise_xor():
+    key = b"\x01\x82\x33\xf4"
+    for payload in (b"", b"a", b"hello", bytes(range(256)) * 300):
+        expected = bytes(byte ^ key[i % 4] for i, byte in enumerate(payload))
+        assert apply_mask(payload, key) == expected
+
+def test_parser_handles_split_frames_and_lengths():
+    parser = FrameParser(max_size=None)
+    wire = b"".join(encode_frame(OP_BINARY, b"x" * size) for size in (5, 300, 70000))
+    frames = []
+    for offset in range(0, len(wire), 1000):
+        frames += parser.feed(wire[offset:offset + 1000])
+    assert [len(frame.payload) for frame in frames] == [5, 300, 70000]
+    assert parser._buffer == bytearray()
+
+    with pytest.raises(WebSocketProtocolError):
+        FrameParser(max_size=10).feed(encode_frame(OP_BINARY, b"x" * 11))
+
+def test_assembler_joins_fragments_once():
+    assembler = MessageAssembler()
+    assert assembler.add(Frame(OP_TEXT, b"a", fin=False)) is None
+    assert assembler.add(Frame(OP_CONTINUATION, b"b", fin=False)) is None
+    message = assembler.add(Frame(OP_CONTINUATION, b"c"))
+    assert (message.opcode, message.payload) == (OP_TEXT, b"abc")
+    with pytest.raises(WebSocketProtocolError):
+        assembler.add(Frame(OP_CONTINUATION, b"d"))
+
+def test_sync_echo_through_pool(local_server):
+    url = local_server.replace("http://", "ws://")
+    with Client() as client:
+        with client.websocket(f"{url}/ws/echo", subprotocols=["chat"]) as ws:
+            assert client.http.pool.stats['in_use'] == 1
+            assert ws.subprotocol == "chat"
+            ws.send("hello")
+            ws.send(b"\x00" * 70000)
+            assert ws.recv() == "hello"
+            assert ws.recv() == b"\x00" * 70000
+        assert client.http.pool.stats['in_use'] == 0
+
+        with client.websocket(f"{url}/ws/fragments") as ws:
+            assert ws.recv() == "hello world"
+
+        with client.websocket(f"{url}/ws/goodbye") as ws:
+            with pytest.raises(WebSocketClosed) as info:
+                ws.recv()
+            assert (info.value.code, info.value.reason) == (1001, "bye")
+
+def test_sync_handshake_honours_timeout():
+    # Accepts TCP connections but never answers the upgrade
+    listener = socket.create_server(("127.0.0.1", 0))
+    try:
+        with Client(trust_env=False) as client:
+            start = time.perf_counter()
+            with pytest.raises(TimeoutError):
+                with client.websocket(f"ws://127.0.0.1:{listener.getsockname()[1]}/", timeout=0.3):
+                    pass
+            assert time.perf_counter() - start < 1.5
+            assert client.http.pool.stats['active'] == 0
+    finally:
+        listener.close()
+
+def test_async_echo(local_server):
+    url = local_server.replace("http://", "ws://")
+
+    async def run():
+        with Client() as client:
+            async with client.websocket(f"{url}/ws/echo") as ws:
+                await ws.send("ping")
+                await ws.ping()
+                return await ws.recv()
+
+    assert asyncio.run(run()) == "ping"
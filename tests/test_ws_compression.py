@@ -0,0 +1,82 @@
+import asyncio
+import zlib
+import pytest
+from snapex import Client
+from snapex.deflate import PerMessageDeflate
+from snapex.exceptions import WebSocketError, WebSocketProtocolError
+from snapex.frames import FrameParser
+from snapex.websocket import Protocol, SendQueue
+
+def test_negotiation_parses_server_parameters():
+    deflate = PerMessageDeflate.accept('permessage-deflate; server_no_context_takeover; client_max_window_bits=12')
+    assert deflate.server_no_context_takeover and not deflate.client_no_context_takeover
+    assert deflate.client_max_window_bits == 12
+    for header in ('x-webkit-deflate-frame', 'permessage-deflate; unknown=1',
+                   'permessage-deflate; server_max_window_bits=8'):
+        with pytest.raises(WebSocketError):
+            PerMessageDeflate.accept(header)
+
+def test_context_takeover_shrinks_repeated_messages():
+    message = '{"symbol": "ABC", "bid": 101.25, "ask": 101.5, "venue": "primary"}'
+    inflater = zlib.decompressobj(-15)
+    sizes = {}
+    for takeover in (True, False):
+        protocol = Protocol(deflate=PerMessageDeflate(client_no_context_takeover=not takeover))
+        frames = [FrameParser(None, allow_rsv1=True).feed(protocol.encode_message(message))[0] for _ in range(3)]
+        assert all(frame.rsv1 for frame in frames)
+        sizes[takeover] = [len(frame.payload) for frame in frames]
+        if takeover:
+            decoded = [inflater.decompress(frame.payload + b'\x00\x00\xff\xff') for frame in frames]
+            assert decoded == [message.encode()] * 3
+    assert sizes[True][0] == sizes[False][0]
+    assert sizes[True][2] < sizes[False][2] // 2
+
+def test_decompression_is_bounded_by_max_size():
+    compressor = zlib.compressobj(wbits=-15)
+    bomb = (compressor.compress(b'\0' * 100000) + compressor.flush(zlib.Z_SYNC_FLUSH))[:-4]
+    with pytest.raises(WebSocketProtocolError) as info:
+        PerMessageDeflate(max_size=1000).decompress(bomb)
+    assert info.value.code == 1009
+
+def test_send_queue_watermarks_and_batching():
+    queue = SendQueue(high_watermark=100)
+    assert queue.low_watermark == 25
+    for _ in range(5):
+        queue.put(b'x' * 30)
+    assert queue.full and queue.stats['peak_bytes'] == 150
+    data, count = queue.take()
+    assert (len(data), count, queue.pending) == (150, 5, False)
+    queue.done(len(data), count)
+    assert queue.drained
+    assert (queue.stats['writes'], queue.stats['frames_sent'], queue.stats['queued_bytes']) == (1, 5, 0)
+    with pytest.raises(ValueError):
+        SendQueue(high_watermark=10, low_watermark=20)
+
+def test_compressed_echo_sync_and_async(local_server):
+    url = local_server.replace("http://", "ws://")
+    messages = ['{"tick": %d, "price": 100.5, "size": 10}' % i for i in range(50)]
+    with Client() as client:
+        with client.websocket(f"{url}/ws/deflate", high_watermark=256) as ws:
+            assert ws.protocol.deflate is not None
+            for message in messages:
+                ws.send(message)
+            ws.flush()
+            assert [ws.recv() for _ in messages] == messages
+            stats = ws.stats
+        assert stats['frames_sent'] == 50 and stats['queued_bytes'] == 0
+        assert stats['bytes_sent'] < sum(map(len, messages)) // 2
+
+        with client.websocket(f"{url}/ws/deflate", compression=False) as ws:
+            assert ws.protocol.deflate is None
+            ws.send("plain")
+            assert ws.recv() == "plain"
+
+        async def run():
+            async with client.websocket(f"{url}/ws/deflate") as ws:
+                for message in messages:
+                    await ws.send(message)
+                return [await ws.recv() for _ in messages], ws.stats
+
+        received, stats = asyncio.run(run())
+    assert received == messages
+    assert stats['writes'] <= stats['frames_sent']